@@ -5,45 +5,46 @@ import re
 import os
 from pathlib import Path
 
-def compile_text_to_binary(asm_text, print_callback=None, base_dir=None):
+BRANCH_OPS = {'B', 'BEQ', 'BNE', 'BLT', 'BGT'}
+
+
+def _count_real_instructions(tokens):
+    """Cuenta cuántas instrucciones reales genera este token-list"""
+    from ExtraPrograms.ISA.encoder import encode_instruction
+    try:
+        result = encode_instruction(tokens)
+        return len(result) if isinstance(result, list) else 1
+    except Exception:
+        return 1
+
+
+def source_layout(asm_text, print_callback=None):
     """
-    Compila código ASM a binario y lo guarda en assets/instruction_mem.bin.
-    
-    Args:
-        asm_text: Texto del código ASM
-        print_callback: Función para imprimir mensajes (opcional)
-        base_dir: Directorio base del proyecto (opcional, se autodetecta si no se proporciona)
-        
+    Primera pasada del compilador: etiquetas y líneas con instrucciones.
+
     Returns:
-        bytes: Contenido binario compilado o None si hay errores
+        (label_table, parsed_lines) o None si hay un error léxico.
+        label_table: etiqueta -> índice de instrucción
+        parsed_lines: [(lineno, línea, tokens, índice, cantidad)] donde
+        lineno es la línea del editor (1 = primera) e índice/cantidad son
+        las instrucciones de 64 bits que genera
     """
     from ExtraPrograms.ISA.lexer import lexer
-    from ExtraPrograms.ISA.parser import parse_tokens
-    from ExtraPrograms.ISA.encoder import encode_instruction
-    
+
     def log(msg):
         if print_callback:
             print_callback(msg)
-    
-    # Constantes
-    BRANCH_OPS = {'B', 'BEQ', 'BNE', 'BLT', 'BGT'}
-    
-    def count_real_instructions(tokens):
-        """Cuenta cuántas instrucciones reales genera este token-list"""
-        try:
-            result = encode_instruction(tokens)
-            return len(result) if isinstance(result, list) else 1
-        except Exception:
-            return 1
-    
-    # PASADA 1: Recolectar etiquetas
+
     log("[COMPILADOR] Iniciando primera pasada - análisis de etiquetas")
     label_table = {}
     parsed_lines = []
     instr_index = 0
-    
+
+    # strip() quita las líneas vacías iniciales: se cuentan para que
+    # lineno coincida con el editor
+    first_line = asm_text[:len(asm_text) - len(asm_text.lstrip())].count('\n') + 1
     lines = asm_text.strip().split('\n')
-    for lineno, raw in enumerate(lines, 1):
+    for lineno, raw in enumerate(lines, first_line):
         line = raw.split(';')[0].strip()
         if not line:
             continue
@@ -58,14 +59,52 @@ def compile_text_to_binary(asm_text, print_callback=None, base_dir=None):
         try:
             tokens = lexer(line)
             if tokens:
-                parsed_lines.append((lineno, line, tokens))
-                count = count_real_instructions(tokens)
+                count = _count_real_instructions(tokens)
+                parsed_lines.append((lineno, line, tokens, instr_index, count))
                 instr_index += count
         except Exception as e:
             log(f"[COMPILADOR] Error en línea {lineno}: {str(e)}")
-            return
+            return None
     
     log(f"[COMPILADOR] Primera pasada completa. {len(label_table)} etiquetas encontradas")
+    return label_table, parsed_lines
+
+
+def instruction_lines(asm_text):
+    """Línea del editor de cada instrucción (índice = PC / 8), o None."""
+    layout = source_layout(asm_text)
+    if layout is None:
+        return None
+    lines = []
+    for lineno, _line, _tokens, _index, count in layout[1]:
+        lines.extend([lineno] * count)
+    return lines
+
+
+def compile_text_to_binary(asm_text, print_callback=None, base_dir=None):
+    """
+    Compila código ASM a binario y lo guarda en assets/instruction_mem.bin.
+    
+    Args:
+        asm_text: Texto del código ASM
+        print_callback: Función para imprimir mensajes (opcional)
+        base_dir: Directorio base del proyecto (opcional, se autodetecta si no se proporciona)
+        
+    Returns:
+        bytes: Contenido binario compilado o None si hay errores
+    """
+    from ExtraPrograms.ISA.parser import parse_tokens
+    from ExtraPrograms.ISA.encoder import encode_instruction
+    
+    def log(msg):
+        if print_callback:
+            print_callback(msg)
+    
+    # PASADA 1: Recolectar etiquetas
+    layout = source_layout(asm_text, print_callback)
+    if layout is None:
+        return
+    label_table, parsed_lines = layout
     
     # PASADA 2: Generar binarios
     log("[COMPILADOR] Iniciando segunda pasada - generación de código binario")
@@ -73,7 +112,7 @@ def compile_text_to_binary(asm_text, print_callback=None, base_dir=None):
     pc = 0
     errors = 0
     
-    for lineno, line, tokens in parsed_lines:
+    for lineno, line, tokens, _index, _count in parsed_lines:
         try:
             # Validación sintáctica
             ok, err = parse_tokens(tokens)
@@ -29,154 +29,186 @@ below for convenience:
     0b010010  TST   set flags for A & B        (result ignored)
     0b010011  TEQ   set flags for A ^ B        (result ignored)
 
-Flags produced (as a namedtuple):
+Flags are returned packed as a 4-bit NZCV integer (N in bit 3, as in
+`Flags.as_nzcv()`):
     N  Negative (MSB of result)
     Z  Zero (result == 0)
     C  Carry (out from the ALU or borrow for SUB/SBC)
     V  Overflow (signed 2 - complement overflow)
 
-All data paths are 32 bits; results are masked to 32 bits.
+`unpack_flags(nzcv)` rebuilds the old `Flags` namedtuple when a caller
+needs the individual bits.
+
+All data paths are 32 bits; results are masked to 32 bits.  Each code is
+dispatched through a 64-entry table of specialised functions
+`op(a, b, carry_in) -> (result32, nzcv)`; operands arrive already masked.
 """
 from __future__ import annotations
 from collections import namedtuple
-from typing import Tuple
-import ctypes
+from typing import Callable, List, Optional, Tuple
 
 Flags = namedtuple("Flags", "N Z C V")
 
 MASK32 = 0xFFFFFFFF
 BIT32  = 1 << 32
+SIGN32 = 1 << 31
+
+N_BIT, Z_BIT, C_BIT, V_BIT = 8, 4, 2, 1
+
+AluOp = Callable[[int, int, int], Tuple[int, int]]
+
+
+def to_signed32(x: int) -> int:
+    """Interpreta los 32 bits bajos de *x* en complemento a dos."""
+    return ((x & MASK32) ^ SIGN32) - SIGN32
+
+
+def unpack_flags(nzcv: int) -> Flags:
+    """NZCV empaquetado → Flags(N, Z, C, V)."""
+    return Flags((nzcv >> 3) & 1, (nzcv >> 2) & 1, (nzcv >> 1) & 1, nzcv & 1)
+
+
+# ----------------------------------------------------------------------
+# helpers (operandos ya enmascarados a 32 bits)
+# ----------------------------------------------------------------------
+def _nz(res: int) -> int:
+    """Bits N y Z de un resultado de 32 bits."""
+    return ((res >> 28) & N_BIT) | (Z_BIT if res == 0 else 0)
+
+
+def _add_with_carry(a: int, b: int, carry: int) -> Tuple[int, int]:
+    """Return (result32, nzcv) de A + B + carry."""
+    total = a + b + carry
+    res = total & MASK32
+    nzcv = _nz(res)
+    if total >> 32:
+        nzcv |= C_BIT
+    # signed overflow: operands with same sign, result different sign
+    if (~(a ^ b) & (a ^ res)) & SIGN32:
+        nzcv |= V_BIT
+    return res, nzcv
+
+
+# ----------------------------------------------------------------------
+# operaciones (una función por código ALUSrc)
+# ----------------------------------------------------------------------
+def _op_add(a, b, c):                   # 0b000000 ADD
+    return _add_with_carry(a, b, 0)
+
+def _op_sub(a, b, c):                   # 0b000001 SUB (borrow = 0)
+    return _add_with_carry(a, b ^ MASK32, 1)
+
+def _op_adc(a, b, c):                   # 0b000010 ADC
+    return _add_with_carry(a, b, c & 1)
+
+def _op_sbc(a, b, c):                   # 0b000011 SBC (A − B − ¬C)
+    return _add_with_carry(a, b ^ MASK32, c & 1)
+
+def _op_mul(a, b, c):                   # 0b000100 MUL (lower 32 bits)
+    res = (a * b) & MASK32
+    return res, _nz(res)
+
+def _op_div(a, b, c):                   # 0b000101 DIV (signed, floor)
+    if b == 0:
+        return 0, Z_BIT
+    res = (to_signed32(a) // to_signed32(b)) & MASK32
+    return res, _nz(res)
+
+def _op_and(a, b, c):                   # 0b000110 AND / 0b010010 TST
+    res = a & b
+    return res, _nz(res)
+
+def _op_orr(a, b, c):                   # 0b000111 ORR
+    res = a | b
+    return res, _nz(res)
+
+def _op_eor(a, b, c):                   # 0b001000 EOR / 0b010011 TEQ
+    res = a ^ b
+    return res, _nz(res)
+
+def _op_bic(a, b, c):                   # 0b001001 BIC
+    res = a & (b ^ MASK32)
+    return res, _nz(res)
+
+def _op_lsl(a, b, c):                   # 0b001010 LSL
+    shift = b & 0x1F                    # solo 5 bits significativos
+    if shift == 0:
+        # convención: carry no cambia (0)
+        return a, _nz(a)
+    res = (a << shift) & MASK32
+    return res, _nz(res) | (((a >> (32 - shift)) & 1) << 1)
+
+def _op_lsr(a, b, c):                   # 0b001011 LSR (logical)
+    shift = b & 0x1F
+    if shift == 0:
+        # en ARM un shift de 0 significa 32 → resultado 0, carry = bit31
+        return 0, Z_BIT | ((a >> 31) << 1)
+    res = a >> shift
+    return res, _nz(res) | (((a >> (shift - 1)) & 1) << 1)
+
+def _op_asr(a, b, c):                   # 0b001100 ASR (signed)
+    shift = b & 0x1F
+    if shift == 0:
+        # sin desplazamiento: resultado idéntico a A, carry = 0
+        return a, _nz(a)
+    res = (to_signed32(a) >> shift) & MASK32
+    # Carry: el bit que sale justo antes de ser desplazado
+    return res, _nz(res) | (((a >> (shift - 1)) & 1) << 1)
+
+def _op_ror(a, b, c):                   # 0b001101 ROR
+    rot = b & 0x1F
+    res = ((a >> rot) | (a << (32 - rot))) & MASK32
+    return res, _nz(res) | ((res >> 31) << 1)
+
+def _op_mov(a, b, c):                   # 0b001110 MOV
+    return b, _nz(b)
+
+def _op_mvn(a, b, c):                   # 0b001111 MVN
+    res = b ^ MASK32
+    return res, _nz(res)
+
+
+# Pure flag ops (CMP, CMN, TST, TEQ) comparten implementación con
+# SUB, ADD, AND y EOR; el resultado lo descarta la etapa siguiente.
+_DISPATCH: List[Optional[AluOp]] = [None] * 64
+for _code, _fn in (
+        (0b000000, _op_add), (0b000001, _op_sub), (0b000010, _op_adc),
+        (0b000011, _op_sbc), (0b000100, _op_mul), (0b000101, _op_div),
+        (0b000110, _op_and), (0b000111, _op_orr), (0b001000, _op_eor),
+        (0b001001, _op_bic), (0b001010, _op_lsl), (0b001011, _op_lsr),
+        (0b001100, _op_asr), (0b001101, _op_ror), (0b001110, _op_mov),
+        (0b001111, _op_mvn),
+        (0b010000, _op_sub),            # CMP -> A - B
+        (0b010001, _op_add),            # CMN -> A + B
+        (0b010010, _op_and),            # TST -> A & B
+        (0b010011, _op_eor)):           # TEQ -> A ^ B
+    _DISPATCH[_code] = _fn
+del _code, _fn
+
 
 class ALU:
     """Arithmetic/Logic Unit implementing the ISA's *ALUSrc* operations."""
 
-    # ------------------------------------------------------------------
-    # helpers
-    # ------------------------------------------------------------------
-    @staticmethod
-    def _add_with_carry(a: int, b: int, carry: int) -> Tuple[int, int, int]:
-        """Return (result32, carry_out, overflow)."""
-        unsigned_sum = (a & MASK32) + (b & MASK32) + carry
-        result = unsigned_sum & MASK32
-        carry_out = 1 if unsigned_sum >> 32 else 0
-        # signed overflow: operands with same sign, result different sign
-        sa = (a >> 31) & 1
-        sb = (b >> 31) & 1
-        sr = (result >> 31) & 1
-        overflow = 1 if (sa == sb) and (sr != sa) else 0
-        return result, carry_out, overflow
-
-    @staticmethod
-    def _sub_with_borrow(a: int, b: int, carry: int) -> Tuple[int, int, int]:
-        """Implement A - B - ¬carry  (i.e. borrow = ¬carry)."""
-        # convert to addition:  A + (~B) + carry
-        return ALU._add_with_carry(a, (~b) & MASK32, carry)
+    __slots__ = ()
 
     # ------------------------------------------------------------------
     # public entry
     # ------------------------------------------------------------------
-    def execute(self, code: int, A: int, B: int, carry_in: int = 0) -> Tuple[int, Flags]:
+    def execute(self, code: int, A: int, B: int, carry_in: int = 0) -> Tuple[int, int]:
         """Execute ALU operation *code* on operands A, B.
 
         *carry_in* is only used by ADC / SBC.  For other ops it is ignored.
-        The returned *result* is a 32-bit value (or 0 for pure flag ops).
+        Returns ``(result32, nzcv)`` with the flags packed N Z C V (bit 3..0).
         """
-        op = code & 0b111111
-        C_out = V_out = 0
-
-        if   op == 0b000000:  # ADD
-            res, C_out, V_out = self._add_with_carry(A, B, 0)
-        elif op == 0b000001:  # SUB
-            res, C_out, V_out = self._sub_with_borrow(A, B, 1)  # borrow=0
-        elif op == 0b000010:  # ADC
-            res, C_out, V_out = self._add_with_carry(A, B, carry_in & 1)
-        elif op == 0b000011:  # SBC (A − B − ¬C)
-            res, C_out, V_out = self._sub_with_borrow(A, B, carry_in & 1)
-        elif op == 0b000100:  # MUL (lower 32 bits)
-            res = (A * B) & MASK32
-        elif op == 0b000101:  # DIV (signed)
-            if B == 0:
-                res = 0
-            else:
-                a_signed = ctypes.c_int32(A).value
-                b_signed = ctypes.c_int32(B).value
-                res = int(a_signed // b_signed) & MASK32
-        elif op == 0b000110:  # AND
-            res = A & B
-        elif op == 0b000111:  # ORR
-            res = A | B
-        elif op == 0b001000:  # EOR
-            res = A ^ B
-        elif op == 0b001001:  # BIC
-            res = A & (~B & MASK32)
-        elif op == 0b001010:  # LSL (Logical Shift Left)
-            shift = B & 0x1F            # solo 5 bits significativos
-            if shift == 0:
-                res = A & MASK32
-                # convención: carry no cambia (0)
-                C_out = 0
-            else:
-                res = (A << shift) & MASK32
-                C_out = (A >> (32 - shift)) & 1
-
-        elif op == 0b001011:  # LSR (Logical Shift Right)
-            shift = B & 0x1F
-            if shift == 0:
-                # en ARM un shift de 0 significa 32 → resultado 0, carry = bit31
-                res = 0
-                C_out = (A >> 31) & 1
-            else:
-                res = (A & MASK32) >> shift
-                C_out = (A >> (shift - 1)) & 1
-
-        elif op == 0b001100:  # ASR (signed)
-            # Sólo usamos los 5 bits bajos de B para el shift
-            shift = B & 0x1F
-
-            # Convertimos A a signed 32 bits
-            a_signed = ctypes.c_int32(A).value
-
-            # Ejecutamos el desplazamiento aritmético
-            if shift == 0:
-                # Sin desplazamiento: resultado idéntico a A
-                res = A & MASK32
-                # Convención: no modificamos C_out (queda en su valor previo o 0)
-                # aquí dejamos C_out como estaba (por claridad podrías asignar C_out = C_out)
-            elif shift < 32:
-                # Desplazamiento válido 1–31
-                res = a_signed >> shift
-            else:
-                # Este caso no ocurrirá porque shift está en 0–31,
-                # pero lo mantenemos por completitud
-                res = -1 if a_signed < 0 else 0
-
-            # Carry: el bit que sale justo antes de ser desplazado
-            C_out = (A >> (shift - 1)) & 1 if 0 < shift < 32 else 0
-
-        elif op == 0b001101:  # ROR
-            rot = B & 0x1F
-            rot %= 32
-            res = ((A >> rot) | (A << (32 - rot))) & MASK32
-            C_out = (res >> 31) & 1
-        elif op == 0b001110:  # MOV
-            res = B & MASK32
-        elif op == 0b001111:  # MVN
-            res = (~B) & MASK32
-        elif op in (0b010000, 0b010001, 0b010010, 0b010011):
-            # Pure flag ops: CMP, CMN, TST, TEQ
-            if   op == 0b010000:  # CMP -> A - B
-                res, C_out, V_out = self._sub_with_borrow(A, B, 1)
-            elif op == 0b010001:  # CMN -> A + B
-                res, C_out, V_out = self._add_with_carry(A, B, 0)
-            elif op == 0b010010:  # TST -> A & B
-                res = A & B
-            elif op == 0b010011:  # TEQ -> A ^ B
-                res = A ^ B
-        else:
-            raise ValueError(f"ALU code {op:06b} no implementado")
-
-        # Flags: N (bit31), Z, C, V
-        N_out = (res >> 31) & 1
-        Z_out = 1 if (res & MASK32) == 0 else 0
-        flags = Flags(N_out, Z_out, C_out & 1, V_out & 1)
-        return res & MASK32, flags
+        fn = _DISPATCH[code & 0b111111]
+        if fn is None:
+            raise ValueError(f"ALU code {code & 0b111111:06b} no implementado")
+        return fn(A & MASK32, B & MASK32, carry_in)
+
+    @staticmethod
+    def operation(code: int) -> AluOp:
+        """Función especializada para *code* (para motores que pre-resuelven)."""
+        fn = _DISPATCH[code & 0b111111]
+        if fn is None:
+            raise ValueError(f"ALU code {code & 0b111111:06b} no implementado")
+        return fn
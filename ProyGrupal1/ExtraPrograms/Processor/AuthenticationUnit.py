@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from threading import Lock
 from typing import Optional, Tuple
 
+from ExtraPrograms.Processor.Trace import TRACE, INFO
+
 
 class AuthenticationProcess:
     # ──────────── parámetros de diseño ────────────
@@ -52,7 +54,8 @@ class AuthenticationProcess:
     #  utilidades internas
     # ------------------------------------------------------------------
     def _print(self, msg: str) -> None:
-        print(f"[AUTH] {msg}")
+        if TRACE.level >= INFO:
+            TRACE.emit(INFO, "AUTH", msg)
 
     def _reset_try_counter(self) -> None:
         self.try_counter = 0
@@ -0,0 +1,262 @@
+# ExtraPrograms/Processor/BatchRunner.py
+"""
+Ejecución por lotes de muchos programas/entradas en procesos separados.
+
+Cada `BatchJob` es (instruction_mem.bin, dynamic_mem.bin, estado inicial
+de claves/contraseña) y corre en su propio `Procesador` dentro de un
+`ProcessPoolExecutor`; así cada trabajo tiene su propia instancia del
+singleton `AuthenticationProcess` y no comparte estado con los demás.
+Los resultados (`BatchResult`: memoria dinámica final, salida de PRINT*,
+ciclos y tiempo) se entregan en orden de terminación.
+
+    jobs = [BatchJob("assets/instruction_mem.bin", f, {"login": pw})
+            for f in archivos]
+    for result in BatchRunner(jobs, workers=4).results():
+        print(result)
+
+CLI:
+
+    python -m ExtraPrograms.Processor.BatchRunner Ejemplos/Cifrado_total.asm \\
+        Test/cifrado/*.txt --out out/lote --login 1 2 3 4 5 6 7 8
+    python -m ExtraPrograms.Processor.BatchRunner --jobs lote.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from ExtraPrograms.Processor.HeadlessEngine import (BinarySource, HeadlessEngine,
+                                                    load_data, load_program)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Trabajo y resultado
+# ─────────────────────────────────────────────────────────────────────────────
+class BatchJob:
+    """
+    Un programa con su entrada.  `instruction_mem`/`dynamic_mem` aceptan
+    ruta o bytes (las rutas se leen en el proceso hijo, no se serializan);
+    `initial_state` es el dict de `Procesador.set_state_from_external`
+    (típicamente "vault" con las claves y "login" con la contraseña).
+    """
+
+    __slots__ = ("name", "instruction_mem", "dynamic_mem", "initial_state")
+
+    def __init__(self, instruction_mem: BinarySource,
+                 dynamic_mem: BinarySource = None,
+                 initial_state: Optional[dict] = None,
+                 name: str = ""):
+        if isinstance(instruction_mem, Path):
+            instruction_mem = str(instruction_mem)
+        if isinstance(dynamic_mem, Path):
+            dynamic_mem = str(dynamic_mem)
+        self.instruction_mem = instruction_mem
+        self.dynamic_mem     = dynamic_mem
+        self.initial_state   = dict(initial_state or {})
+        self.name            = name or (Path(dynamic_mem).name
+                                        if isinstance(dynamic_mem, str) else "")
+
+    @classmethod
+    def from_dict(cls, d: dict, base_dir: Path = Path(".")) -> "BatchJob":
+        """Trabajo desde una entrada de --jobs (rutas relativas al JSON)."""
+        state = {k: d[k] for k in ("pc", "registers", "safe_registers",
+                                   "vault", "login", "data_memory", "flags")
+                 if k in d}
+        dyn = d.get("dynamic_mem")
+        return cls(str(base_dir / d["instruction_mem"]),
+                   str(base_dir / dyn) if dyn else None,
+                   state, d.get("name", ""))
+
+    def __repr__(self) -> str:
+        return f"BatchJob({self.name!r})"
+
+
+class BatchResult:
+    """Resultado de un `BatchJob` (o el error que lo interrumpió)."""
+
+    __slots__ = ("index", "name", "cycles", "halted", "output",
+                 "dynamic_bytes", "run_s", "wall_s", "pid", "error")
+
+    def __init__(self, index: int, name: str, cycles: int = 0,
+                 halted: bool = False, output: Optional[List[str]] = None,
+                 dynamic_bytes: bytes = b"", run_s: float = 0.0,
+                 wall_s: float = 0.0, pid: int = 0,
+                 error: Optional[str] = None):
+        self.index         = index          # posición en la lista de trabajos
+        self.name          = name
+        self.cycles        = cycles
+        self.halted        = halted
+        self.output        = output or []
+        self.dynamic_bytes = dynamic_bytes  # formato dynamic_mem.bin
+        self.run_s         = run_s          # sólo la simulación
+        self.wall_s        = wall_s         # carga + simulación + captura
+        self.pid           = pid
+        self.error         = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def cycles_per_second(self) -> float:
+        return self.cycles / self.run_s if self.run_s > 0 else 0.0
+
+    def summary(self) -> dict:
+        """Campos escalares (sin memoria ni salida) para reportes."""
+        return {"index": self.index, "name": self.name, "cycles": self.cycles,
+                "halted": self.halted, "run_s": self.run_s,
+                "wall_s": self.wall_s, "pid": self.pid, "error": self.error,
+                "output_lines": len(self.output),
+                "dynamic_bytes": len(self.dynamic_bytes)}
+
+    def __str__(self) -> str:
+        if not self.ok:
+            return f"[ERROR] #{self.index} {self.name}: {self.error}"
+        return (f"[{'OK' if self.halted else 'SIN SWI'}] #{self.index} {self.name}: "
+                f"{self.cycles} ciclos, {self.wall_s:.2f} s "
+                f"({self.cycles_per_second:,.0f} ciclos/s, pid {self.pid})")
+
+
+def _run_job(index: int, job: BatchJob, engine: str,
+             max_cycles: int) -> BatchResult:
+    """Cuerpo del proceso hijo (nivel de módulo para poder serializarlo)."""
+    start = time.perf_counter()
+    try:
+        snap = HeadlessEngine(job.instruction_mem, job.dynamic_mem,
+                              job.initial_state, engine=engine).run(max_cycles)
+    except Exception as exc:                        # se reporta, no aborta el lote
+        return BatchResult(index, job.name, wall_s=time.perf_counter() - start,
+                           pid=os.getpid(), error=f"{type(exc).__name__}: {exc}")
+    return BatchResult(index, job.name, snap.cycles, snap.halted, snap.output,
+                       snap.dynamic_bytes(), snap.elapsed_s,
+                       time.perf_counter() - start, os.getpid())
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Ejecutor
+# ─────────────────────────────────────────────────────────────────────────────
+class BatchRunner:
+    """
+    Reparte `jobs` en `workers` procesos (por defecto os.cpu_count()).
+    `engine` es uno de `HeadlessEngine.ENGINES`; "translated" da los mismos
+    ciclos y estado que "pipeline" y es el más rápido.
+    """
+
+    def __init__(self, jobs: List[BatchJob], workers: Optional[int] = None,
+                 engine: str = "translated",
+                 max_cycles: int = HeadlessEngine.DEFAULT_MAX_CYCLES):
+        if engine not in HeadlessEngine.ENGINES:
+            raise ValueError(f"Motor desconocido: {engine!r}")
+        self.jobs = list(jobs)
+        self.workers = max(1, min(workers or os.cpu_count() or 1,
+                                  len(self.jobs) or 1))
+        self.engine = engine
+        self.max_cycles = max_cycles
+        self.wall_s = 0.0
+
+    def results(self) -> Iterator[BatchResult]:
+        """Genera cada `BatchResult` en cuanto su proceso termina."""
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(_run_job, i, job, self.engine, self.max_cycles)
+                       for i, job in enumerate(self.jobs)]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+                self.wall_s = time.perf_counter() - start
+
+    def run(self) -> List[BatchResult]:
+        """Ejecuta todo y devuelve los resultados en el orden de `jobs`."""
+        return sorted(self.results(), key=lambda r: r.index)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────────────
+def _int(text: str) -> int:
+    return int(text, 0)
+
+
+def _jobs_from_args(args) -> List[BatchJob]:
+    if args.jobs:
+        path = Path(args.jobs)
+        entries = json.loads(path.read_text(encoding="utf-8"))
+        return [BatchJob.from_dict(e, path.parent) for e in entries]
+
+    program = load_program(args.program)            # se compila una sola vez
+    state = {}
+    if args.vault:
+        state["vault"] = args.vault
+    if args.login:
+        state["login"] = args.login
+    jobs = []
+    for data in args.data:
+        # .bin se pasa como ruta; otros archivos se alinean a 64 bits
+        dyn = data if data.lower().endswith(".bin") else load_data(data)
+        jobs.append(BatchJob(program, dyn, state, name=Path(data).name))
+    return jobs
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Ejecuta un programa sobre muchas entradas en paralelo.")
+    parser.add_argument("program", nargs="?", help=".asm o instruction_mem.bin")
+    parser.add_argument("data", nargs="*", help="archivos para la memoria dinámica")
+    parser.add_argument("--jobs", help="JSON con una lista de trabajos "
+                        "{instruction_mem, dynamic_mem, vault, login, ...}")
+    parser.add_argument("--vault", type=_int, nargs="+", metavar="K",
+                        help="k0.0..k3.3 (claves)")
+    parser.add_argument("--login", type=_int, nargs="+", metavar="P",
+                        help="P1..P8 (contraseña)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--engine", choices=HeadlessEngine.ENGINES,
+                        default="translated")
+    parser.add_argument("--max-cycles", type=int,
+                        default=HeadlessEngine.DEFAULT_MAX_CYCLES)
+    parser.add_argument("--out", help="directorio para <nombre>.bin (memoria "
+                        "dinámica final) y <nombre>.txt (salida)")
+    parser.add_argument("--json", help="escribir el resumen de cada trabajo")
+    args = parser.parse_args(argv)
+    if not args.jobs and not (args.program and args.data):
+        parser.error("indique programa y datos, o --jobs")
+
+    runner = BatchRunner(_jobs_from_args(args), args.workers, args.engine,
+                         args.max_cycles)
+    out = Path(args.out) if args.out else None
+    if out is not None:
+        out.mkdir(parents=True, exist_ok=True)
+
+    summaries, failed, cycles = [], 0, 0
+    for result in runner.results():
+        print(result, flush=True)
+        summaries.append(result.summary())
+        failed += not result.ok
+        cycles += result.cycles
+        if out is not None and result.ok:
+            stem = f"{result.index:03d}_{Path(result.name).stem or 'job'}"
+            (out / f"{stem}.bin").write_bytes(result.dynamic_bytes)
+            (out / f"{stem}.txt").write_text("\n".join(result.output),
+                                             encoding="utf-8")
+
+    print(f"{len(summaries)} trabajos, {runner.workers} procesos, "
+          f"{cycles} ciclos en {runner.wall_s:.2f} s")
+    if args.json:
+        Path(args.json).write_text(json.dumps(
+            {"workers": runner.workers, "engine": runner.engine,
+             "wall_s": runner.wall_s,
+             "jobs": sorted(summaries, key=lambda s: s["index"])}, indent=2),
+            encoding="utf-8")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
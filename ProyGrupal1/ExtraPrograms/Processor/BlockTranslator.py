@@ -0,0 +1,496 @@
+# ExtraPrograms/Processor/BlockTranslator.py
+"""
+Motor de traducción por bloques básicos (DBT a closures de Python).
+
+Alternativa headless a `Pipeline.step`: cada bloque básico de la memoria
+de instrucciones (código lineal hasta B/BEQ/BNE/BLT/BGT/SWI) se traduce
+UNA vez a una función de Python generada con `exec`, especializada en las
+señales de control ya conocidas, y queda en caché por PC de inicio.  La
+caché se invalida cuando cambia `InstructionMemory.version` (recarga).
+
+El resultado arquitectónico y el conteo de ciclos son los del `Pipeline`
+de 5 etapas, incluida su semántica de saltos:
+
+• Un salto tomado redirige el fetch 5 ciclos después de haberse buscado:
+  las 4 instrucciones siguientes (delay slots) se ejecutan siempre.  El
+  flush de `Pipeline.step` nunca dispara porque `pc.tick()` limpia
+  `pcsrc_w` antes de consultarlo; aquí se reproduce ese comportamiento.
+• La escritura de registros (WB) de la instrucción j sólo es visible para
+  la decodificación de j+4 en adelante; la compuerta de seguridad de la
+  escritura en registros seguros se evalúa con los flags posteriores a
+  EX(j+1).
+• Flags, memorias y escrituras de Vault/Login (en ID) son secuenciales.
+• SWI: se completan MEM(s-1) y WB(s-2), no WB(s-1) ni MEM/WB(s), y la
+  instrucción s+1 sólo alcanza a decodificarse.  Ciclos = s + 3.
+
+Diferencias deliberadas respecto al `Pipeline`:
+• No se emiten trazas por unidad (use `Pipeline` + `Trace` para depurar).
+• La expiración por tiempo de la sesión segura / bloqueo de la unidad de
+  autenticación se evalúa al entrar a cada bloque (CMPS/LOGOUT siempre
+  pasan por `CondUnit`), no en cada EX.
+• Los registros generales se normalizan a 32 bits al iniciar `run()`.
+• Si se agota `max_cycles` sin SWI, la ejecución se corta en el borde de
+  un bloque y las escrituras en vuelo no se aplican.
+"""
+from __future__ import annotations
+
+import struct
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ExtraPrograms.Processor.ALU import ALU
+from ExtraPrograms.Processor.InstructionDecoder import predecode
+
+MASK32    = 0xFFFFFFFF
+OP_SWI    = 0x2F
+MAX_BLOCK = 64                 # tope de instrucciones por bloque
+DELAY_SLOTS = 4                # instrucciones que siguen a un salto
+
+# Códigos de salida de un bloque
+EXIT_FALL     = 0              # siguió de largo: next_pc = último + 8
+EXIT_RESOLVED = 1              # salto con sus 4 delay slots dentro del bloque
+EXIT_BRANCH   = 2              # salto al final: redirección pendiente
+EXIT_HALT     = 3              # SWI ejecutó EX
+
+_WORD = struct.Struct("<I")
+
+# Expresiones en línea del resultado de la ALU (sin flags) por código
+_INLINE = {
+    0b000000: "({a} + {b}) & 0xFFFFFFFF",
+    0b000001: "({a} - {b}) & 0xFFFFFFFF",
+    0b000010: "({a} + {b} + ((fl >> 1) & 1)) & 0xFFFFFFFF",
+    0b000011: "({a} - {b} - 1 + ((fl >> 1) & 1)) & 0xFFFFFFFF",
+    0b000100: "({a} * {b}) & 0xFFFFFFFF",
+    0b000110: "{a} & {b}",
+    0b000111: "{a} | {b}",
+    0b001000: "{a} ^ {b}",
+    0b001001: "{a} & ({b} ^ 0xFFFFFFFF)",
+    0b001010: "({a} << ({b} & 31)) & 0xFFFFFFFF",
+    0b001110: "{b}",
+    0b001111: "{b} ^ 0xFFFFFFFF",
+    0b010000: "({a} - {b}) & 0xFFFFFFFF",
+    0b010001: "({a} + {b}) & 0xFFFFFFFF",
+    0b010010: "{a} & {b}",
+    0b010011: "{a} ^ {b}",
+}
+
+# Condición de salto sobre un NZCV empaquetado (BranchOp → expresión)
+_COND = {
+    0b000: "True",
+    0b001: "({f} & 4) != 0",
+    0b010: "({f} & 4) == 0",
+    0b011: "(({f} >> 3) ^ {f}) & 1 == 1",
+    0b100: "({f} & 4) == 0 and (({f} >> 3) ^ {f}) & 1 == 0",
+}
+
+
+def _is_control(c) -> bool:
+    return c is not None and (c.PCSrc or c.op == OP_SWI)
+
+
+def _wb_effects(c) -> Tuple[int, int, int]:
+    """(rd_general | 0, rd_seguro | -1, PrintEn | 3) de una instrucción."""
+    wr = c.rd if (c.RegWriteR and c.rd) else 0
+    ws = c.rd if (c.RegWriteS and c.rd <= 8) else -1
+    return wr, ws, c.PrintEn
+
+
+class BlockTranslator:
+    """
+    Ejecuta un `Procesador` traduciendo su programa por bloques.
+
+    Opera sobre las mismas unidades del procesador (registros, memorias,
+    flags, impresora), de modo que al terminar el estado queda listo para
+    `ProcessorSnapshot.capture` o para guardarse desde la GUI.
+    """
+
+    def __init__(self, cpu):
+        if any((cpu.pipeline.if_id.valid, cpu.pipeline.id_ex.valid,
+                cpu.pipeline.ex_mem.valid, cpu.pipeline.mem_wb.valid)):
+            raise RuntimeError("El pipeline debe estar vacío para traducir.")
+        self.cpu = cpu
+        self._imem = cpu.instruction_memory
+        self._cache: Dict[Tuple[int, int], Callable] = {}
+        self._version = self._imem.version
+        self._ns: dict = {}
+        self.blocks_compiled = 0
+        self.blocks_executed = 0
+        self.cycles = 0
+        self.halted = False
+
+    # ───────────────────────── caché ─────────────────────────────
+    def invalidate(self) -> None:
+        """Descarta todos los bloques traducidos."""
+        self._cache.clear()
+        self._version = self._imem.version
+
+    def _bind(self) -> None:
+        """(Re)enlaza el espacio de nombres que usan los bloques."""
+        cpu = self.cpu
+        printer = cpu.pipeline.printer_unit
+        ns = self._ns
+        ns.update(
+            R=cpu.register_file.regs,
+            W=cpu.safe_register_file._regs,
+            V=cpu.vault_memory._mem,
+            P=cpu.login_memory._mem,
+            F=cpu.flags,
+            DM=cpu.data_memory,
+            DMB=cpu.data_memory._mem,
+            DY=cpu.dynamic_memory,
+            U=_WORD.unpack_from,
+            PK=_WORD.pack,
+            SEC=cpu.cond_unit._handle_security,
+            PI=printer.print_integer,
+            PA=printer.print_ascii,
+            PB=printer.print_binary,
+        )
+        for code in range(64):
+            try:
+                ns[f"OP{code}"] = ALU.operation(code)
+            except ValueError:
+                pass
+
+    # ───────────────────────── commit genérico ───────────────────
+    def _commit(self, rec) -> None:
+        """Aplica un registro WB [rd, rd_seguro, valor, PrintEn]."""
+        if rec is None:
+            return
+        wr, ws, v, pe = rec
+        ns = self._ns
+        if wr:
+            ns["R"][wr] = v
+        if ws >= 0:
+            ns["W"][ws] = v
+        if pe == 0:
+            ns["PI"](v)
+        elif pe == 1:
+            ns["PA"](v)
+        elif pe == 2:
+            ns["PB"](v)
+
+    def _decode_only(self, addr: int) -> None:
+        """ID de la instrucción que sigue a SWI: sólo escrituras Vault/Login."""
+        c = self._imem.decoded(addr) or predecode(self._imem.read(addr))
+        flags = self.cpu.flags
+        if flags.S1 & flags.S2:
+            if c.MemWriteV:
+                self.cpu.vault_memory._mem[c.ar2 & 0xF] = c.imm32
+            if c.MemWriteP:
+                self.cpu.login_memory._mem[c.ar2 & 0x7] = c.imm32
+
+    # ───────────────────────── formación de bloques ──────────────
+    def _scan(self, pc: int, limit: int):
+        """Lista de (addr, ctrl | None) del bloque y su código de salida."""
+        imem = self._imem
+        cap = limit or MAX_BLOCK
+        slots = []
+        addr = pc
+        while len(slots) < cap:
+            c = imem.decoded(addr)
+            slots.append((addr, c))
+            if c is None:
+                return slots, EXIT_FALL            # decodificación lanzará
+            if c.op == OP_SWI:
+                return slots, EXIT_HALT
+            if c.PCSrc:
+                if len(slots) + DELAY_SLOTS <= cap:
+                    delay = [(addr + 8 * i, imem.decoded(addr + 8 * i))
+                             for i in range(1, DELAY_SLOTS + 1)]
+                    if all(d is not None and not _is_control(d) for _, d in delay):
+                        slots.extend(delay)
+                        return slots, EXIT_RESOLVED
+                return slots, EXIT_BRANCH
+            addr += 8
+        return slots, EXIT_FALL
+
+    # ───────────────────────── generación de código ──────────────
+    def _compile(self, pc: int, limit: int) -> Callable:
+        slots, exit_code = self._scan(pc, limit)
+        n = len(slots)
+        ctrls = [c for _, c in slots]
+
+        # Liveness de flags NZCV (hacia atrás)
+        any_def = any(c is not None and c.FlagsUpd for c in ctrls)
+        live = any_def
+        live_out: List[bool] = [False] * n
+        uses: List[bool] = [False] * n
+        for k in range(n - 1, -1, -1):
+            c = ctrls[k]
+            live_out[k] = live
+            if c is None:
+                continue
+            uses[k] = (c.ALUSrc in (0b000010, 0b000011)
+                       or (c.PCSrc and 1 <= c.BranchOp <= 4 and not c.FlagsUpd))
+            live = uses[k] or (live and not c.FlagsUpd)
+        live_in = live
+
+        out: List[str] = ["def _blk(win):", " c4, c3, c2, c1 = win",
+                          " en = F.S1 & F.S2"]
+        emit = lambda s: out.append(" " + s)
+        if live_in:
+            emit("fl = (F.N << 3) | (F.Z << 2) | (F.C << 1) | F.V")
+
+        carried = {-4: "c4", -3: "c3", -2: "c2", -1: "c1"}
+        effects: Dict[int, Tuple[int, int, int]] = {}
+        has_fx: Dict[int, bool] = {}
+        branch_k = -1
+
+        def commit_static(j: int) -> None:
+            wr, ws, pe = effects[j]
+            if wr:
+                emit(f"R[{wr}] = v{j}")
+            if ws >= 0:
+                emit(f"if g{j}: W[{ws}] = v{j}")
+            if pe in (0, 1, 2):
+                emit(f"{('PI', 'PA', 'PB')[pe]}(v{j})")
+
+        halted_at = -1
+        for k, (addr, c) in enumerate(slots):
+            # 1) WB de la instrucción k-4 (visible para este ID)
+            j = k - 4
+            if j < 0:
+                emit(f"if {carried[j]} is not None: COMMIT({carried[j]})")
+            elif has_fx.get(j):
+                commit_static(j)
+
+            # 2) ID
+            if c is None:
+                word = self._imem.read(addr)
+                try:
+                    predecode(word)
+                    msg = f"Opcode inválido en 0x{addr:08X}"
+                except ValueError as e:
+                    msg = str(e)
+                emit(f"raise ValueError({msg!r})")
+                break
+
+            if c.BranchE:
+                a = str(addr)
+            elif c.RegisterInA == 1:
+                a = f"R[{c.ar1}]"
+            elif c.ar1 < 10:
+                emit(f"a{k} = W[{c.ar1}] if en else 0")
+                a = f"a{k}"
+            else:
+                a = "0"
+
+            src_b = c.RegisterInB
+            if src_b == 0b00:
+                b_int = f"R[{c.ar2}]"
+            elif src_b == 0b01:
+                b_int = f"(W[{c.ar2}] if en else 0)" if c.ar2 < 10 else "0"
+            elif src_b == 0b10:
+                b_int = f"(V[{c.ar2 & 0xF}] if en else 0)"
+            else:
+                b_int = (f"P[{c.ar2 & 0x7}]" if c.ComS
+                         else f"(P[{c.ar2 & 0x7}] if en else 0)")
+            stores = c.MemWriteG or c.MemWriteD
+            if (stores or not c.ImmediateOp) and not b_int.startswith("R["):
+                if b_int != "0":
+                    emit(f"s{k} = {b_int}")
+                    b_int = f"s{k}"
+            b = str(c.imm32) if c.ImmediateOp else b_int
+
+            if c.MemWriteV:
+                emit(f"if en: V[{c.ar2 & 0xF}] = {c.imm32}")
+            if c.MemWriteP:
+                emit(f"if en: P[{c.ar2 & 0x7}] = {c.imm32}")
+
+            # 3) compuerta de seguridad del WB de k-2
+            j = k - 2
+            if j < 0:
+                cj = carried[j]
+                emit(f"if {cj} is not None and {cj}[1] >= 0 and not en: {cj}[1] = -1")
+            elif effects.get(j, (0, -1, 3))[1] >= 0:
+                emit(f"g{j} = en")
+
+            # 4) EX
+            wr, ws, pe = _wb_effects(c)
+            fx = bool(wr or ws >= 0 or pe in (0, 1, 2))
+            is_branch = bool(c.PCSrc)
+            sec = bool(c.ComS or c.LogOut)
+            need_res = (c.MemOp in (0b00, 0b01) or stores or fx or is_branch)
+            cond_needs_nz = is_branch and c.FlagsUpd and 1 <= c.BranchOp <= 4
+            need_nz = sec or cond_needs_nz or (c.FlagsUpd and live_out[k])
+
+            code = c.ALUSrc
+            if need_nz:
+                cin = "((fl >> 1) & 1)" if code in (0b000010, 0b000011) else "0"
+                emit(f"r{k}, nz{k} = OP{code}({a}, {b}, {cin})")
+                if c.FlagsUpd and live_out[k]:
+                    emit(f"fl = nz{k}")
+            elif need_res:
+                tmpl = _INLINE.get(code)
+                if tmpl is not None:
+                    emit(f"r{k} = " + tmpl.format(a=a, b=b))
+                else:
+                    cin = "((fl >> 1) & 1)" if code in (0b000010, 0b000011) else "0"
+                    emit(f"r{k} = OP{code}({a}, {b}, {cin})[0]")
+
+            if is_branch:
+                f = f"nz{k}" if c.FlagsUpd else "fl"
+                emit(f"t{k} = " + _COND.get(c.BranchOp, "False").format(f=f))
+                branch_k = k
+
+            if sec:
+                emit(f"SEC({c.LogOut}, {c.ComS}, {c.ar2}, nz{k})")
+                emit("en = F.S1 & F.S2")
+            elif k == 0:
+                # expiración de sesión / bloqueo y login de flags por bloque
+                emit("SEC(0, 0, 0, 0)")
+                emit("en = F.S1 & F.S2")
+
+            if c.op == OP_SWI:
+                halted_at = k
+                break
+
+            # 5) MEM
+            mem_op = c.MemOp
+            if mem_op == 0b00:
+                emit(f"ld = U(DMB, r{k})[0] if r{k} <= 252 else DM.read(r{k})")
+            elif mem_op == 0b01:
+                emit(f"ld = DY.read(r{k})")
+            if stores:
+                wd = f"{b_int} & 255" if c.MemByte else b_int
+                if c.MemWriteG:
+                    emit(f"if r{k} <= 252: DMB[r{k}:r{k} + 4] = PK({wd})")
+                    emit(f"else: DM.write(r{k}, {wd}, 1); DM.tick()")
+                if c.MemWriteD:
+                    emit(f"DY.write(r{k}, {wd}, 1); DY.tick()")
+
+            # 6) valor para WB
+            effects[k] = (wr, ws, pe)
+            has_fx[k] = fx
+            if fx or is_branch:
+                v = "ld" if mem_op in (0b00, 0b01) else f"r{k}"
+                if c.MemByte:
+                    v = f"{v} & 255"
+                emit(f"v{k} = {v}")
+
+        # ─── salida: ventana de WB pendientes y escritura de flags ───
+        if any_def:
+            emit("F.N = fl >> 3; F.Z = (fl >> 2) & 1; F.C = (fl >> 1) & 1; F.V = fl & 1")
+
+        def record(p: int) -> str:
+            if p < 0:
+                return carried[p]
+            if not has_fx.get(p):
+                return "None"
+            wr, ws, pe = effects[p]
+            if ws < 0:
+                rs = "-1"
+            elif p + 2 <= n - 1:
+                rs = f"({ws} if g{p} else -1)"
+            else:
+                rs = str(ws)
+            return f"[{wr}, {rs}, v{p}, {pe}]"
+
+        if halted_at >= 0:
+            emit(f"win[:] = ({record(n - 4)}, {record(n - 3)}, {record(n - 2)}, None)")
+            emit(f"return {n}, {EXIT_HALT}, {slots[-1][0] + 8}, -1")
+        else:
+            emit(f"win[:] = ({record(n - 4)}, {record(n - 3)}, "
+                 f"{record(n - 2)}, {record(n - 1)})")
+            fall = slots[-1][0] + 8
+            if exit_code == EXIT_RESOLVED:
+                emit(f"return {n}, {EXIT_RESOLVED}, "
+                     f"(v{branch_k} if t{branch_k} else {fall}), -1")
+            elif exit_code == EXIT_BRANCH:
+                emit(f"return {n}, {EXIT_BRANCH}, {fall}, "
+                     f"(v{branch_k} if t{branch_k} else -1)")
+            else:
+                emit(f"return {n}, {EXIT_FALL}, {fall}, -1")
+
+        source = "\n".join(out)
+        ns = self._ns
+        ns.setdefault("COMMIT", self._commit)
+        exec(compile(source, f"<block 0x{pc:08X}/{limit}>", "exec"), ns)
+        fn = ns.pop("_blk")
+        fn.source = source
+        self.blocks_compiled += 1
+        return fn
+
+    def block_source(self, pc: int, limit: int = 0) -> str:
+        """Código Python generado para el bloque (pc, limit) — depuración."""
+        self._bind()
+        return self._compile(pc, limit).source
+
+    # ───────────────────────── ejecución ─────────────────────────
+    def run(self, max_cycles: int = 50_000_000) -> bool:
+        """
+        Ejecuta desde el PC actual hasta SWI o `max_cycles`.
+        Devuelve True si terminó por SWI (mismo criterio que el Pipeline).
+        """
+        cpu = self.cpu
+        if self._imem.version != self._version:
+            self.invalidate()
+        self._bind()
+
+        regs = cpu.register_file.regs
+        regs[:] = [r & MASK32 for r in regs]
+        for unit in (cpu.register_file, cpu.safe_register_file,
+                     cpu.vault_memory, cpu.login_memory):
+            unit.tick()                        # consolida escrituras previas
+        cpu.data_memory.tick()
+        cpu.dynamic_memory.tick()
+
+        cache = self._cache
+        compile_block = self._compile
+        win: List[Optional[list]] = [None, None, None, None]
+        redirects: deque = deque()             # (slot, destino) pendientes
+        pc = cpu.pc.get_pc()
+        slot = 0
+        halted = False
+        executed = 0
+
+        while slot < max_cycles:
+            if redirects and redirects[0][0] == slot:
+                pc = redirects.popleft()[1]
+            limit = redirects[0][0] - slot if redirects else 0
+            key = (pc, limit)
+            blk = cache.get(key)
+            if blk is None:
+                blk = cache[key] = compile_block(pc, limit)
+            n, code, next_pc, target = blk(win)
+            executed += 1
+            if code == EXIT_HALT:
+                s = slot + n - 1
+                halted = True
+                break
+            if code == EXIT_BRANCH and target >= 0:
+                redirects.append((slot + n - 1 + 5, target))
+            slot += n
+            pc = next_pc
+
+        self.blocks_executed += executed
+        if halted:
+            # Drenaje del SWI en la posición s: WB(s-3), ID(s+1), WB(s-2)
+            def fetch_addr(x: int, prev: int) -> int:
+                while redirects and redirects[0][0] < x:
+                    redirects.popleft()
+                if redirects and redirects[0][0] == x:
+                    return redirects[0][1]
+                return prev
+
+            a1 = fetch_addr(s + 1, next_pc)
+            self._commit(win[0])
+            self._decode_only(a1)
+            self._commit(win[1])
+            a2 = fetch_addr(s + 2, a1 + 8)
+            a3 = fetch_addr(s + 3, a2 + 8)
+            cycles = s + 3
+            cpu.pc._pc = a3
+            cpu.pipeline.halt_requested = True
+            cpu.cond_unit.CondExE = 0
+            cpu.cond_unit.SafeFlagsOut = (cpu.flags.S1 << 1) | cpu.flags.S2
+        else:
+            cycles = slot
+            cpu.pc._pc = pc
+
+        cpu.pc.result_w = 0
+        cpu.pc.pcsrc_w = 0
+        cpu.pipeline.clock_cycle += cycles
+        self.cycles = cycles
+        self.halted = halted
+        return halted
@@ -0,0 +1,471 @@
+# ExtraPrograms/Processor/Checkpoint.py
+"""
+Checkpoints binarios del estado completo de un `Procesador`.
+
+Un checkpoint cubre todas las unidades (PC, RegisterFile,
+SafeRegisterFile, Vault/Login, DataMemory, DynamicMemory, InstructionMemory,
+Flags, CondUnit, AuthenticationProcess, los registros de etapa del
+`Pipeline` y sus contadores de rendimiento), de modo que una ejecución
+larga puede retomarse sin pasar por `table_data.xlsx` ni por los .bin.
+Guardar y cargar es O(tamaño del estado): cada unidad es una sección con
+`struct`, sin texto intermedio.
+
+Formato (little-endian, versión FORMAT_VERSION):
+
+    cabecera : MAGIC "ACPU" | versión u16 | banderas u16 | uid 16 B | uid base 16 B
+    sección  : etiqueta 4 B | longitud u32 | contenido
+
+Un checkpoint *incremental* (F_INCREMENTAL) guarda la memoria dinámica
+sólo como las páginas modificadas desde su checkpoint base (sección
+"DYNP"); al restaurarlo se aplica primero la base.  El resto de las
+secciones siempre va completo porque es pequeño.
+
+    cp0 = Checkpoint.capture(cpu)               # completo
+    cp1 = Checkpoint.capture(cpu, base=cp0)     # sólo páginas sucias
+    cp1.save("run.ckpt")
+    Checkpoint.load("run.ckpt", base=cp0).restore(cpu)
+"""
+from __future__ import annotations
+
+import math
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ExtraPrograms.Processor.AuthenticationUnit import AuthenticationProcess
+from ExtraPrograms.Processor.InstructionDecoder import predecode
+
+MAGIC          = b"ACPU"
+FORMAT_VERSION = 1
+F_INCREMENTAL  = 0x0001
+
+_HEADER  = struct.Struct("<4sHH16s16s")
+_SECTION = struct.Struct("<4sI")
+_NO_BASE = bytes(16)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Lectura / escritura de campos
+# ─────────────────────────────────────────────────────────────────────────────
+class _Writer:
+    __slots__ = ("parts",)
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+
+    def pack(self, fmt: str, *values) -> None:
+        self.parts.append(struct.pack("<" + fmt, *values))
+
+    def raw(self, data: bytes) -> None:
+        self.parts.append(struct.pack("<I", len(data)))
+        self.parts.append(bytes(data))
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.parts)
+
+
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, fmt: str) -> tuple:
+        st = struct.Struct("<" + fmt)
+        values = st.unpack_from(self.data, self.pos)
+        self.pos += st.size
+        return values
+
+    def one(self, fmt: str):
+        return self.unpack(fmt)[0]
+
+    def raw(self) -> bytes:
+        n = self.one("I")
+        data = bytes(self.data[self.pos:self.pos + n])
+        self.pos += n
+        return data
+
+
+def _put_pending(w: _Writer, pending) -> None:
+    if pending is None:
+        w.pack("?BI", False, 0, 0)
+    else:
+        w.pack("?BI", True, pending[0], pending[1])
+
+
+def _get_pending(r: _Reader):
+    has, idx, val = r.unpack("?BI")
+    return (idx, val) if has else None
+
+
+def _put_wbuf(w: _Writer, wbuf) -> None:
+    entries = list(wbuf.entries())
+    w.pack("B", len(entries))
+    for addr, data in entries:
+        w.pack("Q", addr)
+        w.raw(data)
+
+
+def _get_wbuf(r: _Reader, wbuf) -> None:
+    wbuf.clear()
+    for _ in range(r.one("B")):
+        addr = r.one("Q")
+        wbuf.push(addr, r.raw())
+
+
+def _put_time(w: _Writer, t: Optional[datetime]) -> None:
+    w.pack("d", t.timestamp() if t is not None else math.nan)
+
+
+def _get_time(r: _Reader) -> Optional[datetime]:
+    ts = r.one("d")
+    return None if math.isnan(ts) else datetime.fromtimestamp(ts)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Secciones: etiqueta → (guardar(cpu, w), cargar(cpu, r))
+# ─────────────────────────────────────────────────────────────────────────────
+def _save_pc(cpu, w):
+    pc = cpu.pc
+    w.pack("QQ?", pc._pc, pc.result_w, bool(pc.pcsrc_w))
+
+
+def _load_pc(cpu, r):
+    pc = cpu.pc
+    pc._pc, pc.result_w, pcsrc = r.unpack("QQ?")
+    pc.pcsrc_w = int(pcsrc)
+
+
+def _save_regs(cpu, w):
+    rf = cpu.register_file
+    w.pack("16I", *rf.regs)
+    _put_pending(w, rf._pending)
+
+
+def _load_regs(cpu, r):
+    rf = cpu.register_file
+    rf.regs[:] = r.unpack("16I")
+    rf._pending = _get_pending(r)
+
+
+def _save_safe(cpu, w):
+    sr = cpu.safe_register_file
+    w.pack(f"{sr.NUM_REGS}I", *sr._regs)
+    _put_pending(w, sr._pending)
+
+
+def _load_safe(cpu, r):
+    sr = cpu.safe_register_file
+    sr._regs[:] = r.unpack(f"{sr.NUM_REGS}I")
+    sr._pending = _get_pending(r)
+
+
+def _small_memory(attr: str) -> Tuple[Callable, Callable]:
+    """Vault / Login: lista de palabras de 32 bits + escritura latcheada."""
+    def save(cpu, w):
+        unit = getattr(cpu, attr)
+        w.pack("B", len(unit._mem))
+        w.pack(f"{len(unit._mem)}I", *unit._mem)
+        _put_pending(w, unit._pending)
+
+    def load(cpu, r):
+        unit = getattr(cpu, attr)
+        n = r.one("B")
+        unit._mem[:] = r.unpack(f"{n}I")
+        unit._pending = _get_pending(r)
+
+    return save, load
+
+
+def _save_flags(cpu, w):
+    f, cu = cpu.flags, cpu.cond_unit
+    w.pack("6B", f.N, f.Z, f.C, f.V, f.S1, f.S2)
+    w.pack("3B", cu.CondExE, cu.SafeFlagsOut, cu.Flags)
+
+
+def _load_flags(cpu, r):
+    f, cu = cpu.flags, cpu.cond_unit
+    f.N, f.Z, f.C, f.V, f.S1, f.S2 = r.unpack("6B")
+    cu.CondExE, cu.SafeFlagsOut, cu.Flags = r.unpack("3B")
+
+
+def _save_auth(_cpu, w):
+    a = AuthenticationProcess()
+    w.pack("IBBB", a.try_counter, a.block_states, a.S1, a.S2)
+    _put_time(w, a.lockout_start)
+    _put_time(w, a.session_start)
+
+
+def _load_auth(_cpu, r):
+    a = AuthenticationProcess()
+    a.try_counter, a.block_states, a.S1, a.S2 = r.unpack("IBBB")
+    a.lockout_start = _get_time(r)
+    a.session_start = _get_time(r)
+
+
+def _save_imem(cpu, w):
+    words = cpu.instruction_memory.dump()
+    w.pack("I", len(words))
+    w.pack(f"{len(words)}Q", *words)
+
+
+def _load_imem(cpu, r):
+    n = r.one("I")
+    imem = cpu.instruction_memory
+    imem._mem = []
+    imem.load(list(r.unpack(f"{n}Q")))
+
+
+def _save_dmem(cpu, w):
+    dm = cpu.data_memory
+    w.raw(dm.view())
+    _put_wbuf(w, dm._wbuf)
+
+
+def _load_dmem(cpu, r):
+    dm = cpu.data_memory
+    dm._mem[:] = r.raw()
+    _get_wbuf(r, dm._wbuf)
+
+
+def _save_dyn(cpu, w):
+    dy = cpu.dynamic_memory
+    w.pack("Q", dy.loaded_blocks)
+    w.raw(dy.to_bytes())
+    _put_wbuf(w, dy._wbuf)
+
+
+def _load_dyn(cpu, r):
+    dy = cpu.dynamic_memory
+    r.one("Q")                                      # implícito en el contenido
+    dy.load_bytes(r.raw())
+    _get_wbuf(r, dy._wbuf)
+
+
+# Registros de etapa: campo → formato ("D" = DecodedInstruction, "S" = texto)
+_LATCHES = (
+    ("if_id",  (("valid", "?"), ("pc", "Q"), ("instruction", "Q"),
+                ("decoded", "D"))),
+    ("id_ex",  (("valid", "?"), ("A", "Q"), ("B", "Q"), ("login_block", "B"),
+                ("rd", "B"), ("rd_special", "Q"), ("flags_e", "B"),
+                ("opcode", "B"), ("ctrl", "D"), ("security_violation", "?"),
+                ("security_msg", "S"))),
+    ("ex_mem", (("valid", "?"), ("alu_out", "Q"), ("rd", "B"),
+                ("rd_special", "Q"), ("opcode", "B"), ("ctrl", "D"),
+                ("pcsrc", "B"))),
+    ("mem_wb", (("valid", "?"), ("alu_out", "Q"), ("rd", "B"),
+                ("opcode", "B"), ("ctrl", "D"), ("pcsrc", "B"))),
+)
+
+
+def _save_pipe(cpu, w):
+    p = cpu.pipeline
+    w.pack("QQ?", p.clock_cycle, p.instructions_completed, p.halt_requested)
+    for name, fields in _LATCHES:
+        latch = getattr(p, name)
+        for field, fmt in fields:
+            value = getattr(latch, field)
+            if fmt == "D":
+                w.pack("?Q", value is not None, value.word if value is not None else 0)
+            elif fmt == "S":
+                w.raw(value.encode("utf-8"))
+            else:
+                w.pack(fmt, value)
+
+
+def _load_pipe(cpu, r):
+    p = cpu.pipeline
+    p.clock_cycle, p.instructions_completed, p.halt_requested = r.unpack("QQ?")
+    for name, fields in _LATCHES:
+        latch = getattr(p, name)
+        for field, fmt in fields:
+            if fmt == "D":
+                has, word = r.unpack("?Q")
+                value = predecode(word) if has else None
+            elif fmt == "S":
+                value = r.raw().decode("utf-8")
+            else:
+                value = r.one(fmt)
+            setattr(latch, field, value)
+    for name in ("next_if_id", "next_id_ex", "next_ex_mem", "next_mem_wb"):
+        getattr(p, name).valid = False
+
+
+def _save_perf(cpu, w):
+    """Contadores de rendimiento: escalares + histogramas dispersos."""
+    pc = cpu.pipeline.counters
+    w.pack(f"{len(pc.SCALARS)}Q", *(getattr(pc, n) for n in pc.SCALARS))
+    for name in pc.HISTOGRAMS:
+        used = [(i, n) for i, n in enumerate(getattr(pc, name)) if n]
+        w.pack("I", len(used))
+        for i, n in used:
+            w.pack("HQ", i, n)
+
+
+def _load_perf(cpu, r):
+    pc = cpu.pipeline.counters
+    pc.reset()
+    for name, value in zip(pc.SCALARS, r.unpack(f"{len(pc.SCALARS)}Q")):
+        setattr(pc, name, value)
+    for name in pc.HISTOGRAMS:
+        hist = getattr(pc, name)
+        for _ in range(r.one("I")):
+            i, n = r.unpack("HQ")
+            hist[i] = n
+
+
+_SECTIONS: Tuple[Tuple[bytes, Callable, Callable], ...] = (
+    (b"PC  ", _save_pc,    _load_pc),
+    (b"REGS", _save_regs,  _load_regs),
+    (b"SREG", _save_safe,  _load_safe),
+    (b"VALT", *_small_memory("vault_memory")),
+    (b"LOGN", *_small_memory("login_memory")),
+    (b"FLAG", _save_flags, _load_flags),
+    (b"AUTH", _save_auth,  _load_auth),
+    (b"IMEM", _save_imem,  _load_imem),
+    (b"DMEM", _save_dmem,  _load_dmem),
+    (b"DYNM", _save_dyn,   _load_dyn),
+    (b"PIPE", _save_pipe,  _load_pipe),
+    (b"PERF", _save_perf,  _load_perf),
+)
+_LOADERS: Dict[bytes, Callable] = {tag: load for tag, _, load in _SECTIONS}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Checkpoint
+# ─────────────────────────────────────────────────────────────────────────────
+class Checkpoint:
+    """
+    Estado completo de un `Procesador` en un instante (entre ciclos).
+
+    • `capture(cpu, base=None)` → checkpoint completo o incremental
+    • `restore(cpu)`            → vuelca el estado sobre `cpu`
+    • `save(path)` / `load(path, base=None)` y `to_bytes()` / `from_bytes()`
+    """
+
+    __slots__ = ("uid", "base", "sections", "_owner", "_generation")
+
+    def __init__(self, sections: Dict[bytes, bytes], uid: Optional[bytes] = None,
+                 base: Optional["Checkpoint"] = None):
+        self.uid      = uid or os.urandom(16)
+        self.base     = base
+        self.sections = sections
+        self._owner: Optional[int] = None         # id de la DynamicMemory capturada
+        self._generation: Optional[int] = None    # generación de páginas al capturar
+
+    @property
+    def incremental(self) -> bool:
+        return self.base is not None
+
+    @property
+    def size(self) -> int:
+        return sum(_SECTION.size + len(p) for p in self.sections.values()) + _HEADER.size
+
+    # ───────────────────────── captura ─────────────────────────────
+    @classmethod
+    def capture(cls, cpu, base: Optional["Checkpoint"] = None) -> "Checkpoint":
+        dy = cpu.dynamic_memory
+        if base is not None and (base._owner != id(dy) or base._generation is None):
+            raise ValueError("El checkpoint base no se capturó de este procesador")
+
+        sections: Dict[bytes, bytes] = {}
+        for tag, save, _ in _SECTIONS:
+            if tag == b"DYNM" and base is not None:
+                tag, save = b"DYNP", lambda c, w: cls._save_pages(c, w, base._generation)
+            w = _Writer()
+            save(cpu, w)
+            sections[tag] = w.getvalue()
+
+        cp = cls(sections, base=base)
+        cp._owner = id(dy)
+        cp._generation = dy.mark_generation()
+        return cp
+
+    @staticmethod
+    def _save_pages(cpu, w: _Writer, since: int) -> None:
+        dy = cpu.dynamic_memory
+        pages = dy.pages_since(since)
+        w.pack("QII", dy.loaded_blocks, dy.PAGE_BYTES, len(pages))
+        for index in pages:
+            w.pack("I", index)
+            w.raw(dy.page(index))
+        _put_wbuf(w, dy._wbuf)
+
+    @staticmethod
+    def _load_pages(cpu, r: _Reader) -> None:
+        dy = cpu.dynamic_memory
+        blocks, page_bytes, count = r.unpack("QII")
+        if page_bytes != dy.PAGE_BYTES:
+            raise ValueError(f"Tamaño de página incompatible: {page_bytes}")
+        if blocks != dy.loaded_blocks:
+            dy.set_size(blocks)
+        for _ in range(count):
+            index = r.one("I")
+            dy.write_page(index, r.raw())
+        _get_wbuf(r, dy._wbuf)
+
+    # ───────────────────────── restauración ────────────────────────
+    def restore(self, cpu) -> None:
+        if self.base is not None:
+            self.base.restore(cpu)
+        for tag, payload in self.sections.items():
+            r = _Reader(payload)
+            if tag == b"DYNP":
+                self._load_pages(cpu, r)
+            elif tag in _LOADERS:
+                _LOADERS[tag](cpu, r)
+            # secciones desconocidas (versiones futuras) se ignoran
+
+        # Desde aquí el procesador puede servir de base a nuevas capturas
+        self._owner = id(cpu.dynamic_memory)
+        self._generation = cpu.dynamic_memory.mark_generation()
+
+    # ───────────────────────── serialización ───────────────────────
+    def to_bytes(self) -> bytes:
+        flags = F_INCREMENTAL if self.base is not None else 0
+        base_uid = self.base.uid if self.base is not None else _NO_BASE
+        parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, flags, self.uid, base_uid)]
+        for tag, payload in self.sections.items():
+            parts.append(_SECTION.pack(tag, len(payload)))
+            parts.append(payload)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, base: Optional["Checkpoint"] = None) -> "Checkpoint":
+        if len(data) < _HEADER.size:
+            raise ValueError("Checkpoint truncado")
+        magic, version, flags, uid, base_uid = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("No es un checkpoint del procesador")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Versión de checkpoint no soportada: {version}")
+        if flags & F_INCREMENTAL:
+            if base is None or base.uid != base_uid:
+                raise ValueError("El checkpoint incremental requiere su checkpoint base")
+        else:
+            base = None
+
+        sections: Dict[bytes, bytes] = {}
+        pos, view = _HEADER.size, memoryview(data)
+        while pos < len(data):
+            tag, length = _SECTION.unpack_from(data, pos)
+            pos += _SECTION.size
+            sections[tag] = bytes(view[pos:pos + length])
+            pos += length
+        if pos != len(data):
+            raise ValueError("Checkpoint truncado")
+        return cls(sections, uid=uid, base=base)
+
+    def save(self, path) -> None:
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path, base: Optional["Checkpoint"] = None) -> "Checkpoint":
+        return cls.from_bytes(Path(path).read_bytes(), base)
+
+    def __repr__(self) -> str:
+        kind = "incremental" if self.incremental else "completo"
+        return f"Checkpoint({kind}, {self.size} bytes, uid={self.uid.hex()[:8]})"
@@ -0,0 +1,198 @@
+# ExtraPrograms/Processor/ChunkedCipher.py
+"""
+Cifrado/descifrado TEA de archivos grandes en trozos paralelos.
+
+En modo ECB cada bloque de 64 bits se cifra de forma independiente, así
+que el archivo se alinea a 8 bytes (igual que Presentación), se parte en
+trozos de `chunk_blocks` bloques y cada trozo se ejecuta como un
+`BatchJob` propio (memoria dinámica = el trozo, w2 = sus bloques).  Los
+resultados llegan en orden de terminación y se reensamblan en orden de
+trozo a medida que se completa el prefijo, calculando el MD5 al vuelo.
+
+La verificación compara con el "tamaño:" y "MD5:" del README de
+`Test/cifrado` cuando se indica `--expect`.
+
+    python -m ExtraPrograms.Processor.ChunkedCipher ../Test/cifrado/jorge_luis.txt \\
+        --expect ../Test/cifrado/README --out out/jorge_luis.txt.enc
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ExtraPrograms.Processor.BatchRunner import BatchJob, BatchRunner
+from ExtraPrograms.Processor.HeadlessEngine import HeadlessEngine, load_program
+
+BLOCK_BYTES = 8
+DEFAULT_PROGRAM = Path(__file__).resolve().parents[2] / "Ejemplos" / "Cifrado_total.asm"
+# P1..P8 de la hoja por defecto (los programas de ejemplo hacen login con 1..8)
+DEFAULT_STATE = {"login": [1, 2, 3, 4, 5, 6, 7, 8]}
+
+
+def align_blocks(data: bytes) -> bytes:
+    """Rellena con ceros hasta múltiplo de 64 bits (como Presentación)."""
+    return data + b"\x00" * (-len(data) % BLOCK_BYTES)
+
+
+def split_chunks(data: bytes, chunk_blocks: int) -> List[bytes]:
+    """Parte `data` (ya alineado) en trozos de `chunk_blocks` bloques."""
+    step = max(1, chunk_blocks) * BLOCK_BYTES
+    return [data[i:i + step] for i in range(0, len(data), step)]
+
+
+def read_expected(readme) -> Tuple[Optional[int], Optional[str]]:
+    """(tamaño, md5) esperados según un README de Test/."""
+    text = Path(readme).read_text(encoding="utf-8", errors="replace")
+    size = re.search(r"tama\w*o:\s*(\d+)", text, re.IGNORECASE)
+    md5  = re.search(r"MD5:\s*([0-9a-fA-F]{32})", text)
+    return (int(size.group(1)) if size else None,
+            md5.group(1).lower() if md5 else None)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Resultado
+# ─────────────────────────────────────────────────────────────────────────────
+class CipherResult:
+    """Salida reensamblada de un `ChunkedCipher`."""
+
+    __slots__ = ("data", "md5", "chunks", "cycles", "wall_s", "workers",
+                 "errors")
+
+    def __init__(self, data: bytes, md5: str, chunks: int, cycles: int,
+                 wall_s: float, workers: int, errors: List[str]):
+        self.data    = data
+        self.md5     = md5
+        self.chunks  = chunks
+        self.cycles  = cycles          # suma de ciclos de todos los trozos
+        self.wall_s  = wall_s
+        self.workers = workers
+        self.errors  = errors
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def matches(self, size: Optional[int], md5: Optional[str]) -> bool:
+        return ((size is None or len(self.data) == size)
+                and (md5 is None or self.md5 == md5))
+
+    def __str__(self) -> str:
+        return (f"{len(self.data)} bytes, MD5 {self.md5}, {self.chunks} trozos, "
+                f"{self.cycles} ciclos, {self.wall_s:.2f} s con {self.workers} procesos")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cifrador por trozos
+# ─────────────────────────────────────────────────────────────────────────────
+class ChunkedCipher:
+    """
+    • `program`      : bytes de instruction_mem.bin (p. ej. `load_program`
+                       de Cifrado_total.asm o Decifrado_total.asm)
+    • `chunk_blocks` : bloques de 64 bits por trozo
+    • `workers`, `engine` : como en `BatchRunner`
+    """
+
+    DEFAULT_CHUNK_BLOCKS = 256
+
+    def __init__(self, program: bytes, chunk_blocks: int = DEFAULT_CHUNK_BLOCKS,
+                 workers: Optional[int] = None, engine: str = "translated",
+                 initial_state: Optional[dict] = None,
+                 max_cycles: int = HeadlessEngine.DEFAULT_MAX_CYCLES):
+        self.program = program
+        self.chunk_blocks = max(1, chunk_blocks)
+        self.workers = workers
+        self.engine = engine
+        self.initial_state = dict(DEFAULT_STATE if initial_state is None
+                                  else initial_state)
+        self.max_cycles = max_cycles
+
+    def process(self, data: bytes, sink=None) -> CipherResult:
+        """
+        Procesa `data` completo.  Si se da `sink` (archivo binario abierto),
+        cada trozo se escribe en cuanto está listo su prefijo.
+        """
+        chunks = split_chunks(align_blocks(data), self.chunk_blocks)
+        jobs = [BatchJob(self.program, chunk, self.initial_state,
+                         name=f"trozo {i}") for i, chunk in enumerate(chunks)]
+        runner = BatchRunner(jobs, self.workers, self.engine, self.max_cycles)
+
+        md5 = hashlib.md5()
+        out = bytearray()
+        pending: Dict[int, bytes] = {}
+        next_index, cycles, errors = 0, 0, []
+        start = time.perf_counter()
+        for result in runner.results():
+            cycles += result.cycles
+            if not result.ok:
+                errors.append(str(result))
+                continue
+            if not result.halted:
+                errors.append(f"{result.name}: sin SWI tras {result.cycles} ciclos")
+                continue
+            pending[result.index] = result.dynamic_bytes
+            while next_index in pending:                # prefijo completo
+                piece = pending.pop(next_index)
+                md5.update(piece)
+                out += piece
+                if sink is not None:
+                    sink.write(piece)
+                next_index += 1
+
+        return CipherResult(bytes(out), md5.hexdigest(), len(chunks), cycles,
+                            time.perf_counter() - start, runner.workers, errors)
+
+    def process_file(self, src, dst=None) -> CipherResult:
+        data = Path(src).read_bytes()
+        if dst is None:
+            return self.process(data)
+        Path(dst).parent.mkdir(parents=True, exist_ok=True)
+        with open(dst, "wb") as sink:
+            return self.process(data, sink)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────────────
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Cifra/descifra un archivo con TEA en trozos paralelos.")
+    parser.add_argument("input")
+    parser.add_argument("--program", default=str(DEFAULT_PROGRAM),
+                        help=".asm o instruction_mem.bin (por defecto Cifrado_total.asm)")
+    parser.add_argument("--out", help="archivo de salida (por defecto <input>.enc)")
+    parser.add_argument("--chunk-blocks", type=int,
+                        default=ChunkedCipher.DEFAULT_CHUNK_BLOCKS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--engine", choices=HeadlessEngine.ENGINES,
+                        default="translated")
+    parser.add_argument("--login", type=lambda t: int(t, 0), nargs=8, metavar="P",
+                        default=DEFAULT_STATE["login"])
+    parser.add_argument("--expect", help="README con 'tamaño:' y 'MD5:' esperados")
+    args = parser.parse_args(argv)
+
+    cipher = ChunkedCipher(load_program(args.program), args.chunk_blocks,
+                           args.workers, args.engine, {"login": args.login})
+    out = args.out or f"{args.input}.enc"
+    result = cipher.process_file(args.input, out)
+    for error in result.errors:
+        print(f"[ERROR] {error}")
+    print(f"[{'OK' if result.ok else 'ERROR'}] {out}: {result}")
+    if not result.ok:
+        return 1
+
+    if args.expect:
+        size, md5 = read_expected(args.expect)
+        if not result.matches(size, md5):
+            print(f"[DIFERENTE] esperado {size} bytes, MD5 {md5}")
+            return 2
+        print("[OK] coincide con el valor esperado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,8 @@
 # control_unit.py  (fragmento clave)
 # ════════════════════════════════════════════════════════════════════
+from typing import Dict, List, Optional, Tuple
+
+
 class ControlUnit:
     WIDTH = {           # ancho de cada línea (igual que antes) …
         "RegWriteS":1,"RegWriteR":1,"MemOp":2,"MemWriteG":1,"MemWriteD":1,
@@ -140,6 +143,57 @@ class ControlUnit:
         0b00111010: {"macro":"last", "MemOp":0b11, "PrintEn":0b11, "MemWriteP":0b1}, # STRPASS (directo)
     }
     
+    # ------------ ROM de control ------------------------------------
+    # Todas las entradas posibles (256 opcodes × 16 Special) se resuelven
+    # una sola vez con `generate_signals` y se guardan como palabras de
+    # control empaquetadas: cada línea ocupa WIDTH[k] bits, en el orden de
+    # WIDTH empezando por el bit 0.  Opcodes sin definir quedan en None.
+    LAYOUT: Dict[str, Tuple[int, int]] = {}      # nombre → (shift, máscara)
+    _ROM: Optional[List[Optional[int]]] = None
+
+    @classmethod
+    def rom(cls) -> List[Optional[int]]:
+        """ROM indexada por (op << 4) | special; se construye en el primer uso."""
+        if cls._ROM is None:
+            scratch = cls()
+            table: List[Optional[int]] = [None] * (256 * 16)
+            for op in cls.CFG:
+                for special in range(16):
+                    scratch.generate_signals(special, op)
+                    table[(op << 4) | special] = scratch.pack()
+            cls._ROM = table
+        return cls._ROM
+
+    @classmethod
+    def lookup(cls, op: int, special: int) -> int:
+        """Palabra de control empaquetada para (op, special)."""
+        word = (cls._ROM or cls.rom())[((op & 0xFF) << 4) | (special & 0xF)]
+        if word is None:
+            raise ValueError(f"Opcode 0x{op & 0xFF:02x} no definido")
+        return word
+
+    @classmethod
+    def unpack(cls, word: int) -> Dict[str, int]:
+        """Desempaqueta todas las líneas (sólo para GUI / depuración)."""
+        return {k: (word >> sh) & m for k, (sh, m) in cls.LAYOUT.items()}
+
+    @classmethod
+    def field(cls, word: int, name: str) -> int:
+        sh, m = cls.LAYOUT[name]
+        return (word >> sh) & m
+
+    def pack(self) -> int:
+        """Empaqueta las señales actuales de esta instancia."""
+        word = 0
+        for k, (sh, _m) in self.LAYOUT.items():
+            word |= getattr(self, k) << sh
+        return word
+
+    def load(self, special: int, op: int):
+        """Equivalente a `generate_signals`, pero leyendo la ROM."""
+        for k, v in self.unpack(self.lookup(op, special)).items():
+            super().__setattr__(k, v)
+
     # ------------ generación principal -----------------------------
     def generate_signals(self, special: int, op: int):
         self.reset()                              # clean slate
@@ -212,4 +266,13 @@ class ControlUnit:
     def _set_mem_op(self, b):
         # b = 0 → general → MemOp = 00
         # b = 1 → dinámica → MemOp = 01
-        self.MemOp = 0b00 if b == 0 else 0b01
\ No newline at end of file
+        self.MemOp = 0b00 if b == 0 else 0b01
+
+
+# ------------ layout de la palabra de control ---------------------
+_shift = 0
+for _name, _width in ControlUnit.WIDTH.items():
+    ControlUnit.LAYOUT[_name] = (_shift, (1 << _width) - 1)
+    _shift += _width
+CONTROL_WORD_BITS = _shift
+del _shift, _name, _width
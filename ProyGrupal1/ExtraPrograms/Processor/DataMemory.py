@@ -1,88 +1,102 @@
 # ExtraPrograms/Processor/DataMemory.py
 from __future__ import annotations
-from typing import Dict, List, Optional
+import struct
+from typing import List
+
+from ExtraPrograms.Processor.WriteBuffer import WriteBuffer
 
 BLOCK_BITS  = 32                      # 4 bytes por bloque
 NUM_BLOCKS  = 64                      # 256 bytes en total (0-255)
 BLOCK_MASK  = (1 << BLOCK_BITS) - 1   # 0xFFFFFFFF
+MEM_BYTES   = NUM_BLOCKS * 4          # 256
+
+_WORD   = struct.Struct("<I")
+_IMAGE  = struct.Struct(f"<{NUM_BLOCKS}I")
 
 
 class DataMemory:
     """
     Memoria de datos protegida de 64 × 32 bits.
 
-    – **Direcciones en bytes** (0-255).  
-    – Lectura combinacional de 32 bits comenzando en A_G.  
-    – Escritura (32 bits) latcheada hasta `tick()`.  
+    – **Direcciones en bytes** (0-255).
+    – Lectura combinacional de 32 bits comenzando en A_G.
+    – Escritura (32 bits) latcheada hasta `tick()`.
     – Formato little-endian :
          byte 0 = bits 7-0  (dirección más baja)
          byte 3 = bits 31-24
+
+    Internamente es un `bytearray` de 256 bytes: los accesos que caben
+    completos (A_G ≤ 252) se resuelven con un único `struct`; sólo las
+    tres últimas direcciones recorren byte a byte (la lectura da la vuelta
+    a 0, la escritura falla en el primer byte fuera de rango).
     """
 
     def __init__(self) -> None:
-        self._mem: List[int] = [0] * NUM_BLOCKS          # contenido estable
-        self._pending: Dict[int, int] = {}               # idx → nuevo valor
+        self._mem = bytearray(MEM_BYTES)                 # contenido estable
+        self._wbuf = WriteBuffer()                       # escrituras latcheadas
+        self.undo_log: list | None = None                # TimeTravel
 
     # ─────────────────────────────── helpers internas ──────────────────────────────
     @staticmethod
     def _split_addr(addr: int) -> tuple[int, int]:
         """Devuelve (idx_de_bloque, offset_byte_dentro_del_bloque)."""
-        if not (0 <= addr < NUM_BLOCKS * 4):
+        if not (0 <= addr < MEM_BYTES):
             raise ValueError(f"Dirección fuera de rango: {addr}")
         return addr >> 2, addr & 0x3                     # div / mód 4
 
-    def _get_word(self, idx: int) -> int:
-        """Lee el valor ya consolidado (ignora _pending)."""
-        return self._mem[idx]
-
-    def _stage_write(self, idx: int, new_word: int) -> None:
-        """Guarda en el buffer de escritura (sobrescribe si ya había uno)."""
-        self._pending[idx] = new_word & BLOCK_MASK
-
     # ───────────────────────────────── API pública ─────────────────────────────────
-    # 1) Lectura combinacional de 32 bits
+    # 1) Lectura combinacional de 32 bits (ignora el buffer de escritura)
     def read(self, A_G: int) -> int:
-        idx, off = self._split_addr(A_G)
-        if off == 0:
-            return self._get_word(idx)
+        if 0 <= A_G <= MEM_BYTES - 4:
+            return _WORD.unpack_from(self._mem, A_G)[0]
+        self._split_addr(A_G)                            # valida / lanza
 
-        # lectura des-alineada: mezcla 2 bloques
-        lo = self._get_word(idx) >> (off * 8)
-        hi = self._get_word((idx + 1) % NUM_BLOCKS) << ((4 - off) * 8)
-        return (lo | hi) & BLOCK_MASK
+        # cola de la memoria: los bytes que sobran vuelven a la dirección 0
+        mem = self._mem
+        return (mem[A_G]
+                | mem[(A_G + 1) % MEM_BYTES] << 8
+                | mem[(A_G + 2) % MEM_BYTES] << 16
+                | mem[(A_G + 3) % MEM_BYTES] << 24)
 
     # 2) Escritura latcheada de 32 bits
     def write(self, A_G: int, WD_G: int, WE_G: int) -> None:
         if not WE_G:
             return
 
-        wd = WD_G & BLOCK_MASK
-        idx, off = self._split_addr(A_G)
-
-        # extrae cada byte del dato en little-endian y actualiza las palabras
-        for i in range(4):
-            addr_byte = A_G + i
-            b_idx, b_off = self._split_addr(addr_byte)
-            byte_val = (wd >> (8 * i)) & 0xFF
+        data = _WORD.pack(WD_G & BLOCK_MASK)
+        if 0 <= A_G <= MEM_BYTES - 4:
+            self._wbuf.push(A_G, data)
+            return
 
-            # palabra actual (tener en cuenta si ya hay pendiente)
-            cur = self._pending.get(b_idx, self._mem[b_idx])
-            shift = b_off * 8
-            mask = 0xFF << shift
-            new_word = (cur & ~mask) | (byte_val << shift)
-            self._stage_write(b_idx, new_word)
+        # cola de la memoria: se latchean los bytes válidos y se falla en el
+        # primero que queda fuera de rango (mismo efecto que la versión byte a byte)
+        self._split_addr(A_G)
+        valid = MEM_BYTES - A_G
+        self._wbuf.push(A_G, data[:valid])
+        self._split_addr(A_G + valid)
 
     # 3) Flanco de reloj
     def tick(self) -> None:
-        for idx, val in self._pending.items():
-            self._mem[idx] = val
-        self._pending.clear()
+        if self._wbuf:
+            if self.undo_log is not None:
+                mem = self._mem
+                for a, d in self._wbuf.entries():
+                    self.undo_log.append((self, a, bytes(mem[a:a + len(d)])))
+            self._wbuf.commit(self._mem)
+
+    def undo_write(self, addr: int, old: bytes) -> None:
+        self._mem[addr:addr + len(old)] = old
 
     # 4) Utilidades opcionales
     def dump(self) -> List[int]:
-        return self._mem.copy()
+        return list(_IMAGE.unpack(self._mem))
 
     def load(self, values: List[int], base: int = 0) -> None:
+        mem = self._mem
         for i, v in enumerate(values):
             if base + i < NUM_BLOCKS:
-                self._mem[base + i] = v & BLOCK_MASK
\ No newline at end of file
+                _WORD.pack_into(mem, (base + i) * 4, v & BLOCK_MASK)
+
+    def view(self) -> memoryview:
+        """Vista de sólo lectura de los 256 bytes consolidados."""
+        return memoryview(self._mem).toreadonly()
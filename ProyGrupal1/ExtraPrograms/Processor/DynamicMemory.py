@@ -1,22 +1,47 @@
 # ExtraPrograms/Processor/DynamicMemory.py
-from typing import Dict, List
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import List, Optional
 from ExtraPrograms.Processor.Flags import Flags
+from ExtraPrograms.Processor.Trace import TRACE, WARN
+from ExtraPrograms.Processor.WriteBuffer import WriteBuffer
+
+_WORD = struct.Struct("<I")
 
 class DynamicMemory:
     """
     Memoria dinámica protegida.
     • Tamaño se ajusta en tiempo de carga (dynamic_mem.bin)
     • read / write validan contra self._loaded_blocks (no contra _mem_size fijo)
+    • El contenido vive en un buffer de bytes contiguo (mismo layout que
+      dynamic_mem.bin), así cada acceso de 32 bits es un solo `struct`.
+    • Ese buffer puede ser un `bytearray` propio o un `mmap` del archivo
+      (`map_file`), sin copiar el contenido al cargar.
+    • Cada página de PAGE_BYTES guarda la generación de su última
+      escritura; `mark_generation()` cierra una generación y
+      `pages_since(g)` devuelve las páginas modificadas después (base de
+      los checkpoints incrementales).
     """
 
     BYTES_PER_BLOCK = 8   # 64 bits
+    PAGE_SHIFT      = 12
+    PAGE_BYTES      = 1 << PAGE_SHIFT
 
     def __init__(self, flags: Flags):
         self._flags = flags
         # arranca con 1 bloque para no quedar vacío
         self._loaded_blocks: int = 1
-        self._mem: List[int] = [0]
-        self._pending: Dict[int, int] = {}
+        self._buf = bytearray(self.BYTES_PER_BLOCK)
+        self._wbuf = WriteBuffer()
+        self._mapped_path: Optional[Path] = None      # archivo mapeado (si hay)
+        self._mapped_writable = False
+        self._mapped_stat = None                      # (dev, inodo, tamaño) al mapear
+        self._gen = 0                                 # generación actual
+        self._page_gen = array("Q", [0])              # generación por página
+        self.undo_log: Optional[list] = None          # TimeTravel
 
     # ───────────────────────── helpers ──────────────────────────
     def _max_address(self) -> int:
@@ -30,51 +55,195 @@ class DynamicMemory:
 
     def _check_access(self, addr: int) -> bool:
         if addr < 0 or addr > self._max_address():
-            print(f"[DYNAMIC] Acceso fuera de rango: {addr} / {self._max_address()}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "DYNAMIC", f"Acceso fuera de rango: {addr} / {self._max_address()}")
             return False
         return True
 
+    def _touch_all(self):
+        """Marca todas las páginas como modificadas (carga / redimensión)."""
+        pages = -(-len(self._buf) // self.PAGE_BYTES) or 1
+        self._page_gen = array("Q", [self._gen]) * pages
+
+    def _detach(self, keep: bool = True):
+        """
+        Si hay un mmap activo, pasa a un bytearray propio y lo cierra.
+        keep=False lo cierra sin copiarlo (el archivo pudo haberse acortado
+        por fuera y leer el mapeo viejo daría SIGBUS).
+        """
+        if self._mapped_path is None:
+            return
+        mm = self._buf
+        self._buf = bytearray(mm) if keep else bytearray(self.BYTES_PER_BLOCK)
+        mm.close()
+        self._mapped_path = None
+        self._mapped_writable = False
+        self._mapped_stat = None
+
+    def _same_mapping(self, path: Path, writable: bool) -> bool:
+        """¿`path` ya está mapeado en ese modo y el archivo no cambió?"""
+        if self._mapped_path is None or self._mapped_writable != writable:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return (path.resolve() == self._mapped_path.resolve()
+                and (st.st_dev, st.st_ino, st.st_size) == self._mapped_stat)
+
     # ───────────────────────── API pública ──────────────────────
+    @property
+    def loaded_blocks(self) -> int:
+        return self._loaded_blocks
+
+    @property
+    def mapped(self) -> bool:
+        return self._mapped_path is not None
+
     def set_size(self, blocks: int):
         """Redimensiona la memoria (conservando contenido previo)."""
+        self._detach()                                # un mmap no se redimensiona
         if blocks < 1:
             blocks = 1
-        if blocks > self._loaded_blocks:
-            self._mem.extend([0] * (blocks - self._loaded_blocks))
-        elif blocks < self._loaded_blocks:
-            self._mem = self._mem[:blocks]
+        size = blocks * self.BYTES_PER_BLOCK
+        if size > len(self._buf):
+            self._buf.extend(bytes(size - len(self._buf)))
+        elif size < len(self._buf):
+            del self._buf[size:]
         self._loaded_blocks = blocks
+        self._touch_all()
+
+    def load_bytes(self, data: bytes):
+        """
+        Carga el contenido crudo de `dynamic_mem.bin` (bloques de 64 bits
+        little-endian).  El tamaño se ajusta a los bloques completos leídos.
+        """
+        blocks = max(1, len(data) // self.BYTES_PER_BLOCK)
+        self.set_size(blocks)
+        self._wbuf.clear()
+        usable = len(data) - len(data) % self.BYTES_PER_BLOCK
+        self._buf[:usable] = data[:usable]
+        self._touch_all()
+
+    def map_file(self, path, writable: bool = False):
+        """
+        Mapea `dynamic_mem.bin` en memoria en lugar de copiarlo.
+
+        • writable=False → copy-on-write (mmap.ACCESS_COPY): el programa
+          modifica su copia privada y el archivo queda intacto hasta que se
+          guarde explícitamente con `save_file`.
+        • writable=True  → mmap.ACCESS_WRITE: cada `tick()` escribe sobre el
+          archivo mapeado; `flush()` fuerza la sincronización a disco.
+
+        Sólo se mapean los bloques completos de 64 bits.  Un archivo sin
+        bloques completos cae al camino normal de `load_bytes`.
+
+        Volver a mapear en modo escritura el mismo archivo sin cambios (mismo
+        inodo y tamaño) no hace nada: el mapeo ya ve el contenido del archivo
+        y las páginas no se marcan como modificadas.
+        """
+        path = Path(path)
+        if writable and self._same_mapping(path, writable):
+            return
+        self._detach(keep=False)                      # el contenido se reemplaza
+        self._wbuf.clear()
+
+        usable = os.path.getsize(path)
+        usable -= usable % self.BYTES_PER_BLOCK
+        if usable == 0:
+            self.load_bytes(b"")
+            return
+
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_COPY
+        with open(path, "r+b" if writable else "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), usable, access=access)
+        self._loaded_blocks = usable // self.BYTES_PER_BLOCK
+        self._mapped_path = path
+        self._mapped_writable = writable
+        st = os.stat(path)
+        self._mapped_stat = (st.st_dev, st.st_ino, st.st_size)
+        self._touch_all()
+
+    def flush(self):
+        """Sincroniza a disco un mapeo escribible (no-op en los demás casos)."""
+        if self._mapped_path is not None and self._mapped_writable:
+            self._buf.flush()
+
+    def unmap(self):
+        """Conserva el contenido actual en memoria propia y libera el mapeo."""
+        self.flush()
+        self._detach()
+
+    def save_file(self, path):
+        """
+        Guarda el contenido consolidado en formato dynamic_mem.bin.  Si la
+        memoria ya está mapeada en modo escritura sobre ese mismo archivo,
+        basta con `flush()`; si está mapeada en copy-on-write se desacopla
+        antes de reescribir el archivo que respalda al mapeo.
+        """
+        path = Path(path)
+        if self._mapped_path is not None and path.resolve() == self._mapped_path.resolve():
+            if self._mapped_writable:
+                self.flush()
+                return
+            self._detach()
+        path.write_bytes(self.to_bytes())
 
     def read(self, addr: int) -> int:
         if self._flags.enabled() != 1:
             return 0
         if not self._check_access(addr):
             return 0
-
-        val = 0
-        for i in range(4):
-            b_idx, b_off = self._split_addr(addr + i)
-            val |= ((self._mem[b_idx] >> (8 * b_off)) & 0xFF) << (8 * i)
-        return val & 0xFFFFFFFF
+        return _WORD.unpack_from(self._buf, addr)[0]
 
     def write(self, addr: int, wd: int, we: int):
         if not we or self._flags.enabled() != 1:
             return
         if not self._check_access(addr):
             return
-
-        for i in range(4):
-            b_idx, b_off = self._split_addr(addr + i)
-            cur  = self._pending.get(b_idx, self._mem[b_idx])
-            mask = 0xFF << (8 * b_off)
-            byte = ((wd >> (8 * i)) & 0xFF) << (8 * b_off)
-            self._pending[b_idx] = (cur & ~mask) | byte
+        self._wbuf.push(addr, _WORD.pack(wd & 0xFFFFFFFF))
 
     def tick(self):
-        for idx, val in self._pending.items():
-            self._mem[idx] = val
-        self._pending.clear()
+        if self._wbuf:
+            gen, page_gen, shift = self._gen, self._page_gen, self.PAGE_SHIFT
+            undo, buf = self.undo_log, self._buf
+            for addr, data in self._wbuf.entries():
+                page_gen[addr >> shift] = gen
+                page_gen[(addr + len(data) - 1) >> shift] = gen
+                if undo is not None:
+                    undo.append((self, addr, bytes(buf[addr:addr + len(data)])))
+            self._wbuf.commit(buf)
+
+    def undo_write(self, addr: int, old: bytes):
+        self._buf[addr:addr + len(old)] = old
+        self._page_gen[addr >> self.PAGE_SHIFT] = self._gen
+        self._page_gen[(addr + len(old) - 1) >> self.PAGE_SHIFT] = self._gen
+
+    # Seguimiento de páginas modificadas
+    def mark_generation(self) -> int:
+        """Cierra la generación actual y la devuelve."""
+        gen = self._gen
+        self._gen = gen + 1
+        return gen
+
+    def pages_since(self, gen: int) -> List[int]:
+        """Índices de página escritos después de `mark_generation() == gen`."""
+        return [p for p, g in enumerate(self._page_gen) if g > gen]
+
+    def page(self, index: int) -> bytes:
+        start = index * self.PAGE_BYTES
+        return bytes(self._buf[start:start + self.PAGE_BYTES])
+
+    def write_page(self, index: int, data: bytes):
+        """Restaura una página (checkpoints); no pasa por permisos ni buffer."""
+        start = index * self.PAGE_BYTES
+        self._buf[start:start + len(data)] = data
+        self._page_gen[index] = self._gen
 
     # Utilidades
     def dump(self) -> List[int]:
-        return self._mem.copy()
\ No newline at end of file
+        return [w for (w,) in struct.iter_unpack("<Q", self._buf)]
+
+    def to_bytes(self) -> bytes:
+        """Contenido consolidado en el formato de dynamic_mem.bin."""
+        return bytes(self._buf)
@@ -0,0 +1,279 @@
+# ExtraPrograms/Processor/FunctionalSimulator.py
+"""
+Simulador funcional (a nivel ISA) con modelo analítico de ciclos.
+
+Ejecuta una instrucción completa por paso usando directamente las
+unidades del `Procesador` (ALU, CondUnit, RegisterFile, SafeRegisterFile,
+Vault/Login, DataMemory, DynamicMemory, PrinterUnit) sin registros de
+etapa.  Lo que el pipeline de 5 etapas deja visible al programa se
+modela como reglas arquitectónicas:
+
+• WB_LATENCY   = 4 : la escritura de registros de la instrucción i sólo
+  la ve la instrucción i+4 (los programas rellenan con NOP).
+• BRANCH_DELAY = 4 : tras un salto tomado se ejecutan siempre las 4
+  instrucciones siguientes; el fetch se redirige en la 5ª.
+• Flags, memorias y escrituras Vault/Login son secuenciales.
+• SWI se resuelve en EX: se descartan WB(s-1) y MEM/WB(s), y s+1 sólo
+  se decodifica.
+
+El número de ciclos que habría tomado el `Pipeline` se calcula sin
+simularlo (`CycleModel`): cada ciclo emite una instrucción, más el
+llenado hasta EX de la instrucción SWI, más la penalización por flush de
+cada salto tomado (0 en este diseño: el flush de `Pipeline.step` nunca
+dispara porque `pc.tick()` limpia `pcsrc_w` antes de consultarlo).
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+from ExtraPrograms.Processor.InstructionDecoder import predecode
+
+OP_SWI = 0x2F
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Modelo de ciclos
+# ─────────────────────────────────────────────────────────────────────────────
+class CycleModel:
+    """Conteo analítico de ciclos del `Pipeline` para una ejecución."""
+
+    PIPELINE_DEPTH       = 5
+    HALT_STAGE           = 3     # SWI detiene el pipeline en EX
+    BRANCH_FLUSH_PENALTY = 0     # ciclos perdidos por salto tomado
+
+    __slots__ = ("retired", "taken_branches", "halted")
+
+    def __init__(self, retired: int = 0, taken_branches: int = 0,
+                 halted: bool = False):
+        self.retired        = retired          # instrucciones hasta SWI (incl.)
+        self.taken_branches = taken_branches
+        self.halted         = halted
+
+    @property
+    def fill_cycles(self) -> int:
+        return self.HALT_STAGE - 1 if self.halted else 0
+
+    @property
+    def flush_cycles(self) -> int:
+        return self.taken_branches * self.BRANCH_FLUSH_PENALTY
+
+    @property
+    def cycles(self) -> int:
+        return self.retired + self.fill_cycles + self.flush_cycles
+
+    @property
+    def cpi(self) -> float:
+        return self.cycles / self.retired if self.retired else 0.0
+
+    def to_dict(self) -> dict:
+        return {"retired": self.retired, "taken_branches": self.taken_branches,
+                "halted": self.halted, "fill_cycles": self.fill_cycles,
+                "flush_cycles": self.flush_cycles, "cycles": self.cycles,
+                "cpi": self.cpi}
+
+    def __repr__(self) -> str:
+        return (f"CycleModel(cycles={self.cycles}, retired={self.retired}, "
+                f"taken_branches={self.taken_branches})")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Simulador
+# ─────────────────────────────────────────────────────────────────────────────
+class FunctionalSimulator:
+    """
+    Intérprete instrucción a instrucción sobre las unidades de `cpu`.
+
+    `step()` ejecuta una instrucción; `run()` hasta SWI o `max_instructions`.
+    Al detenerse por SWI deja PC, `pipeline.clock_cycle` y
+    `pipeline.halt_requested` como los dejaría el `Pipeline`.
+    """
+
+    WB_LATENCY   = 4
+    BRANCH_DELAY = 4
+
+    def __init__(self, cpu):
+        self.cpu = cpu
+        self.model = CycleModel()
+        self.slot = 0                                   # instrucciones emitidas
+        self.halted = False
+        self.elapsed_s = 0.0
+        self.last_pc = None                             # dirección del último step
+        self._pc = cpu.pc.get_pc()
+        self._clock0 = cpu.pipeline.clock_cycle         # ciclos previos (checkpoint)
+        # WB pendientes: (slot, rd, valor, ctrl, safe_pending | None)
+        self._wb: Deque[list] = deque()
+        # Redirecciones de fetch pendientes: (slot, destino)
+        self._redirects: Deque[Tuple[int, int]] = deque()
+
+    # ───────────────────────── helpers ───────────────────────────
+    def _fetch_addr(self, slot: int) -> int:
+        redirects = self._redirects
+        if redirects and redirects[0][0] == slot:
+            self._pc = redirects.popleft()[1]
+        return self._pc
+
+    def _decode_ctrl(self, addr: int):
+        imem = self.cpu.instruction_memory
+        return imem.decoded(addr) or predecode(imem.read(addr))
+
+    def _commit(self, rec) -> None:
+        """WB: registro general, registro seguro (ya compuerteado) e impresión."""
+        cpu = self.cpu
+        _slot, rd, value, ctrl, safe_pending = rec
+        cpu.register_file.write(rd, value, ctrl.RegWriteR)
+        cpu.register_file.tick()
+        if safe_pending is not None:
+            cpu.safe_register_file._pending = safe_pending
+            cpu.safe_register_file.tick()
+
+        printer = cpu.pipeline.printer_unit
+        print_en = ctrl.PrintEn
+        if print_en == 0b00:
+            printer.print_integer(value)
+        elif print_en == 0b01:
+            printer.print_ascii(value)
+        elif print_en == 0b10:
+            printer.print_binary(value)
+
+    def _commit_until(self, slot: int) -> None:
+        wb = self._wb
+        while wb and wb[0][0] <= slot:
+            self._commit(wb.popleft())
+
+    def _gate(self, slot: int) -> None:
+        """Compuerta de seguridad del WB seguro de `slot` (flags tras EX(slot+1))."""
+        for rec in self._wb:
+            if rec[0] == slot:
+                ctrl = rec[3]
+                if ctrl.RegWriteS:
+                    safe = self.cpu.safe_register_file
+                    safe.write(rec[1], rec[2], 1)       # valida permisos e índice
+                    rec[4], safe._pending = safe._pending, None
+                return
+
+    def _decode(self, addr: int, ctrl):
+        """ID: operandos y escrituras Vault/Login (mismas reglas que Pipeline.decode)."""
+        cpu = self.cpu
+        L = 1 if ctrl.ComS else 0
+        ar1, ar2, imm32 = ctrl.ar1, ctrl.ar2, ctrl.imm32
+
+        if ctrl.RegisterInA == 1:
+            A, _ = cpu.register_file.read(ar1, 0)
+        else:
+            A, _ = cpu.safe_register_file.read(ar1, 0)
+        if ctrl.BranchE:
+            A = addr
+
+        src_b = ctrl.RegisterInB
+        if src_b == 0b00:
+            _, B_int = cpu.register_file.read(0, ar2)
+        elif src_b == 0b01:
+            _, B_int = cpu.safe_register_file.read(0, ar2)
+        elif src_b == 0b10:
+            B_int = cpu.vault_memory.read(ar2)
+        else:
+            B_int = cpu.login_memory.read(ar2, L)
+        B = imm32 if ctrl.ImmediateOp else B_int
+
+        cpu.vault_memory.write(ar2, imm32, ctrl.MemWriteV)
+        cpu.vault_memory.tick()
+        cpu.login_memory.write(ar2, imm32, ctrl.MemWriteP, L)
+        cpu.login_memory.tick()
+        return A, B, B_int
+
+    # ───────────────────────── ejecución ─────────────────────────
+    def step(self) -> bool:
+        """Ejecuta la instrucción del slot actual.  Devuelve False tras SWI."""
+        if self.halted:
+            return False
+        cpu = self.cpu
+        i = self.slot
+
+        self._commit_until(i - self.WB_LATENCY)
+
+        addr = self._fetch_addr(i)
+        self.last_pc = addr
+        ctrl = self._decode_ctrl(addr)
+        A, B, B_int = self._decode(addr, ctrl)
+
+        self._gate(i - 2)
+
+        # EX
+        flags_e = cpu.flags.as_nzcv()
+        result, nzcv = cpu.alu.execute(ctrl.ALUSrc, A, B, (flags_e >> 1) & 1)
+        cpu.cond_unit.generate_signals(ctrl.BranchOp, ctrl.LogOut, ctrl.ComS,
+                                       ctrl.ar2, ctrl.FlagsUpd, nzcv,
+                                       flags_e)
+        if ctrl.op == OP_SWI:
+            self._halt(i, addr)
+            return False
+        pcsrc = ctrl.PCSrc & cpu.cond_unit.CondExE
+
+        # MEM
+        value = result
+        if ctrl.MemOp == 0b00:
+            value = cpu.data_memory.read(result)
+        elif ctrl.MemOp == 0b01:
+            value = cpu.dynamic_memory.read(result)
+        wd = B_int & 0xFF if ctrl.MemByte else B_int
+        cpu.data_memory.write(result, wd, ctrl.MemWriteG)
+        cpu.data_memory.tick()
+        cpu.dynamic_memory.write(result, wd, ctrl.MemWriteD)
+        cpu.dynamic_memory.tick()
+        if ctrl.MemByte:
+            value &= 0xFF
+
+        # WB diferido y redirección del fetch
+        self._wb.append([i, ctrl.rd, value, ctrl, None])
+        if pcsrc:
+            self._redirects.append((i + self.BRANCH_DELAY + 1, value))
+            self.model.taken_branches += 1
+
+        self.slot = i + 1
+        self._pc = addr + 8
+        self.model.retired = self.slot
+        return True
+
+    def _halt(self, s: int, addr: int) -> None:
+        """Drenaje de SWI en el slot s (ver docstring del módulo)."""
+        cpu = self.cpu
+        self.model.retired = s + 1
+        self.model.halted = True
+        self._pc = addr + 8
+
+        # WB(s-1) nunca ocurre
+        self._wb = deque(rec for rec in self._wb if rec[0] <= s - 2)
+
+        self._commit_until(s - 3)
+        a1 = self._fetch_addr(s + 1)
+        ctrl = self._decode_ctrl(a1)                    # puede lanzar
+        self._decode(a1, ctrl)
+        self._commit_until(s - 2)
+
+        self._pc = a1 + 8
+        a2 = self._fetch_addr(s + 2)
+        self._pc = a2 + 8
+        a3 = self._fetch_addr(s + 3)
+
+        cpu.pc._pc = a3
+        cpu.pc.result_w = 0
+        cpu.pc.pcsrc_w = 0
+        cpu.pipeline.clock_cycle = self._clock0 + self.model.cycles
+        cpu.pipeline.halt_requested = True
+        self.slot = s + 1
+        self.halted = True
+
+    def run(self, max_instructions: int = 50_000_000) -> CycleModel:
+        """Corre hasta SWI o `max_instructions`; devuelve el modelo de ciclos."""
+        step = self.step
+        start = time.perf_counter()
+        for _ in range(max_instructions):
+            if not step():
+                break
+        self.elapsed_s += time.perf_counter() - start
+        if not self.halted:
+            self.cpu.pc._pc = self._pc
+            self.cpu.pipeline.clock_cycle = self._clock0 + self.model.cycles
+        return self.model
@@ -0,0 +1,293 @@
+# ExtraPrograms/Processor/GuestProfiler.py
+"""
+Perfil del programa ASM invitado: ejecuciones y ciclos por PC, por línea
+fuente y por bucle.
+
+Se engancha a `Pipeline.profiler` (igual que `StageProfiler`) y en cada
+ciclo mira la instrucción que entra a ID:
+
+    executions[pc]  veces que la instrucción en `pc` se decodificó
+    cycles[pc]      ciclos cargados a esa instrucción: el suyo en ID más
+                    las burbujas (ID vacío) que la precedieron, y las del
+                    vaciado final a la última; la suma da el total de ciclos
+
+Nunca pide un ciclo cronometrado, pero si ya había otro perfilador en el
+pipeline lo conserva y le delega el muestreo (se pueden usar ambos).
+
+`GuestSource` traduce PCs a líneas del editor con la primera pasada del
+compilador (`compile_service.source_layout`) y detecta los bucles: un
+salto hacia una etiqueta anterior cubre desde la etiqueta hasta sus 4
+ranuras de retardo.
+
+    source   = GuestSource.from_file("Ejemplos/Cifrado_total.asm")
+    profiler = GuestProfiler().attach(cpu.pipeline)
+    ...                                     # ejecutar
+    print(profiler.report(source))
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ExtraPrograms.ISA.compile_service import BRANCH_OPS, source_layout
+
+INSTRUCTION_BYTES = 8
+DELAY_SLOTS = 4
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Fuente: PC → línea y bucles
+# ─────────────────────────────────────────────────────────────────────────────
+class GuestLoop:
+    """Bucle [start, end] en índices de instrucción (incluye ranuras)."""
+
+    __slots__ = ("label", "start", "end", "branch", "first_line", "last_line")
+
+    def __init__(self, label: str, start: int, end: int, branch: int,
+                 first_line: int, last_line: int):
+        self.label      = label
+        self.start      = start
+        self.end        = end
+        self.branch     = branch        # índice del salto de vuelta
+        self.first_line = first_line
+        self.last_line  = last_line
+
+    def __contains__(self, index: int) -> bool:
+        return self.start <= index <= self.end
+
+    def __repr__(self) -> str:
+        return f"GuestLoop({self.label!r}, líneas {self.first_line}-{self.last_line})"
+
+
+class GuestSource:
+    """Mapa instrucción → línea del editor y bucles de un programa ASM."""
+
+    def __init__(self, lines: List[int], texts: Dict[int, str],
+                 labels: Dict[str, int], loops: List[GuestLoop]):
+        self.lines  = lines         # índice de instrucción → línea
+        self.texts  = texts         # línea → texto (sin comentario)
+        self.labels = labels        # etiqueta → índice de instrucción
+        self.loops  = loops
+
+    @classmethod
+    def from_asm(cls, asm_text: str) -> "GuestSource":
+        layout = source_layout(asm_text)
+        if layout is None:
+            raise ValueError("El programa tiene errores léxicos")
+        labels, parsed_lines = layout
+
+        lines: List[int] = []
+        texts: Dict[int, str] = {}
+        branches: List[Tuple[int, str]] = []
+        for lineno, line, tokens, index, count in parsed_lines:
+            lines.extend([lineno] * count)
+            texts[lineno] = line
+            if tokens[0][1] in BRANCH_OPS and len(tokens) > 1:
+                branches.append((index, tokens[1][1]))
+
+        loops = []
+        last = len(lines) - 1
+        for index, label in branches:
+            target = labels.get(label)
+            if target is None or target > index or not lines:
+                continue
+            end = min(index + DELAY_SLOTS, last)
+            loops.append(GuestLoop(label, target, end, index,
+                                   lines[min(target, last)], lines[end]))
+        return cls(lines, texts, labels, loops)
+
+    @classmethod
+    def from_file(cls, path) -> "GuestSource":
+        return cls.from_asm(Path(path).read_text(encoding="utf-8"))
+
+    def line_of(self, pc: int) -> Optional[int]:
+        index = pc // INSTRUCTION_BYTES
+        return self.lines[index] if 0 <= index < len(self.lines) else None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Perfilador
+# ─────────────────────────────────────────────────────────────────────────────
+class GuestProfiler:
+    """Histograma por PC de la instrucción en ID, ciclo a ciclo."""
+
+    def __init__(self):
+        self.pipeline = None
+        self._next = None               # perfilador previo del pipeline
+        self.reset()
+
+    def reset(self) -> None:
+        self.executions: Dict[int, int] = {}
+        self._cycles: Dict[int, int] = {}
+        self._pending = 0               # burbujas aún sin instrucción
+        self._last_pc: Optional[int] = None
+
+    # ───────────────────────── enganche ──────────────────────────────
+    def attach(self, pipeline) -> "GuestProfiler":
+        self.detach()
+        self.pipeline = pipeline
+        self._next = pipeline.profiler
+        pipeline.profiler = self
+        return self
+
+    def detach(self) -> None:
+        if self.pipeline is not None and self.pipeline.profiler is self:
+            self.pipeline.profiler = self._next
+        self.pipeline = self._next = None
+
+    def sample(self) -> bool:
+        """Llamado por `Pipeline.step` en cada ciclo, antes de las etapas."""
+        if_id = self.pipeline.if_id
+        if if_id.valid:
+            pc = if_id.pc
+            self.executions[pc] = self.executions.get(pc, 0) + 1
+            self._cycles[pc] = self._cycles.get(pc, 0) + 1 + self._pending
+            self._pending = 0
+            self._last_pc = pc
+        else:
+            self._pending += 1
+        return self._next is not None and self._next.sample()
+
+    def profile_step(self, pipeline) -> None:
+        self._next.profile_step(pipeline)
+
+    # ───────────────────────── lectura ───────────────────────────────
+    @property
+    def cycles(self) -> Dict[int, int]:
+        """Ciclos por PC (el vaciado pendiente se carga a la última)."""
+        cycles = dict(self._cycles)
+        if self._pending and self._last_pc is not None:
+            cycles[self._last_pc] += self._pending
+        return cycles
+
+    @property
+    def total_cycles(self) -> int:
+        return sum(self._cycles.values()) + self._pending
+
+    def by_line(self, source: GuestSource) -> Dict[int, Tuple[int, int]]:
+        """línea → (ejecuciones, ciclos); PCs fuera del programa se omiten."""
+        out: Dict[int, Tuple[int, int]] = {}
+        executions = self.executions
+        for pc, cycles in self.cycles.items():
+            line = source.line_of(pc)
+            if line is not None:
+                e, c = out.get(line, (0, 0))
+                out[line] = (e + executions.get(pc, 0), c + cycles)
+        return out
+
+    def hot_loops(self, source: GuestSource,
+                  top: Optional[int] = None) -> List[dict]:
+        """Bucles ordenados por ciclos, con iteraciones = ejecuciones del salto."""
+        cycles = self.cycles
+        total = self.total_cycles or 1
+        rows = []
+        for loop in source.loops:
+            spent = sum(n for pc, n in cycles.items()
+                        if pc // INSTRUCTION_BYTES in loop)
+            if spent:
+                rows.append({
+                    "label": loop.label,
+                    "first_line": loop.first_line,
+                    "last_line": loop.last_line,
+                    "cycles": spent,
+                    "share": spent / total,
+                    "iterations": self.executions.get(loop.branch * INSTRUCTION_BYTES, 0),
+                })
+        rows.sort(key=lambda r: r["cycles"], reverse=True)
+        return rows[:top] if top else rows
+
+    def heat(self, source: GuestSource) -> Dict[int, float]:
+        """línea → ciclos relativos a la línea más caliente (0..1]."""
+        per_line = self.by_line(source)
+        peak = max((c for _e, c in per_line.values()), default=0)
+        return {line: c / peak for line, (_e, c) in per_line.items() if c and peak}
+
+    # ───────────────────────── exportación ───────────────────────────
+    def to_dict(self, source: Optional[GuestSource] = None) -> dict:
+        executions, cycles = self.executions, self.cycles
+        d = {
+            "total_cycles": self.total_cycles,
+            "pcs": [{"pc": pc, "executions": executions.get(pc, 0), "cycles": n}
+                    for pc, n in sorted(cycles.items())],
+        }
+        if source is not None:
+            d["lines"] = [{"line": line, "text": source.texts.get(line, ""),
+                           "executions": e, "cycles": c}
+                          for line, (e, c) in sorted(self.by_line(source).items())]
+            d["loops"] = self.hot_loops(source)
+        return d
+
+    def to_json(self, path=None, source: Optional[GuestSource] = None) -> str:
+        text = json.dumps(self.to_dict(source), indent=2)
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(text, encoding="utf-8")
+        return text
+
+    def report(self, source: Optional[GuestSource] = None, top: int = 10) -> str:
+        """Líneas (o PCs sin fuente) y bucles más calientes, en texto."""
+        total = self.total_cycles or 1
+        lines = [f"{self.total_cycles} ciclos"]
+        if source is None:
+            hottest = sorted(self.cycles.items(), key=lambda kv: kv[1], reverse=True)
+            for pc, n in hottest[:top]:
+                lines.append(f"  PC 0x{pc:04X}  {n:>10} ciclos {n / total:6.1%}")
+            return "\n".join(lines)
+
+        nops = sum(c for line, (_e, c) in self.by_line(source).items()
+                   if source.texts.get(line, "").upper() == "NOP")
+        lines[0] += f", {nops / total:.1%} en NOP (relleno de riesgos y ranuras)"
+        lines.append("Bucles más costosos:")
+        for loop in self.hot_loops(source, top):
+            lines.append(f"  {loop['label']:<20} líneas {loop['first_line']:>4}-"
+                         f"{loop['last_line']:<4} {loop['cycles']:>10} ciclos "
+                         f"{loop['share']:6.1%}  {loop['iterations']} iteraciones")
+        lines.append("Líneas más costosas:")
+        hottest = sorted(self.by_line(source).items(),
+                         key=lambda kv: kv[1][1], reverse=True)
+        for line, (e, c) in hottest[:top]:
+            lines.append(f"  {line:>5}: {source.texts.get(line, ''):<28} "
+                         f"{e:>9} ejec. {c:>10} ciclos {c / total:6.1%}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"GuestProfiler(pcs={len(self.executions)}, cycles={self.total_cycles})"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────────────
+def main(argv=None) -> int:
+    from ExtraPrograms.Processor.HeadlessEngine import HeadlessEngine, load_data, load_program
+
+    parser = argparse.ArgumentParser(
+        description="Perfila un programa ASM: ciclos por línea y bucles calientes.")
+    parser.add_argument("program", help=".asm (o instruction_mem.bin, sólo por PC)")
+    parser.add_argument("data", nargs="?", help="archivo para la memoria dinámica")
+    parser.add_argument("--blocks", type=int, default=None,
+                        help="usar sólo los primeros bloques de 64 bits de `data`")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--login", type=lambda t: int(t, 0), nargs=8, metavar="P",
+                        default=[1, 2, 3, 4, 5, 6, 7, 8])
+    parser.add_argument("--max-cycles", type=int,
+                        default=HeadlessEngine.DEFAULT_MAX_CYCLES)
+    parser.add_argument("--out", default="out/guest_profile.json")
+    args = parser.parse_args(argv)
+
+    source = (None if Path(args.program).suffix.lower() == ".bin"
+              else GuestSource.from_file(args.program))
+    profiler = GuestProfiler()
+    dyn = load_data(args.data, args.blocks) if args.data else None
+    snap = HeadlessEngine(load_program(args.program), dyn, {"login": args.login},
+                          profiler=profiler).run(args.max_cycles)
+    print(profiler.report(source, args.top))
+    profiler.to_json(args.out, source)
+    print(f"{snap.cycles} ciclos en {snap.elapsed_s:.2f} s → {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
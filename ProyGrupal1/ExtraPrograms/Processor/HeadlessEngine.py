@@ -0,0 +1,334 @@
+# ExtraPrograms/Processor/HeadlessEngine.py
+"""
+Motor *headless* de alto rendimiento sobre `Procesador`/`Pipeline`.
+
+A diferencia de `CPUView._on_execute_all`, aquí no existe ningún viaje de
+ida y vuelta a Excel ni E/S por ciclo: se leen directamente
+`instruction_mem.bin` y `dynamic_mem.bin`, se ejecuta hasta SWI (o hasta
+vaciar el pipeline) y el estado final se devuelve como un
+`ProcessorSnapshot` en memoria.
+
+Uso típico:
+
+    engine   = HeadlessEngine("assets/instruction_mem.bin",
+                              "assets/dynamic_mem.bin")
+    snapshot = engine.run()
+    print(snapshot.cycles, snapshot.dynamic_memory[:4])
+
+`load_program` / `load_data` preparan las entradas desde archivos (.asm
+o .bin, datos alineados a 64 bits) para los CLIs del paquete.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Union
+
+from ExtraPrograms.ISA.compile_service import compile_text_to_binary
+from ExtraPrograms.Processor.Processor import Procesador
+from ExtraPrograms.Processor.AuthenticationUnit import AuthenticationProcess
+from ExtraPrograms.Processor.BlockTranslator import BlockTranslator
+from ExtraPrograms.Processor.Checkpoint import Checkpoint
+from ExtraPrograms.Processor.FunctionalSimulator import CycleModel, FunctionalSimulator
+from ExtraPrograms.Processor.PerfCounters import PerfCounters
+from ExtraPrograms.Processor.PrinterUnit import StreamSink
+from ExtraPrograms.run_history import RunHistory, RunRecord, stage_totals
+
+BinarySource = Union[str, Path, bytes, bytearray, memoryview, None]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Helpers internos
+# ─────────────────────────────────────────────────────────────────────────────
+class _ConsoleBuffer:
+    """
+    Controller mínimo para `PrinterUnit`: acumula en memoria las líneas
+    producidas por PRINTI/PRINTC/PRINTB en vez de enviarlas a la GUI.
+    """
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def print_console(self, text: str) -> None:
+        self.lines.append(text)
+
+
+def _read_source(src: BinarySource) -> bytes:
+    """Acepta una ruta o los bytes crudos del archivo .bin."""
+    if src is None:
+        return b""
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return bytes(src)
+    return Path(src).read_bytes()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Carga de programas y datos desde archivos
+# ─────────────────────────────────────────────────────────────────────────────
+def load_program(path) -> bytes:
+    """Compila un .asm (sin tocar assets/) o lee un instruction_mem.bin."""
+    path = Path(path)
+    if path.suffix.lower() == ".bin":
+        return path.read_bytes()
+    with tempfile.TemporaryDirectory() as tmp:
+        binary = compile_text_to_binary(path.read_text(), base_dir=tmp)
+    if binary is None:
+        raise ValueError(f"No se pudo compilar {path}")
+    return binary
+
+
+def load_data(path, blocks: Optional[int] = None) -> bytes:
+    """Lee un archivo y lo alinea a bloques de 64 bits (como Presentación)."""
+    data = Path(path).read_bytes()
+    data += b"\x00" * (-len(data) % 8)
+    return data if blocks is None else data[:blocks * 8]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Snapshot de estado final
+# ─────────────────────────────────────────────────────────────────────────────
+class ProcessorSnapshot:
+    """
+    Fotografía inmutable (por convención) del estado arquitectónico
+    tras una ejecución headless.
+    """
+
+    __slots__ = ("pc", "registers", "safe_registers", "vault", "login",
+                 "data_memory", "dynamic_memory", "flags", "cycles",
+                 "halted", "output", "elapsed_s", "counters")
+
+    def __init__(self, pc: int, registers: List[int],
+                 safe_registers: List[int], vault: List[int],
+                 login: List[int], data_memory: List[int],
+                 dynamic_memory: List[int], flags: Dict[str, int],
+                 cycles: int, halted: bool, output: List[str],
+                 elapsed_s: float, counters: Optional[dict] = None):
+        self.pc             = pc
+        self.registers      = registers
+        self.safe_registers = safe_registers
+        self.vault          = vault
+        self.login          = login
+        self.data_memory    = data_memory
+        self.dynamic_memory = dynamic_memory
+        self.flags          = flags
+        self.cycles         = cycles
+        self.halted         = halted
+        self.output         = output
+        self.elapsed_s      = elapsed_s
+        self.counters       = counters         # PerfCounters.to_dict() de esta corrida ("pipeline")
+
+    @classmethod
+    def capture(cls, cpu: Procesador, output: List[str],
+                halted: bool, elapsed_s: float,
+                counters: Optional[dict] = None) -> "ProcessorSnapshot":
+        """Copia el estado visible de todas las unidades de `cpu`."""
+        return cls(
+            pc             = cpu.pc.get_pc(),
+            registers      = list(cpu.register_file.regs),
+            safe_registers = cpu.safe_register_file.dump(),
+            vault          = cpu.vault_memory.dump(),
+            login          = cpu.login_memory.dump(),
+            data_memory    = cpu.data_memory.dump(),
+            dynamic_memory = cpu.dynamic_memory.dump(),
+            flags          = cpu.flags.visualize(),
+            cycles         = cpu.pipeline.clock_cycle,
+            halted         = halted,
+            output         = list(output),
+            elapsed_s      = elapsed_s,
+            counters       = counters,
+        )
+
+    @property
+    def cycles_per_second(self) -> float:
+        return self.cycles / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def dynamic_bytes(self) -> bytes:
+        """Contenido de la memoria dinámica en el formato de dynamic_mem.bin."""
+        return b"".join((b & 0xFFFFFFFFFFFFFFFF).to_bytes(8, "little")
+                        for b in self.dynamic_memory)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (f"ProcessorSnapshot(pc=0x{self.pc:08X}, cycles={self.cycles}, "
+                f"halted={self.halted})")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Motor headless
+# ─────────────────────────────────────────────────────────────────────────────
+class HeadlessEngine:
+    """
+    Ejecuta un programa completo sin GUI ni Excel.
+
+    • `instruction_mem` : ruta o bytes de instruction_mem.bin (64-bit BE)
+    • `dynamic_mem`     : ruta o bytes de dynamic_mem.bin (64-bit LE), opcional
+    • `initial_state`   : dict aceptado por `Procesador.set_state_from_external`
+                          (pc, registers, safe_registers, vault, login,
+                          data_memory, flags)
+
+    • `checkpoint`      : `Checkpoint`, ruta o bytes de un checkpoint; se
+                          restaura sobre el estado anterior para retomar una
+                          ejecución (los motores distintos de "pipeline"
+                          necesitan el pipeline vacío en el checkpoint)
+    • `output`          : objeto tipo archivo; si se indica, la salida de
+                          PRINT* se escribe ahí en bloques (`StreamSink`)
+                          en vez de acumularse en `snapshot.output`
+    • `history`, `name` : si se da un `RunHistory`, cada `run()` agrega un
+                          `RunRecord` con ese nombre de programa
+    • `profiler`        : `StageProfiler` o `GuestProfiler` que se engancha
+                          al pipeline en cada `build()` (sólo lo usa el
+                          motor "pipeline")
+    • `map_dynamic`     : si `dynamic_mem` es una ruta, la mapea con mmap en
+                          copy-on-write en vez de leerla (el archivo no cambia)
+    • `engine`          : "pipeline" (ciclo a ciclo, con trazas) o
+                          "translated" (`BlockTranslator`, mismo resultado
+                          y mismos ciclos, varias veces más rápido) o
+                          "functional" (`FunctionalSimulator`, instrucción a
+                          instrucción; los ciclos salen de `CycleModel`)
+
+    Igual que la vista de Presentación, si no se indican registros seguros
+    se deja w2 = número de bloques cargados en la memoria dinámica.
+    """
+
+    DEFAULT_MAX_CYCLES = 50_000_000
+    ENGINES = ("pipeline", "translated", "functional")
+
+    def __init__(self, instruction_mem: BinarySource,
+                 dynamic_mem: BinarySource = None,
+                 initial_state: Optional[dict] = None,
+                 reset_auth: bool = True,
+                 map_dynamic: bool = False,
+                 engine: str = "pipeline",
+                 checkpoint: Union[Checkpoint, BinarySource] = None,
+                 output: Optional[TextIO] = None,
+                 history: Optional[RunHistory] = None,
+                 name: str = "",
+                 profiler=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Motor desconocido: {engine!r}")
+        self.engine = engine
+        self._instruction_bytes = _read_source(instruction_mem)
+        self._dynamic_path: Optional[Path] = None
+        if map_dynamic and isinstance(dynamic_mem, (str, Path)):
+            self._dynamic_path  = Path(dynamic_mem)
+            self._dynamic_bytes = b""
+        else:
+            self._dynamic_bytes = _read_source(dynamic_mem)
+        self._initial_state     = dict(initial_state or {})
+        self._reset_auth        = reset_auth
+        if checkpoint is None or isinstance(checkpoint, Checkpoint):
+            self._checkpoint = checkpoint
+        else:
+            self._checkpoint = Checkpoint.from_bytes(_read_source(checkpoint))
+        self._console           = _ConsoleBuffer()
+        self._output            = output
+        self._history           = history
+        self.name               = name
+        self.profiler           = profiler
+        self.cpu: Optional[Procesador] = None
+        self._start_cycle = 0                          # ciclo y contadores tras build()
+        self._counters_before: Optional[PerfCounters] = None
+        self.cycle_model: Optional[CycleModel] = None  # sólo motor "functional"
+
+    # ───────────────────────── construcción ──────────────────────────
+    def build(self) -> Procesador:
+        """Instancia un `Procesador` nuevo y le carga programa y datos."""
+        if self._reset_auth:
+            AuthenticationProcess().full_reset()
+
+        self._console = _ConsoleBuffer()
+        sink = StreamSink(self._output) if self._output is not None else None
+        cpu = Procesador(controller=self._console, sink=sink)
+        cpu.instruction_memory.load_binary(self._instruction_bytes)
+        if self._dynamic_path is not None:
+            cpu.dynamic_memory.map_file(self._dynamic_path)
+        else:
+            cpu.dynamic_memory.load_bytes(self._dynamic_bytes)
+
+        state = dict(self._initial_state)
+        if "safe_registers" not in state:
+            size = (self._dynamic_path.stat().st_size
+                    if self._dynamic_path is not None else len(self._dynamic_bytes))
+            blocks = size // cpu.dynamic_memory.BYTES_PER_BLOCK
+            state["safe_registers"] = [0, blocks]
+        cpu.set_state_from_external(state)
+        if self._checkpoint is not None:
+            self._checkpoint.restore(cpu)
+        # al retomar un checkpoint, contadores e historial cuentan sólo lo nuevo
+        self._start_cycle = cpu.pipeline.clock_cycle
+        self._counters_before = cpu.pipeline.counters.copy()
+        if self.profiler is not None:
+            self.profiler.attach(cpu.pipeline)
+
+        self.cpu = cpu
+        return cpu
+
+    # ───────────────────────── ejecución ─────────────────────────────
+    def run(self, max_cycles: int = DEFAULT_MAX_CYCLES) -> ProcessorSnapshot:
+        """
+        Corre hasta SWI, pipeline vacío o `max_cycles`.  Las unidades sólo
+        emiten trazas si se habilitan en `Trace.TRACE`; la salida de PRINT*
+        queda en `snapshot.output`.
+        """
+        cpu = self.build()
+        if self.engine != "pipeline" and not cpu.pipeline.is_empty():
+            raise ValueError(f"El motor {self.engine!r} necesita un checkpoint "
+                             "con el pipeline vacío")
+        start = time.perf_counter()
+        if self.engine == "translated":
+            halted = BlockTranslator(cpu).run(max_cycles)
+        elif self.engine == "functional":
+            self.cycle_model = FunctionalSimulator(cpu).run(max_cycles)
+            halted = self.cycle_model.halted
+        else:
+            halted = self._run_pipeline(cpu, max_cycles)
+        elapsed = time.perf_counter() - start
+        cpu.pipeline.printer_unit.flush()
+
+        counters = None
+        if self.engine == "pipeline":
+            counters = cpu.pipeline.counters.since(self._counters_before).to_dict(
+                cpu.pipeline.clock_cycle - self._start_cycle)
+        if self._history is not None:
+            self._record(cpu, elapsed)
+        return ProcessorSnapshot.capture(cpu, self._console.lines,
+                                         halted, elapsed, counters)
+
+
+    def _record(self, cpu: Procesador, elapsed: float) -> None:
+        """Agrega la ejecución al historial (utilización sólo con "pipeline")."""
+        size = len(self._instruction_bytes) // 8
+        cycles = cpu.pipeline.clock_cycle - self._start_cycle
+        if self.engine == "pipeline":
+            record = RunRecord.from_counters(self.name, size, self.engine, cycles,
+                                             elapsed, stage_totals(cpu.pipeline.counters),
+                                             stage_totals(self._counters_before))
+        else:
+            retired = self.cycle_model.retired if self.cycle_model else None
+            record = RunRecord(self.name, size, self.engine, cycles, elapsed, retired)
+        self._history.append(record)
+
+    @staticmethod
+    def _run_pipeline(cpu: Procesador, max_cycles: int) -> bool:
+        pipeline = cpu.pipeline
+        step = pipeline.step
+        for _ in range(max_cycles):
+            step()
+            if pipeline.halt_requested:
+                return True
+            if pipeline.is_empty():
+                return False
+        return False
+
+
+def run_headless(instruction_mem: BinarySource,
+                 dynamic_mem: BinarySource = None,
+                 initial_state: Optional[dict] = None,
+                 max_cycles: int = HeadlessEngine.DEFAULT_MAX_CYCLES,
+                 engine: str = "pipeline") -> ProcessorSnapshot:
+    """Atajo funcional: construye un `HeadlessEngine` y lo ejecuta."""
+    return HeadlessEngine(instruction_mem, dynamic_mem, initial_state,
+                          engine=engine).run(max_cycles)
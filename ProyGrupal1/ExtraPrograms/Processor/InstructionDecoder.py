@@ -0,0 +1,77 @@
+# ExtraPrograms/Processor/InstructionDecoder.py
+"""
+Pre-decodificación de instrucciones de 64 bits.
+
+Cada palabra se traduce UNA sola vez a un `DecodedInstruction` inmutable
+que contiene los campos (op, special, rd, ar1, ar2, imm32) y el paquete
+completo de señales de la `ControlUnit`.  `InstructionMemory.load` arma
+la tabla por PC y `Pipeline.decode` la consume sin volver a extraer bits
+ni re-ejecutar la tabla CFG.
+
+Las señales salen de la ROM de control (`ControlUnit.lookup`): una sola
+búsqueda por (op, special) que devuelve la palabra empaquetada, guardada
+también en `control_word`; `rom_index` es esa posición en la ROM
+((op << 4) | special), usada por los contadores de rendimiento.
+"""
+from __future__ import annotations
+
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+from ExtraPrograms.Processor.ControlUnit import ControlUnit
+
+# Señales que viajan a EX/MEM/WB dentro de "control_signals"
+PIPELINE_SIGNALS = (
+    "LogOut", "ComS", "PrintEn", "RegWriteS", "RegWriteR", "MemOp",
+    "MemWriteG", "MemWriteD", "MemByte", "PCSrc", "FlagsUpd", "BranchOp",
+    "ALUSrc",
+)
+
+# Todas las líneas de la ControlUnit (mismo orden que ControlUnit.WIDTH)
+CONTROL_SIGNALS = tuple(ControlUnit.WIDTH)
+
+DecodedInstruction = namedtuple(
+    "DecodedInstruction",
+    ("word", "op", "special", "rd", "ar1", "ar2", "imm32")
+    + CONTROL_SIGNALS
+    + ("control_word", "control_signals", "rom_index"),
+)
+
+# ─────────────────────────────────────────────
+# Memo global palabra → registro
+# (las señales dependen sólo de la palabra).  Acotado con LRU: los
+# workers de BatchRunner y la GUI cargan muchos programas en un mismo
+# proceso; la tabla por PC de InstructionMemory no depende del memo.
+# ─────────────────────────────────────────────
+CACHE_SIZE = 4096
+_LAYOUT = tuple(ControlUnit.LAYOUT[name] for name in CONTROL_SIGNALS)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def predecode(word: int) -> DecodedInstruction:
+    """
+    Devuelve el registro pre-decodificado de `word`.
+    Lanza ValueError (igual que `ControlUnit.lookup`) si el opcode no
+    existe.
+    """
+    word &= 0xFFFFFFFFFFFFFFFF
+    op      = (word >> 56) & 0xFF            # 8 bits
+    special = (word >> 52) & 0xF             # 4 bits
+    rd      = (word >> 48) & 0xF             # 4 bits
+    ar1     = (word >> 44) & 0xF             # 4 bits
+    ar2     = (word >> 40) & 0xF             # 4 bits
+    imm32   = (word >> 8) & 0xFFFFFFFF       # 32 bits
+
+    cw = ControlUnit.lookup(op, special)
+    signals = tuple((cw >> sh) & m for sh, m in _LAYOUT)
+    bundle = MappingProxyType({name: ControlUnit.field(cw, name)
+                               for name in PIPELINE_SIGNALS})
+
+    return DecodedInstruction(word, op, special, rd, ar1, ar2, imm32,
+                              *signals, cw, bundle, (op << 4) | special)
+
+
+def clear_cache() -> None:
+    """Vacía el memo global (útil si se modifica la tabla CFG)."""
+    predecode.cache_clear()
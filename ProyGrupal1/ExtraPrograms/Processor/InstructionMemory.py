@@ -1,6 +1,9 @@
 # instruction_memory.py
 from __future__ import annotations
-from typing import List
+import struct
+from typing import List, Optional
+
+from ExtraPrograms.Processor.InstructionDecoder import DecodedInstruction, predecode
 
 class InstructionMemory:
     """
@@ -24,6 +27,10 @@ class InstructionMemory:
         Si None, se crea vacía (todo 0’s).
         """
         self._mem: List[int] = words64[:] if words64 else []
+        # Tabla de pre-decodificación por índice (None = opcode inválido)
+        self._decoded: List[Optional[DecodedInstruction]] = []
+        self.version: int = 0          # se incrementa en cada (re)carga
+        self._rebuild_decoded()
 
     # ─────────────────────────────────────────────
     # Lectura combinacional
@@ -43,6 +50,31 @@ class InstructionMemory:
             return 0  # fetch fuera de rango → 0 (NOP)
         return self._mem[index] & 0xFFFFFFFFFFFFFFFF
 
+    def decoded(self, addr: int) -> Optional[DecodedInstruction]:
+        """
+        Devuelve el registro pre-decodificado de la instrucción en `addr`
+        (None si su opcode no existe; la decodificación fallará en ID).
+        """
+        if addr & 0x7:
+            raise ValueError("Instruction address debe estar alineada a 8 bytes.")
+        index = addr >> 3
+        if index >= len(self._decoded):
+            return _NOP_FILL
+        return self._decoded[index]
+
+    # ─────────────────────────────────────────────
+    # Pre-decodificación (se invalida en cada carga)
+    # ─────────────────────────────────────────────
+    def _rebuild_decoded(self) -> None:
+        table: List[Optional[DecodedInstruction]] = []
+        for word in self._mem:
+            try:
+                table.append(predecode(word))
+            except ValueError:
+                table.append(None)
+        self._decoded = table
+        self.version += 1
+
     # ─────────────────────────────────────────────
     # Métodos utilitarios para carga/debug
     # ─────────────────────────────────────────────
@@ -58,6 +90,16 @@ class InstructionMemory:
         if end > len(self._mem):
             self._mem.extend([0]*(end - len(self._mem)))
         self._mem[base:end] = [w & 0xFFFFFFFFFFFFFFFF for w in words64]
+        self._rebuild_decoded()
+
+    def load_binary(self, data: bytes, start_addr: int = 0):
+        """
+        Carga el contenido crudo de `instruction_mem.bin`
+        (palabras de 64 bits en big-endian, tal como lo emite el compilador).
+        """
+        if len(data) % 8:
+            raise ValueError("El archivo no tiene múltiplos de 8 bytes.")
+        self.load([w for (w,) in struct.iter_unpack(">Q", data)], start_addr)
 
     def size(self) -> int:
         """Devuelve el tamaño actual en instrucciones de 64 bits."""
@@ -66,3 +108,7 @@ class InstructionMemory:
     def dump(self) -> List[int]:
         """Devuelve una copia de toda la ROM (lista de ints de 64 bits)."""
         return self._mem.copy()
+
+
+# Palabra leída fuera de rango (0) ya pre-decodificada
+_NOP_FILL = predecode(0)
@@ -0,0 +1,81 @@
+# ExtraPrograms/Processor/Latches.py
+"""
+Registros de etapa del pipeline (IF/ID, ID/EX, EX/MEM, MEM/WB).
+
+Cada latch es un objeto con `__slots__` preasignado una sola vez; el
+`Pipeline` mantiene dos instancias por etapa (actual y `next_*`) y las
+intercambia en cada flanco en lugar de crear diccionarios nuevos.
+
+• `valid` reemplaza al antiguo `None`: un latch con valid == False es una
+  burbuja y su contenido no debe leerse.
+• Las señales de control viajan como referencia al `DecodedInstruction`
+  inmutable (`ctrl`); sólo PCSrc, que se recalcula en EX, se copia aparte.
+"""
+from __future__ import annotations
+
+
+class IFIDLatch:
+    __slots__ = ("valid", "pc", "instruction", "decoded")
+
+    def __init__(self):
+        self.valid = False
+        self.pc = 0
+        self.instruction = 0
+        self.decoded = None
+
+    def clear(self):
+        self.valid = False
+
+
+class IDEXLatch:
+    __slots__ = ("valid", "A", "B", "login_block", "rd", "rd_special",
+                 "flags_e", "opcode", "ctrl",
+                 "security_violation", "security_msg")
+
+    def __init__(self):
+        self.valid = False
+        self.A = 0
+        self.B = 0
+        self.login_block = 0
+        self.rd = 0
+        self.rd_special = 0
+        self.flags_e = 0
+        self.opcode = 0
+        self.ctrl = None
+        self.security_violation = False
+        self.security_msg = ""
+
+    def clear(self):
+        self.valid = False
+
+
+class EXMEMLatch:
+    __slots__ = ("valid", "alu_out", "rd", "rd_special", "opcode",
+                 "ctrl", "pcsrc")
+
+    def __init__(self):
+        self.valid = False
+        self.alu_out = 0
+        self.rd = 0
+        self.rd_special = 0
+        self.opcode = 0
+        self.ctrl = None
+        self.pcsrc = 0
+
+    def clear(self):
+        self.valid = False
+
+
+class MEMWBLatch:
+    __slots__ = ("valid", "alu_out", "rd", "opcode", "ctrl", "pcsrc")
+
+    def __init__(self):
+        self.valid = False
+        self.alu_out = 0
+        self.rd = 0
+        self.opcode = 0
+        self.ctrl = None
+        self.pcsrc = 0
+
+    def clear(self):
+        self.valid = False
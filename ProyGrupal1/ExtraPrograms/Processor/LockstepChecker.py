@@ -0,0 +1,361 @@
+# ExtraPrograms/Processor/LockstepChecker.py
+"""
+Verificador diferencial: `Pipeline` contra un motor alternativo.
+
+Se construyen dos `Procesador` idénticos (vía `HeadlessEngine.build`), uno
+avanza con `Pipeline.step` y el otro con el motor a verificar.  Si el motor
+expone `step()` (una instrucción por paso, p. ej. `FunctionalSimulator`)
+la comparación es en *lockstep*: tras el ciclo k del pipeline cada unidad
+se compara con el estado del motor después de la instrucción k - atraso,
+donde el atraso es la etapa en la que esa unidad se escribe:
+
+    registros / registros seguros   WB   → 0
+    Vault / Login                   ID   → 1
+    flags / autenticación           EX   → 2
+    memoria de datos / dinámica     MEM  → 3
+
+Los motores sin `step()` (p. ej. `BlockTranslator`) se comparan sólo en el
+punto de control final.  Al detenerse el motor por SWI se termina de
+drenar el pipeline y se comparan además PC, ciclos, salida de PRINT* y
+contadores de autenticación.  Se reporta la primera divergencia con su
+diff.
+
+`AuthenticationProcess` es un singleton compartido por ambos procesadores:
+su estado se intercambia antes y después de cada paso de cada motor.
+
+Uso:
+
+    python -m ExtraPrograms.Processor.LockstepChecker            # Test/cifrado + Test/descrifrado
+    python -m ExtraPrograms.Processor.LockstepChecker prog.asm datos.txt --every 64
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ExtraPrograms.Processor.AuthenticationUnit import AuthenticationProcess
+from ExtraPrograms.Processor.BlockTranslator import BlockTranslator
+from ExtraPrograms.Processor.FunctionalSimulator import FunctionalSimulator
+from ExtraPrograms.Processor.HeadlessEngine import (BinarySource, HeadlessEngine,
+                                                    load_data, load_program)
+
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+REPO_DIR    = PROJECT_DIR.parent
+
+# Motores verificables: nombre → fábrica(cpu)
+ENGINES: Dict[str, Callable] = {
+    "functional": FunctionalSimulator,
+    "translated": BlockTranslator,
+}
+
+# Programas de referencia: (nombre, programa, datos de la memoria dinámica)
+SUITE = (
+    ("cifrado",     PROJECT_DIR / "Ejemplos" / "Cifrado_total.asm",
+                    REPO_DIR / "Test" / "cifrado" / "jorge_luis.txt"),
+    ("descrifrado", PROJECT_DIR / "Ejemplos" / "Decifrado_total.asm",
+                    REPO_DIR / "Test" / "descrifrado" / "encrypted_image.png"),
+)
+
+# Contraseña por defecto de la tabla (P1..P8 = 1..8)
+DEFAULT_STATE = {"login": list(range(1, 9))}
+
+_AUTH_FIELDS = ("try_counter", "block_states", "S1", "S2",
+                "lockout_start", "session_start")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Unidades comparadas: nombre → (lectura, atraso en instrucciones)
+# ─────────────────────────────────────────────────────────────────────────────
+def _auth_counters(_cpu) -> Tuple[int, int, int, int]:
+    a = AuthenticationProcess()
+    return a.try_counter, a.block_states, a.S1, a.S2
+
+
+UNITS: Dict[str, Tuple[Callable, int]] = {
+    "registers":      (lambda cpu: list(cpu.register_file.regs), 0),
+    "safe_registers": (lambda cpu: cpu.safe_register_file.dump(), 0),
+    "vault":          (lambda cpu: cpu.vault_memory.dump(), 1),
+    "login":          (lambda cpu: cpu.login_memory.dump(), 1),
+    "flags":          (lambda cpu: cpu.flags.visualize(), 2),
+    "auth":           (_auth_counters, 2),
+    "data_memory":    (lambda cpu: bytes(cpu.data_memory.view()), 3),
+    "dynamic_memory": (lambda cpu: cpu.dynamic_memory.to_bytes(), 3),
+}
+MAX_LAG = max(lag for _, lag in UNITS.values())
+
+
+def _auth_save() -> tuple:
+    a = AuthenticationProcess()
+    return tuple(getattr(a, f) for f in _AUTH_FIELDS)
+
+
+def _auth_load(state: tuple) -> None:
+    a = AuthenticationProcess()
+    for f, v in zip(_AUTH_FIELDS, state):
+        setattr(a, f, v)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Resultados
+# ─────────────────────────────────────────────────────────────────────────────
+def _diff(a, b) -> List[Tuple[object, object, object]]:
+    """Lista (índice, pipeline, referencia) de las posiciones distintas."""
+    if isinstance(a, bytes) and isinstance(b, bytes):
+        out = []
+        for off in range(0, max(len(a), len(b)), 4):
+            wa, wb = a[off:off + 4], b[off:off + 4]
+            if wa != wb:
+                out.append((off,
+                            int.from_bytes(wa, "little") if wa else None,
+                            int.from_bytes(wb, "little") if wb else None))
+        return out
+    if isinstance(a, dict) and isinstance(b, dict):
+        return [(k, a.get(k), b.get(k)) for k in a.keys() | b.keys()
+                if a.get(k) != b.get(k)]
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        n = max(len(a), len(b))
+        return [(i, a[i] if i < len(a) else None, b[i] if i < len(b) else None)
+                for i in range(n)
+                if (a[i] if i < len(a) else None) != (b[i] if i < len(b) else None)]
+    return [(None, a, b)]
+
+
+def _fmt(v) -> str:
+    return f"0x{v:08X}" if isinstance(v, int) and not isinstance(v, bool) else repr(v)
+
+
+class Divergence:
+    """Primera diferencia encontrada entre el pipeline y la referencia."""
+
+    __slots__ = ("cycle", "slot", "pc", "unit", "pipeline", "reference")
+
+    def __init__(self, cycle: int, unit: str, pipeline, reference,
+                 slot: Optional[int] = None, pc: Optional[int] = None):
+        self.cycle     = cycle         # ciclo del pipeline (clock_cycle)
+        self.slot      = slot          # instrucción de la referencia comparada
+        self.pc        = pc
+        self.unit      = unit
+        self.pipeline  = pipeline
+        self.reference = reference
+
+    def diff(self) -> List[Tuple[object, object, object]]:
+        return _diff(self.pipeline, self.reference)
+
+    def format(self, limit: int = 16) -> str:
+        where = f"ciclo {self.cycle}"
+        if self.slot is not None:
+            where += f", instrucción #{self.slot}"
+        if self.pc is not None:
+            where += f" (PC=0x{self.pc:08X})"
+        lines = [f"Divergencia en '{self.unit}' — {where}"]
+        rows = self.diff()
+        for idx, p, r in rows[:limit]:
+            key = f"[{idx:#06x}]" if isinstance(idx, int) else f"[{idx}]"
+            lines.append(f"  {key:<10} pipeline={_fmt(p):<14} referencia={_fmt(r)}")
+        if len(rows) > limit:
+            lines.append(f"  … {len(rows) - limit} diferencias más")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"Divergence(unit={self.unit!r}, cycle={self.cycle}, slot={self.slot})"
+
+
+class CheckReport:
+    """Resultado de una verificación."""
+
+    __slots__ = ("name", "engine", "cycles", "checks", "halted",
+                 "elapsed_s", "divergence")
+
+    def __init__(self, name: str, engine: str):
+        self.name       = name
+        self.engine     = engine
+        self.cycles     = 0
+        self.checks     = 0            # puntos de control comparados
+        self.halted     = False
+        self.elapsed_s  = 0.0
+        self.divergence: Optional[Divergence] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.divergence is None
+
+    def __str__(self) -> str:
+        head = (f"[{'OK' if self.ok else 'FALLO'}] {self.name} ({self.engine}): "
+                f"{self.cycles} ciclos, {self.checks} comparaciones, "
+                f"{self.elapsed_s:.2f} s" + ("" if self.halted else ", sin SWI"))
+        return head if self.ok else head + "\n" + self.divergence.format()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Verificador
+# ─────────────────────────────────────────────────────────────────────────────
+class LockstepChecker:
+    """
+    • `instruction_mem` / `dynamic_mem` / `initial_state` : igual que en
+      `HeadlessEngine`
+    • `engine` : clave de `ENGINES` o una fábrica `f(cpu)` propia
+    • `every`  : compara cada `every` ciclos (1 = todos)
+    """
+
+    def __init__(self, instruction_mem: BinarySource,
+                 dynamic_mem: BinarySource = None,
+                 initial_state: Optional[dict] = None,
+                 engine="functional", every: int = 1, name: str = ""):
+        if isinstance(engine, str):
+            if engine not in ENGINES:
+                raise ValueError(f"Motor desconocido: {engine!r}")
+            self.engine_name, self._factory = engine, ENGINES[engine]
+        else:
+            self.engine_name = getattr(engine, "__name__", "custom")
+            self._factory = engine
+        self.every = max(1, every)
+        self.name = name or "programa"
+        state = DEFAULT_STATE if initial_state is None else initial_state
+        self._pipe_host = HeadlessEngine(instruction_mem, dynamic_mem, state)
+        self._ref_host  = HeadlessEngine(instruction_mem, dynamic_mem, state)
+
+    # ───────────────────────── ejecución ─────────────────────────────
+    def run(self, max_cycles: int = HeadlessEngine.DEFAULT_MAX_CYCLES) -> CheckReport:
+        report = CheckReport(self.name, self.engine_name)
+        start = time.perf_counter()
+
+        cpu_p = self._pipe_host.build()
+        cpu_r = self._ref_host.build()
+        self._auth = {"p": _auth_save(), "r": _auth_save()}
+        ref = self._factory(cpu_r)
+
+        if hasattr(ref, "step"):
+            self._lockstep(cpu_p, cpu_r, ref, max_cycles, report)
+        else:
+            self._checkpoint(cpu_p, cpu_r, ref, max_cycles, report)
+
+        report.cycles = cpu_p.pipeline.clock_cycle
+        report.elapsed_s = time.perf_counter() - start
+        return report
+
+    def _with_auth(self, side: str, fn):
+        _auth_load(self._auth[side])
+        try:
+            return fn()
+        finally:
+            self._auth[side] = _auth_save()
+
+    def _lockstep(self, cpu_p, cpu_r, ref, max_cycles, report) -> None:
+        every = self.every
+        pipeline = cpu_p.pipeline
+        initial = {u: read(cpu_r) for u, (read, _) in UNITS.items()}
+        history: Dict[str, Dict[int, object]] = {u: {} for u in UNITS}
+        pcs = [None] * (MAX_LAG + 1)
+
+        for k in range(max_cycles):
+            if not self._with_auth("r", ref.step):
+                break                                   # SWI en la referencia
+            pcs[k % len(pcs)] = getattr(ref, "last_pc", None)
+            for unit, (read, lag) in UNITS.items():
+                if (k + lag) % every == 0:
+                    history[unit][k] = self._with_auth("r", lambda: read(cpu_r))
+
+            self._with_auth("p", pipeline.step)
+            if pipeline.halt_requested:
+                report.divergence = Divergence(pipeline.clock_cycle, "halt",
+                                               True, False)
+                return
+            if k % every:
+                continue
+
+            for unit, (read, lag) in UNITS.items():
+                j = k - lag
+                expected = history[unit].pop(j) if j >= 0 else initial[unit]
+                got = self._with_auth("p", lambda: read(cpu_p))
+                if got != expected:
+                    report.divergence = Divergence(
+                        pipeline.clock_cycle, unit, got, expected,
+                        slot=j if j >= 0 else None,
+                        pc=pcs[j % len(pcs)] if j >= 0 else None)
+                    return
+            report.checks += 1
+        else:
+            return                                      # max_cycles sin SWI
+
+        # Drenar el pipeline hasta su SWI y comparar el estado final
+        for _ in range(MAX_LAG + 2):
+            if pipeline.halt_requested:
+                break
+            self._with_auth("p", pipeline.step)
+        self._compare_final(cpu_p, cpu_r, report)
+
+    def _checkpoint(self, cpu_p, cpu_r, ref, max_cycles, report) -> None:
+        self._with_auth("p", lambda: HeadlessEngine._run_pipeline(cpu_p, max_cycles))
+        self._with_auth("r", lambda: ref.run(max_cycles))
+        if cpu_p.pipeline.halt_requested:
+            self._compare_final(cpu_p, cpu_r, report)
+
+    def _compare_final(self, cpu_p, cpu_r, report) -> None:
+        report.halted = cpu_p.pipeline.halt_requested
+        if not report.halted or not cpu_r.pipeline.halt_requested:
+            report.divergence = Divergence(cpu_p.pipeline.clock_cycle, "halt",
+                                           report.halted,
+                                           cpu_r.pipeline.halt_requested)
+            return
+        pairs = [(unit, self._with_auth("p", lambda: read(cpu_p)),
+                        self._with_auth("r", lambda: read(cpu_r)))
+                 for unit, (read, _) in UNITS.items()]
+        pairs += [
+            ("pc",     cpu_p.pc.get_pc(), cpu_r.pc.get_pc()),
+            ("cycles", cpu_p.pipeline.clock_cycle, cpu_r.pipeline.clock_cycle),
+            ("output", self._pipe_host._console.lines, self._ref_host._console.lines),
+        ]
+        for unit, got, expected in pairs:
+            if got != expected:
+                report.divergence = Divergence(cpu_p.pipeline.clock_cycle,
+                                               unit, got, expected)
+                return
+        report.checks += 1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Carga de programas y CLI
+# ─────────────────────────────────────────────────────────────────────────────
+def check_program(program, data=None, engine="functional", every: int = 1,
+                  blocks: Optional[int] = None, name: str = "",
+                  max_cycles: int = HeadlessEngine.DEFAULT_MAX_CYCLES) -> CheckReport:
+    dyn = load_data(data, blocks) if data is not None else None
+    checker = LockstepChecker(load_program(program), dyn, engine=engine,
+                              every=every, name=name or Path(program).name)
+    return checker.run(max_cycles)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compara Pipeline contra un motor alternativo, ciclo a ciclo.")
+    parser.add_argument("program", nargs="?", help=".asm o instruction_mem.bin "
+                        "(por defecto: Test/cifrado y Test/descrifrado)")
+    parser.add_argument("data", nargs="?", help="archivo para la memoria dinámica")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="functional")
+    parser.add_argument("--every", type=int, default=1,
+                        help="comparar cada N ciclos (1 = todos)")
+    parser.add_argument("--blocks", type=int, default=None,
+                        help="limitar los datos a N bloques de 64 bits")
+    parser.add_argument("--max-cycles", type=int,
+                        default=HeadlessEngine.DEFAULT_MAX_CYCLES)
+    args = parser.parse_args(argv)
+
+    if args.program:
+        cases = [(Path(args.program).name, args.program, args.data)]
+    else:
+        cases = SUITE
+
+    failed = 0
+    for name, program, data in cases:
+        report = check_program(program, data, args.engine, args.every,
+                               args.blocks, name, args.max_cycles)
+        print(report, flush=True)
+        failed += not report.ok
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@
 from __future__ import annotations
 from typing import List, Optional
 from ExtraPrograms.Processor.Flags import Flags
+from ExtraPrograms.Processor.Trace import TRACE, WARN, DEBUG
 
 BLOCK_BITS  = 32
 NUM_BLOCKS  = 8
@@ -21,12 +22,14 @@ class LoginMemory:
         self._flags = flags
         self._mem: List[int] = [0] * NUM_BLOCKS
         self._pending: Optional[tuple[int, int]] = None
+        self.undo_log: Optional[list] = None            # TimeTravel
 
     def read(self, A: int, L: int = 0) -> int:
         """Lee bloque A. Retorna 0 si no hay permisos."""
         # Verificar permisos: necesita S1/S2 O flag L
         if not (self._flags.enabled() == 1 or L == 1):
-            print(f"[LOGIN] Lectura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}, L={L}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "LOGIN", f"Lectura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}, L={L}")
             return 0  # Retornar 0 en lugar de lanzar excepción
         
         idx = A & 0x7
@@ -37,21 +40,29 @@ class LoginMemory:
         if not WE:
             return
         if self._flags.enabled() != 1:
-            print(f"[LOGIN] Escritura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "LOGIN", f"Escritura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
             return
         idx = A & 0x7
         self._pending = (idx, WD & BLOCK_MASK)
         # ─── NUEVO LOG ────────────────────────────────────────────
-        print(f"[LOGIN] ★ escritura latcheada P{idx+1} <- 0x{WD & BLOCK_MASK:08X}")
+        if TRACE.level >= DEBUG:
+            TRACE.emit(DEBUG, "LOGIN", f"★ escritura latcheada P{idx+1} <- 0x{WD & BLOCK_MASK:08X}")
 
     def tick(self):
         if self._pending is not None:
             idx, data = self._pending
+            if self.undo_log is not None:
+                self.undo_log.append((self, idx, self._mem[idx]))
             self._mem[idx] = data
             # ─── CONFIRMACIÓN ─────────────────────────────────────
-            print(f"[LOGIN] ✔ P{idx+1} <= 0x{data:08X} (commit)")
+            if TRACE.level >= DEBUG:
+                TRACE.emit(DEBUG, "LOGIN", f"✔ P{idx+1} <= 0x{data:08X} (commit)")
             self._pending = None
 
+    def undo_write(self, idx: int, old: int):
+        self._mem[idx] = old
+
     def dump(self) -> List[int]:
         return self._mem.copy()
     
\ No newline at end of file
@@ -0,0 +1,199 @@
+# ExtraPrograms/Processor/PerfCounters.py
+"""
+Contadores de rendimiento del `Pipeline` (estilo PMU de hardware).
+
+En la ruta caliente sólo se incrementan enteros: cuatro histogramas por
+entrada de la ROM de control (índice (op << 4) | special, el mismo de
+`ControlUnit.rom()`), uno por etapa, más unos pocos contadores escalares:
+
+    decoded[i]   instrucciones decodificadas (ID)
+    executed[i]  instrucciones ejecutadas (EX)
+    memory[i]    instrucciones que pasaron por MEM
+    retired[i]   instrucciones retiradas (WB)
+
+Todo lo demás (clases de opcode, cargas/almacenamientos por memoria
+G/D/V/P, intentos de autenticación) se deriva al leer, cruzando los
+histogramas con las señales de la ROM: leer cuesta O(entradas usadas) y
+se puede hacer en cualquier momento.
+
+Sólo el motor ciclo a ciclo (`Pipeline.step`) los actualiza.  Viajan con
+el estado del procesador: `Checkpoint` los guarda (sección "PERF") y
+`TimeTravel` los deshace ciclo a ciclo (`uncount_cycle`), de modo que
+siempre corresponden a `clock_cycle`.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from ExtraPrograms.ISA.isa import OPCODES
+from ExtraPrograms.Processor.ControlUnit import ControlUnit
+from ExtraPrograms.Processor.InstructionDecoder import predecode
+
+ROM_ENTRIES = 256 * 16
+
+# Clases de opcode (mismos grupos que ExtraPrograms/ISA/isa.py)
+OPCODE_CLASSES = {
+    "aritmetica":  ("ADD", "ADDS", "SUB", "ADC", "SBC", "MUL", "DIV", "AND",
+                    "ORR", "EOR", "BIC", "LSL", "LSR", "ASR", "ROR"),
+    "inmediata":   ("ADDI", "SUBI", "ADCI", "SBCI", "MULI", "DIVI", "ANDI",
+                    "ORRI", "EORI", "BICI", "LSLI", "LSRI", "ASRI", "RORI"),
+    "movimiento":  ("MOV", "MVN", "MOVI", "MVNI"),
+    "comparacion": ("CMP", "CMPS", "CMN", "TST", "TEQ", "CMPI", "CMNI",
+                    "TSTI", "TEQI"),
+    "salto":       ("B", "BEQ", "BNE", "BLT", "BGT"),
+    "especial":    ("SWI", "NOP"),
+    "memoria":     ("LDR", "STR", "LDRB", "STRB"),
+    "es":          ("PRINTI", "PRINTS", "PRINTB"),
+    "seguridad":   ("LOGOUT", "STRK", "STRPASS"),
+}
+_CLASS_OF_OP = {int(OPCODES[name], 2): cls
+                for cls, names in OPCODE_CLASSES.items() for name in names}
+_NAME_OF_OP = {int(code, 2): name for name, code in OPCODES.items()}
+
+
+class PerfCounters:
+    """Bloque de contadores; `Pipeline.counters` es una instancia."""
+
+    HISTOGRAMS = ("decoded", "executed", "memory", "retired")
+    SCALARS    = ("fetch_stalls", "branch_flushes", "taken_branches",
+                  "security_violations")
+
+    __slots__ = HISTOGRAMS + SCALARS
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.decoded  = [0] * ROM_ENTRIES
+        self.executed = [0] * ROM_ENTRIES
+        self.memory   = [0] * ROM_ENTRIES
+        self.retired  = [0] * ROM_ENTRIES
+        self.fetch_stalls        = 0   # fetch detenido con IF/ID ocupado
+        self.branch_flushes      = 0   # vaciados por pcsrc_w en Pipeline.step
+        self.taken_branches      = 0   # saltos con PCSrc & CondExE en EX
+        self.security_violations = 0   # accesos protegidos sin permisos en ID
+
+    def copy(self) -> "PerfCounters":
+        out = PerfCounters.__new__(PerfCounters)
+        for name in self.HISTOGRAMS:
+            setattr(out, name, list(getattr(self, name)))
+        for name in self.SCALARS:
+            setattr(out, name, getattr(self, name))
+        return out
+
+    def since(self, earlier: "PerfCounters") -> "PerfCounters":
+        """Lo contado desde `earlier` (una `copy()` anterior)."""
+        out = PerfCounters.__new__(PerfCounters)
+        for name in self.HISTOGRAMS:
+            setattr(out, name, [a - b for a, b in zip(getattr(self, name),
+                                                      getattr(earlier, name))])
+        for name in self.SCALARS:
+            setattr(out, name, getattr(self, name) - getattr(earlier, name))
+        return out
+
+    def uncount_cycle(self, pipeline) -> None:
+        """
+        Deshace los incrementos de histograma de un ciclo.  `pipeline` debe
+        tener los registros de etapa de antes del ciclo: cada etapa con
+        entrada válida contó una vez la entrada de ROM de su instrucción
+        (ID ← if_id, EX ← id_ex, MEM ← ex_mem, WB ← mem_wb).  Los
+        escalares los restaura quien llama.
+        """
+        if_id = pipeline.if_id
+        if if_id.valid:
+            ctrl = if_id.decoded or predecode(if_id.instruction)
+            self.decoded[ctrl.rom_index] -= 1
+        for hist, latch in ((self.executed, pipeline.id_ex),
+                            (self.memory, pipeline.ex_mem),
+                            (self.retired, pipeline.mem_wb)):
+            if latch.valid:
+                hist[latch.ctrl.rom_index] -= 1
+
+    # ───────────────────────── derivados ─────────────────────────────
+    @staticmethod
+    def _by(hist, key) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for i, n in enumerate(hist):
+            if n:
+                k = key(i)
+                out[k] = out.get(k, 0) + n
+        return out
+
+    @staticmethod
+    def _sum_where(hist, predicate) -> int:
+        rom = ControlUnit.rom()
+        return sum(n for i, n in enumerate(hist)
+                   if n and rom[i] is not None and predicate(rom[i]))
+
+    @staticmethod
+    def _field(name: str):
+        sh, m = ControlUnit.LAYOUT[name]
+        return lambda word: (word >> sh) & m
+
+    @property
+    def retired_total(self) -> int:
+        return sum(self.retired)
+
+    def retired_by_class(self) -> Dict[str, int]:
+        return self._by(self.retired, lambda i: _CLASS_OF_OP.get(i >> 4, "otro"))
+
+    def retired_by_opcode(self) -> Dict[str, int]:
+        return self._by(self.retired,
+                        lambda i: _NAME_OF_OP.get(i >> 4, f"0x{i >> 4:02X}"))
+
+    def memory_accesses(self) -> Dict[str, Dict[str, int]]:
+        """Cargas/almacenamientos por memoria (G, D en MEM; V, P en ID)."""
+        f = self._field
+        mem_op, reg_b = f("MemOp"), f("RegisterInB")
+        return {
+            "G": {"loads":  self._sum_where(self.memory, lambda w: mem_op(w) == 0b00),
+                  "stores": self._sum_where(self.memory, f("MemWriteG"))},
+            "D": {"loads":  self._sum_where(self.memory, lambda w: mem_op(w) == 0b01),
+                  "stores": self._sum_where(self.memory, f("MemWriteD"))},
+            "V": {"loads":  self._sum_where(self.decoded, lambda w: reg_b(w) == 0b10),
+                  "stores": self._sum_where(self.decoded, f("MemWriteV"))},
+            "P": {"loads":  self._sum_where(self.decoded, lambda w: reg_b(w) == 0b11),
+                  "stores": self._sum_where(self.decoded, f("MemWriteP"))},
+        }
+
+    def auth_attempts(self) -> int:
+        """Comparaciones contra bloques de contraseña (ComS) ejecutadas."""
+        return self._sum_where(self.executed, self._field("ComS"))
+
+    def logouts(self) -> int:
+        return self._sum_where(self.executed, self._field("LogOut"))
+
+    # ───────────────────────── exportación ───────────────────────────
+    def to_dict(self, cycles: Optional[int] = None) -> dict:
+        retired = self.retired_total
+        d = {
+            "retired":             retired,
+            "retired_by_class":    self.retired_by_class(),
+            "retired_by_opcode":   self.retired_by_opcode(),
+            "decoded":             sum(self.decoded),
+            "executed":            sum(self.executed),
+            "taken_branches":      self.taken_branches,
+            "branch_flushes":      self.branch_flushes,
+            "fetch_stalls":        self.fetch_stalls,
+            "security_violations": self.security_violations,
+            "memory":              self.memory_accesses(),
+            "auth_attempts":       self.auth_attempts(),
+            "logouts":             self.logouts(),
+        }
+        if cycles is not None:
+            d["cycles"] = cycles
+            d["cpi"] = cycles / retired if retired else 0.0
+            d["bubbles"] = cycles - retired          # ciclos sin WB útil
+        return d
+
+    def to_json(self, path=None, cycles: Optional[int] = None) -> str:
+        text = json.dumps(self.to_dict(cycles), indent=2)
+        if path is not None:
+            Path(path).write_text(text, encoding="utf-8")
+        return text
+
+    def __repr__(self) -> str:
+        return (f"PerfCounters(retired={self.retired_total}, "
+                f"taken_branches={self.taken_branches})")
@@ -1,11 +1,20 @@
 # ExtraPrograms/Processor/PipeLine.py - VERSIÓN SEGURA
 from ExtraPrograms.Processor.PrinterUnit import PrinterUnit
+from ExtraPrograms.Processor.PerfCounters import PerfCounters
+from ExtraPrograms.Processor.InstructionDecoder import predecode
+from ExtraPrograms.Processor.Latches import IFIDLatch, IDEXLatch, EXMEMLatch, MEMWBLatch
+from ExtraPrograms.Processor.Trace import TRACE, ERROR, WARN, DEBUG
 
 class Pipeline:
+    # Módulos con flanco de reloj, en el orden de step() (StageProfiler los recorre)
+    CLOCKED_UNITS = ("pc", "register_file", "safe_register_file", "vault_memory",
+                     "login_memory", "data_memory", "dynamic_memory")
+
     def __init__(self, program_counter, instruction_memory,
                  register_file, safe_register_file,
                  data_memory, dynamic_memory, vault_memory, login_memory,
-                 alu, flags, control_unit, cond_unit, extend, controller):
+                 alu, flags, control_unit, cond_unit, extend, controller,
+                 sink=None):
         
         # ─── Módulos principales ────────────────────────────
         self.pc = program_counter
@@ -21,30 +30,36 @@ class Pipeline:
         self.control_unit = control_unit
         self.cond_unit = cond_unit
         self.extend = extend
-        self.printer_unit = PrinterUnit(controller)
+        self.printer_unit = PrinterUnit(controller, sink)
 
-        # ─── Registros de etapa ─────────────────────────────
-        self.if_id = None
-        self.id_ex = None
-        self.ex_mem = None
-        self.mem_wb = None
+        # ─── Registros de etapa (preasignados, valid=False) ─
+        self.if_id = IFIDLatch()
+        self.id_ex = IDEXLatch()
+        self.ex_mem = EXMEMLatch()
+        self.mem_wb = MEMWBLatch()
 
         # ─── Buffers para el siguiente ciclo ────────────────
-        self.next_if_id = None
-        self.next_id_ex = None
-        self.next_ex_mem = None
-        self.next_mem_wb = None
+        #     (se intercambian con los actuales en cada step)
+        self.next_if_id = IFIDLatch()
+        self.next_id_ex = IDEXLatch()
+        self.next_ex_mem = EXMEMLatch()
+        self.next_mem_wb = MEMWBLatch()
 
         # ─── Ciclo de reloj y estadísticas ─────────────────
         self.clock_cycle = 0
         self.instructions_completed = 0
+        self.halt_requested = False
+        self.counters = PerfCounters()          # ver PerfCounters.py
+        self.profiler = None                    # StageProfiler opcional (StageProfiler.py)
 
         self.flush_pipeline()
 
     def fetch(self):
         # No sobreescribimos si ya hay una instrucción pendiente en IF/ID
-        if self.if_id is not None and self.next_if_id is not None:
-            print("[STALL] FETCH detenido: IF/ID aún en uso.")
+        if self.if_id.valid and self.next_if_id.valid:
+            self.counters.fetch_stalls += 1
+            if TRACE.level >= DEBUG:
+                TRACE.emit(DEBUG, "STALL", "FETCH detenido: IF/ID aún en uso.")
             return
 
         # Obtener dirección actual del Program Counter
@@ -54,29 +69,26 @@ class Pipeline:
         instruction = self.instruction_memory.read(current_pc)
 
         # Cargar valores al buffer del próximo ciclo
-        self.next_if_id = {
-            "pc": current_pc,
-            "instruction": instruction
-        }
+        nxt = self.next_if_id
+        nxt.pc = current_pc
+        nxt.instruction = instruction
+        nxt.decoded = self.instruction_memory.decoded(current_pc)
+        nxt.valid = True
         
     def decode(self):
-        if self.if_id is None:
+        if_id = self.if_id
+        if not if_id.valid:
             return  # No hay instrucción para decodificar
 
-        instr = self.if_id["instruction"]
-        pc = self.if_id["pc"]
-
-        # 1. Decodificar instrucción
-        op = (instr >> 56) & 0xFF            # 8 bits
-        special = (instr >> 52) & 0xF        # 4 bits
-        rd = (instr >> 48) & 0xF             # 4 bits
-        ar1 = (instr >> 44) & 0xF            # 4 bits
-        ar2 = (instr >> 40) & 0xF            # 4 bits
-        imm32 = (instr >> 8) & 0xFFFFFFFF    # 32 bits
+        instr = if_id.instruction
+        pc = if_id.pc
 
-        # 2. Generar señales de control
-        self.control_unit.generate_signals(special, op)
-        ctrl = self.control_unit
+        # 1-2. Campos + señales de control ya pre-decodificados en la carga
+        #      (predecode() lanza ValueError si el opcode no existe)
+        ctrl = if_id.decoded or predecode(instr)
+        op, rd, ar1, ar2, imm32 = ctrl.op, ctrl.rd, ctrl.ar1, ctrl.ar2, ctrl.imm32
+        counters = self.counters
+        counters.decoded[ctrl.rom_index] += 1
         
         # ── Señal externa L (solo este ciclo) ────────
         L_signal = 1 if ctrl.ComS else 0
@@ -93,21 +105,21 @@ class Pipeline:
         if ctrl.RegisterInA == 0 and self.flags.enabled() != 1:
             # Intenta leer de registro seguro sin permisos
             security_violation = True
-            security_msg = f"[SECURITY] Intento de leer registro seguro w{ar1} sin SafeFlags"
+            security_msg = f"Intento de leer registro seguro w{ar1} sin SafeFlags"
             
         if ctrl.RegisterInB in [0b01, 0b10] and self.flags.enabled() != 1:
             # RegisterInB = 01: SafeRegisterFile
             # RegisterInB = 10: VaultMemory
             security_violation = True
             if ctrl.RegisterInB == 0b01:
-                security_msg = f"[SECURITY] Intento de leer registro seguro w{ar2} sin SafeFlags"
+                security_msg = f"Intento de leer registro seguro w{ar2} sin SafeFlags"
             else:
-                security_msg = f"[SECURITY] Intento de leer VaultMemory[{ar2}] sin SafeFlags"
+                security_msg = f"Intento de leer VaultMemory[{ar2}] sin SafeFlags"
                 
         if ctrl.RegisterInB == 0b11 and not (self.flags.enabled() == 1 or L_signal):
             # LoginMemory necesita SafeFlags O L
             security_violation = True
-            security_msg = f"[SECURITY] Intento de leer LoginMemory[{ar2}] sin SafeFlags ni L"
+            security_msg = f"Intento de leer LoginMemory[{ar2}] sin SafeFlags ni L"
 
         # ── Operando A ─────────────────────────────
         if ctrl.RegisterInA == 1:
@@ -117,7 +129,8 @@ class Pipeline:
             # Registro seguro - verificar permisos
             A_intermedio, _ = self.safe_register_file.read(ar1, 0)
             if A_intermedio == 0 and self.flags.enabled() != 1:
-                print(f"[DECODE] Acceso bloqueado a registro seguro w{ar1}")
+                if TRACE.level >= WARN:
+                    TRACE.emit(WARN, "DECODE", f"Acceso bloqueado a registro seguro w{ar1}")
 
         # MUX para branch
         if ctrl.BranchE:
@@ -136,19 +149,22 @@ class Pipeline:
             # Registro seguro - verificar permisos
             _, B_intermedio = self.safe_register_file.read(0, ar2)
             if B_intermedio == 0 and self.flags.enabled() != 1:
-                print(f"[DECODE] Acceso bloqueado a registro seguro w{ar2}")
+                if TRACE.level >= WARN:
+                    TRACE.emit(WARN, "DECODE", f"Acceso bloqueado a registro seguro w{ar2}")
 
         elif src_b == 0b10:
             # VaultMemory - verificar permisos
             B_intermedio = self.vault_memory.read(ar2)
             if B_intermedio == 0 and self.flags.enabled() != 1:
-                print(f"[DECODE] Acceso bloqueado a VaultMemory[{ar2}]")
+                if TRACE.level >= WARN:
+                    TRACE.emit(WARN, "DECODE", f"Acceso bloqueado a VaultMemory[{ar2}]")
 
         elif src_b == 0b11:
             # LoginMemory - verificar permisos (SafeFlags O L)
             B_intermedio = self.login_memory.read(ar2, L_signal)
             if B_intermedio == 0 and not (self.flags.enabled() == 1 or L_signal):
-                print(f"[DECODE] Acceso bloqueado a LoginMemory[{ar2}]")
+                if TRACE.level >= WARN:
+                    TRACE.emit(WARN, "DECODE", f"Acceso bloqueado a LoginMemory[{ar2}]")
 
         # MUX final: ImmediateOp decide si usar inmediato
         if ctrl.ImmediateOp:
@@ -166,178 +182,166 @@ class Pipeline:
         flags_nzcv = self.flags.as_nzcv()
 
         # 4. Guardar en next_id_ex
-        self.next_id_ex = {
-            "A": A,
-            "B": B,
-            "LoginInBlockD": ar2,
-            "rd": rd,
-            "Rd_Special": B_intermedio,
-            "control_signals": {
-                "LogOut": ctrl.LogOut,
-                "ComS": ctrl.ComS,
-                "PrintEn": ctrl.PrintEn,
-                "RegWriteS": ctrl.RegWriteS,
-                "RegWriteR": ctrl.RegWriteR,
-                "MemOp": ctrl.MemOp,
-                "MemWriteG": ctrl.MemWriteG,
-                "MemWriteD": ctrl.MemWriteD,
-                "MemByte": ctrl.MemByte,
-                "PCSrc": ctrl.PCSrc,
-                "FlagsUpd": ctrl.FlagsUpd,
-                "BranchOp": ctrl.BranchOp,
-                "ALUSrc": ctrl.ALUSrc,
-            },
-            "FlagsE": flags_nzcv,
-            "opcode": op,
-            "security_violation": security_violation,
-            "security_msg": security_msg
-        }
+        nxt = self.next_id_ex
+        nxt.A = A
+        nxt.B = B
+        nxt.login_block = ar2
+        nxt.rd = rd
+        nxt.rd_special = B_intermedio
+        nxt.ctrl = ctrl                       # DecodedInstruction inmutable
+        nxt.flags_e = flags_nzcv
+        nxt.opcode = op
+        nxt.security_violation = security_violation
+        nxt.security_msg = security_msg
+        nxt.valid = True
         
         # Log de seguridad si hubo violación
         if security_violation:
-            print(security_msg)
+            counters.security_violations += 1
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "SECURITY", security_msg)
 
     def execute(self):
-        if not self.id_ex:
+        id_ex = self.id_ex
+        if not id_ex.valid:
             return
 
         # Cargar info de etapa previa
-        A = self.id_ex["A"]
-        B = self.id_ex["B"]
-        login_block_e = self.id_ex["LoginInBlockD"]
-        ctrl = self.id_ex["control_signals"]
+        A = id_ex.A
+        B = id_ex.B
+        login_block_e = id_ex.login_block
+        ctrl = id_ex.ctrl
 
         # Verificar si hubo violación de seguridad
-        if self.id_ex.get("security_violation", False):
-            print(f"[EXECUTE] {self.id_ex.get('security_msg', 'Security violation')}")
+        if id_ex.security_violation and TRACE.level >= WARN:
+            TRACE.emit(WARN, "EXECUTE", id_ex.security_msg or "Security violation")
 
         # Calcular carry_in desde FlagsE
-        flags_e = self.id_ex["FlagsE"]
+        flags_e = id_ex.flags_e
         carry_in = (flags_e >> 1) & 0b1
 
         # Ejecutar ALU
-        result, alu_flags_out = self.alu.execute(ctrl["ALUSrc"], A, B, carry_in)
-        nzcv = (alu_flags_out[0] << 3) | (alu_flags_out[1] << 2) | (alu_flags_out[2] << 1) | alu_flags_out[3]
+        result, nzcv = self.alu.execute(ctrl.ALUSrc, A, B, carry_in)
 
         # CondUnit: evaluar condición
         self.cond_unit.generate_signals(
-            ctrl["BranchOp"],
-            ctrl["LogOut"],
-            ctrl["ComS"],
+            ctrl.BranchOp,
+            ctrl.LogOut,
+            ctrl.ComS,
             login_block_e,
-            ctrl["FlagsUpd"],
+            ctrl.FlagsUpd,
             nzcv,
             flags_e,
         )
         
         # Calcular PCSrc modificado
-        pcsrc_m = ctrl["PCSrc"] & self.cond_unit.CondExE
-
-        # Pasar señales a MEM
-        control_signals = {
-            "RegWriteS": ctrl["RegWriteS"],
-            "RegWriteR": ctrl["RegWriteR"],
-            "MemOp": ctrl["MemOp"],
-            "MemWriteG": ctrl["MemWriteG"],
-            "MemWriteD": ctrl["MemWriteD"],
-            "MemByte": ctrl["MemByte"],
-            "PCSrc": pcsrc_m,
-            "PrintEn": ctrl["PrintEn"],
-        }
-
-        self.next_ex_mem = {
-            "ALUOut": result,
-            "rd": self.id_ex["rd"],
-            "control_signals": control_signals,
-            "Rd_Special": self.id_ex["Rd_Special"],
-        }
-
-        # Flags para depuración
-        n, z, c, v = alu_flags_out
-        if (self.id_ex.get("opcode") == 0x2F):    
+        pcsrc_m = ctrl.PCSrc & self.cond_unit.CondExE
+        counters = self.counters
+        counters.executed[ctrl.rom_index] += 1
+        if pcsrc_m:
+            counters.taken_branches += 1
+
+        # Pasar señales a MEM (PCSrc ya condicionado)
+        nxt = self.next_ex_mem
+        nxt.alu_out = result
+        nxt.rd = id_ex.rd
+        nxt.rd_special = id_ex.rd_special
+        nxt.opcode = id_ex.opcode
+        nxt.ctrl = ctrl
+        nxt.pcsrc = pcsrc_m
+        nxt.valid = True
+
+        if id_ex.opcode == 0x2F:
             self.halt_requested = True
 
     def mem(self):
-        if not self.ex_mem:
+        ex_mem = self.ex_mem
+        if not ex_mem.valid:
             return
 
-        alu_out_ex = self.ex_mem["ALUOut"]
-        rd = self.ex_mem["rd"]
-        rd_special = self.ex_mem["Rd_Special"]
-        ctrl = self.ex_mem["control_signals"]
+        alu_out_ex = ex_mem.alu_out
+        rd_special = ex_mem.rd_special
+        ctrl = ex_mem.ctrl
+        self.counters.memory[ctrl.rom_index] += 1
 
         # Operación de memoria
         alu_out = None
-        if ctrl["MemOp"] == 0b00:  # LOAD de memoria general
+        mem_op = ctrl.MemOp
+        if mem_op == 0b00:  # LOAD de memoria general
             alu_out = self.data_memory.read(alu_out_ex)
-        elif ctrl["MemOp"] == 0b01:  # LOAD de memoria dinámica
+        elif mem_op == 0b01:  # LOAD de memoria dinámica
             # CRÍTICO: La memoria dinámica retornará 0 si no hay permisos
             alu_out = self.dynamic_memory.read(alu_out_ex)
             if alu_out == 0 and self.flags.enabled() != 1:
-                print(f"[MEM] Lectura de memoria dinámica bloqueada por falta de SafeFlags")
-        elif ctrl["MemOp"] == 0b10:
-            print("No se espera recibir un MemOP de 10")
+                if TRACE.level >= WARN:
+                    TRACE.emit(WARN, "MEM", "Lectura de memoria dinámica bloqueada por falta de SafeFlags")
+        elif mem_op == 0b10:
+            if TRACE.level >= ERROR:
+                TRACE.emit(ERROR, "MEM", "No se espera recibir un MemOP de 10")
 
         # Preparar datos para escritura
         WD_G = 0
-        if ctrl["MemByte"]:
+        if ctrl.MemByte:
             WD_G = self.extend.uxtb_32_to_32(rd_special)
         else:
             WD_G = rd_special
-        self.data_memory.write(alu_out_ex, WD_G, ctrl["MemWriteG"])
+        self.data_memory.write(alu_out_ex, WD_G, ctrl.MemWriteG)
 
         # Escritura en memoria dinámica (se bloqueará si no hay permisos)
         WD_D = 0
-        if ctrl["MemByte"]:
+        if ctrl.MemByte:
             WD_D = self.extend.uxtb_32_to_32(rd_special)
         else:
             WD_D = rd_special
-        self.dynamic_memory.write(alu_out_ex, WD_D, ctrl["MemWriteD"])
-
-        control_signals = {
-            "RegWriteS": ctrl["RegWriteS"],
-            "RegWriteR": ctrl["RegWriteR"],
-            "MemByte": ctrl["MemByte"],
-            "PCSrc": ctrl["PCSrc"],
-            "PrintEn": ctrl["PrintEn"],
-        }
-        val_wb = alu_out if alu_out is not None else alu_out_ex
-
-        self.next_mem_wb = {
-            "ALUOut": val_wb,
-            "rd": rd,
-            "control_signals": control_signals,
-        }
+        self.dynamic_memory.write(alu_out_ex, WD_D, ctrl.MemWriteD)
+
+        nxt = self.next_mem_wb
+        nxt.alu_out = alu_out if alu_out is not None else alu_out_ex
+        nxt.rd = ex_mem.rd
+        nxt.opcode = ex_mem.opcode
+        nxt.ctrl = ctrl
+        nxt.pcsrc = ex_mem.pcsrc
+        nxt.valid = True
 
     def writeback(self):
-        if not self.mem_wb:
+        mem_wb = self.mem_wb
+        if not mem_wb.valid:
             return
 
-        alu_out = self.mem_wb["ALUOut"]
-        rd = self.mem_wb["rd"]
-        ctrl = self.mem_wb["control_signals"]
+        alu_out = mem_wb.alu_out
+        rd = mem_wb.rd
+        ctrl = mem_wb.ctrl
+        self.counters.retired[ctrl.rom_index] += 1
+        self.instructions_completed += 1
 
-        if ctrl["MemByte"]:
+        if ctrl.MemByte:
             alu_out = self.extend.uxtb_32_to_32(alu_out)
 
         # Escritura en registros
-        self.register_file.write(rd, alu_out, ctrl["RegWriteR"])
+        self.register_file.write(rd, alu_out, ctrl.RegWriteR)
         # CRÍTICO: La escritura en registro seguro se bloqueará si no hay permisos
-        self.safe_register_file.write(rd, alu_out, ctrl["RegWriteS"])
+        self.safe_register_file.write(rd, alu_out, ctrl.RegWriteS)
 
         # Impresión si corresponde
-        if ctrl["PrintEn"] == 0b00:
+        print_en = ctrl.PrintEn
+        if print_en == 0b00:
             self.printer_unit.print_integer(alu_out)
-        elif ctrl["PrintEn"] == 0b01:
+        elif print_en == 0b01:
             self.printer_unit.print_ascii(alu_out)
-        elif ctrl["PrintEn"] == 0b10:
+        elif print_en == 0b10:
             self.printer_unit.print_binary(alu_out)
 
         # Si corresponde salto condicional, actualizar PC
         self.pc.result_w = alu_out
-        self.pc.pcsrc_w = ctrl["PCSrc"]
+        self.pc.pcsrc_w = mem_wb.pcsrc
 
     def step(self):
+        # 0. Ciclo muestreado por el perfilador (mismo ciclo, cronometrado)
+        profiler = self.profiler
+        if profiler is not None and profiler.sample():
+            profiler.profile_step(self)
+            return
+
         # 1. Ejecutar etapas del ciclo actual
         self.writeback()
         self.mem()
@@ -346,17 +350,9 @@ class Pipeline:
         self.fetch()
 
         # 2. Aplicar avance de registros entre etapas
-        self.if_id = self.next_if_id
-        self.id_ex = self.next_id_ex
-        self.ex_mem = self.next_ex_mem
-        self.mem_wb = self.next_mem_wb
+        self.advance_latches()
 
-        self.next_if_id = None
-        self.next_id_ex = None
-        self.next_ex_mem = None
-        self.next_mem_wb = None
-
-        # 3. Flanco de reloj para módulos sincronizados
+        # 3. Flanco de reloj para módulos sincronizados (CLOCKED_UNITS)
         self.pc.tick()
         self.register_file.tick()
         self.safe_register_file.tick()
@@ -365,24 +361,53 @@ class Pipeline:
         self.data_memory.tick()
         self.dynamic_memory.tick()
 
-        # 4. Verificar salto condicional después del tick
+        # 4. Saltos, contador de ciclos y halt
+        self.end_cycle()
+
+    def advance_latches(self):
+        # Se intercambian los buffers y el que queda como "next" se marca burbuja
+        self.if_id, self.next_if_id = self.next_if_id, self.if_id
+        self.id_ex, self.next_id_ex = self.next_id_ex, self.id_ex
+        self.ex_mem, self.next_ex_mem = self.next_ex_mem, self.ex_mem
+        self.mem_wb, self.next_mem_wb = self.next_mem_wb, self.mem_wb
+
+        self.next_if_id.valid = False
+        self.next_id_ex.valid = False
+        self.next_ex_mem.valid = False
+        self.next_mem_wb.valid = False
+
+    def end_cycle(self):
+        # Verificar salto condicional después del tick
         branch_taken = bool(self.pc.pcsrc_w)
         if branch_taken:
-            self.if_id = None
-            self.id_ex = None
-            self.next_if_id = None
+            self.counters.branch_flushes += 1
+            self.if_id.valid = False
+            self.id_ex.valid = False
+            self.next_if_id.valid = False
 
-        # 5. Actualizar contador de ciclos
+        # Actualizar contador de ciclos
         self.clock_cycle += 1
+        if TRACE.level:
+            TRACE.cycle = self.clock_cycle
         
-        # 6. Halt por SWI
-        if getattr(self, "halt_requested", False):
-            self.if_id = self.id_ex = self.ex_mem = self.mem_wb = None
-            self.next_if_id = self.next_id_ex = self.next_ex_mem = self.next_mem_wb = None
+        # Halt por SWI
+        if self.halt_requested:
+            self.flush_pipeline()
+            self.next_if_id.valid = False
+            self.next_id_ex.valid = False
+            self.next_ex_mem.valid = False
+            self.next_mem_wb.valid = False
 
     def flush_pipeline(self):
-        self.if_id = None
-        self.id_ex = None
-        self.ex_mem = None
-        self.mem_wb = None
+        self.if_id.valid = False
+        self.id_ex.valid = False
+        self.ex_mem.valid = False
+        self.mem_wb.valid = False
+
+    def is_empty(self) -> bool:
+        """True si ninguna etapa (actual o siguiente) contiene instrucción."""
+        return not (self.if_id.valid or self.id_ex.valid or
+                    self.ex_mem.valid or self.mem_wb.valid or
+                    self.next_if_id.valid or self.next_id_ex.valid or
+                    self.next_ex_mem.valid or self.next_mem_wb.valid)
         
\ No newline at end of file
@@ -1,32 +1,156 @@
 # ExtraPrograms/Processor/PrinterUnit.py
+from abc import ABC, abstractmethod
+from typing import List, Optional, TextIO
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Destinos de salida (sinks)
+# ─────────────────────────────────────────────────────────────────────────────
+class OutputSink(ABC):
+    """
+    Destino de las líneas que produce la PrinterUnit.  `write` recibe una
+    línea por instrucción PRINT*; `flush` entrega lo pendiente.  Un sink sin
+    `write` falla al instanciarse, no en el primer PRINT*.
+    """
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        ...
+
+    def flush(self) -> None:
+        pass
+
+
+class ConsoleSink(OutputSink):
+    """Sin búfer: una llamada a controller.print_console() por línea."""
+
+    def __init__(self, controller):
+        self.controller = controller
+
+    def write(self, text: str) -> None:
+        self.controller.print_console(text)
+
+
+class NullSink(OutputSink):
+    """Descarta la salida (p. ej. re-ejecución en TimeTravel)."""
+
+    def write(self, text: str) -> None:
+        pass
+
+
+class StreamSink(OutputSink):
+    """
+    Escribe en un objeto tipo archivo (sys.stdout, open(..., "w"), StringIO).
+    Acumula hasta `buffer_lines` líneas antes de escribir; `sep` separa
+    cada PRINT* ("" para juntar los caracteres de PRINTC).
+    """
+
+    def __init__(self, stream: TextIO, buffer_lines: int = 256, sep: str = "\n"):
+        self.stream = stream
+        self.buffer_lines = max(1, buffer_lines)
+        self.sep = sep
+        self._pending: List[str] = []
+
+    def write(self, text: str) -> None:
+        self._pending.append(text)
+        if len(self._pending) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            sep = self.sep
+            self.stream.write(sep.join(self._pending) + sep)
+            self._pending.clear()
+        self.stream.flush()
+
+
+class TkBatchSink(OutputSink):
+    """
+    Búfer para la GUI: las líneas se acumulan y se entregan en un solo
+    bloque con `controller.print_console_lines()` desde un temporizador
+    `widget.after(interval_ms)`, en vez de un insert en el Text por
+    carácter.  `flush()` entrega de inmediato (antes de mensajes propios
+    de la vista, para no alterar el orden).
+    """
+
+    def __init__(self, widget, controller, interval_ms: int = 50):
+        self.widget = widget
+        self.controller = controller
+        self.interval_ms = interval_ms
+        self._pending: List[str] = []
+        self._after_id: Optional[str] = None
+
+    def write(self, text: str) -> None:
+        self._pending.append(text)
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.interval_ms, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._after_id = None
+        self._deliver()
+
+    def _deliver(self) -> None:
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        print_lines = getattr(self.controller, "print_console_lines", None)
+        if print_lines is not None:
+            print_lines(lines)
+        else:
+            for line in lines:
+                self.controller.print_console(line)
+
+    def flush(self) -> None:
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._deliver()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PrinterUnit
+# ─────────────────────────────────────────────────────────────────────────────
 class PrinterUnit:
     """
     Encapsula TODA la salida del procesador.
-    Siempre existe un controller, por lo que imprimimos
-    vía controller.print_console() sin ‘plan B’.
+    Las líneas van a `sink` (por defecto un ConsoleSink sobre el
+    controller, igual que antes); asignar `controller` reemplaza el sink.
     """
 
-    def __init__(self, controller):
-        self.controller = controller            # referencia directa
+    def __init__(self, controller=None, sink: Optional[OutputSink] = None):
+        self._controller = controller
+        self.sink: OutputSink = sink if sink is not None else (
+            ConsoleSink(controller) if controller is not None else NullSink())
+
+    @property
+    def controller(self):
+        return self._controller
+
+    @controller.setter
+    def controller(self, controller) -> None:
+        self._controller = controller
+        self.sink = ConsoleSink(controller)
+
+    def flush(self) -> None:
+        self.sink.flush()
 
     # ----------------------------------------------------------
     # utilidades de impresión
     # ----------------------------------------------------------
     def log(self, msg: str) -> None:
-        self.controller.print_console(msg)
+        self.sink.write(msg)
 
     # —----- instrucciones PRINT* ------
     def print_integer(self, value: int):
-        self.controller.print_console(f"[INT] {value}")
+        self.sink.write(f"[INT] {value}")
 
     def print_ascii(self, value: int):
         # 8 bytes little-endian → primer ASCII imprimible
         for b in value.to_bytes(8, "little"):
             if 32 <= b <= 126:
-                self.controller.print_console(chr(b))
+                self.sink.write(chr(b))
                 return
-        self.controller.print_console(".")
+        self.sink.write(".")
 
     def print_binary(self, value: int):
-        self.controller.print_console(f"[BIN] {value:032b}")
-        
\ No newline at end of file
+        self.sink.write(f"[BIN] {value:032b}")
@@ -12,12 +12,15 @@ from ExtraPrograms.Processor.Flags import Flags
 from ExtraPrograms.Processor.ControlUnit import ControlUnit
 from ExtraPrograms.Processor.CondUnit import CondUnit
 from ExtraPrograms.Processor.Extend import BinaryZeroExtend
+from ExtraPrograms.Processor.Checkpoint import Checkpoint
+from ExtraPrograms.Processor.Trace import TRACE, INFO, DEBUG
 
 class Procesador:
-    def __init__(self, controller=None):
+    def __init__(self, controller=None, sink=None):
         """Crea todas las unidades y engancha el pipeline.
         El orden de instanciación **importa** porque varios módulos
         reciben `flags` en su constructor.
+        `sink` (ver PrinterUnit.py) reemplaza la salida directa al controller.
         """
         # ---- Estado global de banderas (ALU + seguridad) ----
         self.flags = Flags()
@@ -51,7 +54,8 @@ class Procesador:
             control_unit         = self.control_unit,
             cond_unit            = self.cond_unit,
             extend               = self.extend,
-            controller           = controller
+            controller           = controller,
+            sink                 = sink
         )
 
     # ------------------------------------------------------------------
@@ -59,27 +63,21 @@ class Procesador:
     # ------------------------------------------------------------------
     def run_all(self, max_cycles: int = 1000):
         """Avanza el *datapath* ciclo a ciclo hasta que el pipeline
-        quede vacío (o se alcance `max_cycles`).  Imprime un resumen
-        de cada ciclo para depuración rápida.
+        quede vacío (o se alcance `max_cycles`).  Con la traza en nivel
+        DEBUG se marca el inicio de cada ciclo (ver `Trace.py`).
         """
         for cycle in range(max_cycles):
-            print(f"\n===== CYCLE {cycle+1} =====")
+            if TRACE.level >= DEBUG:
+                TRACE.emit(DEBUG, "CPU", f"===== CYCLE {cycle+1} =====")
             self.pipeline.step()
 
-            if all(stage is None for stage in (
-                self.pipeline.if_id,
-                self.pipeline.id_ex,
-                self.pipeline.ex_mem,
-                self.pipeline.mem_wb,
-                self.pipeline.next_if_id,
-                self.pipeline.next_id_ex,
-                self.pipeline.next_ex_mem,
-                self.pipeline.next_mem_wb,
-            )):
-                print("Pipeline vacío. Ejecución completa.")
+            if self.pipeline.is_empty():
+                if TRACE.level >= INFO:
+                    TRACE.emit(INFO, "CPU", "Pipeline vacío. Ejecución completa.")
                 break
         else:
-            print("Límite de ciclos alcanzado sin completar ejecución.")
+            if TRACE.level >= INFO:
+                TRACE.emit(INFO, "CPU", "Límite de ciclos alcanzado sin completar ejecución.")
             
     def set_state_from_external(self, state_dict):
         """Permite cargar un estado completo desde fuente externa."""
@@ -89,4 +87,37 @@ class Procesador:
             for i, val in enumerate(state_dict['registers']):
                 if i < 16:
                     self.register_file.regs[i] = val
+        if 'safe_registers' in state_dict:
+            # w1..w9 (d0 es constante de solo-lectura)
+            for i, val in enumerate(state_dict['safe_registers']):
+                if i < 9:
+                    self.safe_register_file._regs[i] = val & 0xFFFFFFFF
+        if 'vault' in state_dict:
+            for i, val in enumerate(state_dict['vault']):
+                if i < 16:
+                    self.vault_memory._mem[i] = val & 0xFFFFFFFF
+        if 'login' in state_dict:
+            for i, val in enumerate(state_dict['login']):
+                if i < 8:
+                    self.login_memory._mem[i] = val & 0xFFFFFFFF
+        if 'data_memory' in state_dict:
+            self.data_memory.load(list(state_dict['data_memory']))
+        if 'flags' in state_dict:
+            for name, val in state_dict['flags'].items():
+                if name in ("N", "Z", "C", "V", "S1", "S2"):
+                    setattr(self.flags, name, val & 1)
+
+    # ------------------------------------------------------------------
+    # Checkpoints binarios (ver Checkpoint.py)
+    # ------------------------------------------------------------------
+    def save_checkpoint(self, path, base: "Checkpoint | None" = None) -> Checkpoint:
+        """Guarda el estado completo (o incremental respecto a `base`)."""
+        cp = Checkpoint.capture(self, base)
+        cp.save(path)
+        return cp
 
+    def load_checkpoint(self, path, base: "Checkpoint | None" = None) -> Checkpoint:
+        """Restaura un checkpoint guardado con `save_checkpoint`."""
+        cp = Checkpoint.load(path, base)
+        cp.restore(self)
+        return cp
@@ -3,8 +3,11 @@ class ProgramCounter:
         self._pc = 0              # ← usá _pc como nombre interno
         self.result_w = 0
         self.pcsrc_w = 0
+        self.undo_log = None      # lista de deshacer (TimeTravel) o None
 
     def tick(self):
+        if self.undo_log is not None:
+            self.undo_log.append((self, None, self._pc))
         if self.pcsrc_w:
             self._pc = self.result_w
         else:
@@ -13,5 +16,8 @@ class ProgramCounter:
         self.result_w = 0
         self.pcsrc_w = 0
 
+    def undo_write(self, _key, old: int):
+        self._pc = old
+
     def get_pc(self):
         return self._pc
@@ -2,6 +2,7 @@ class RegisterFile:
     def __init__(self):
         self.regs      = [0] * 16
         self._pending  = None        # ← escritura latched
+        self.undo_log  = None        # lista de deshacer (TimeTravel) o None
         # opcional: nombres simbólicos
         self.R0 = 0  # alias a regs[0] si querés un cero hard‐wired
 
@@ -20,9 +21,14 @@ class RegisterFile:
             idx, data = self._pending
             # ejemplo: mantener R0 en 0 si tu ISA lo requiere
             if idx != 0:
+                if self.undo_log is not None:
+                    self.undo_log.append((self, idx, self.regs[idx]))
                 self.regs[idx] = data
             self._pending = None          # se consume
 
+    def undo_write(self, idx: int, old: int):
+        self.regs[idx] = old
+
     # -------------- depuración opcional -----------------------
     def debug(self):
         for i in range(0, 16, 4):
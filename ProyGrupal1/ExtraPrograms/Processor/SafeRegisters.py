@@ -4,6 +4,7 @@
 from __future__ import annotations
 from typing import List, Optional
 from ExtraPrograms.Processor.Flags import Flags
+from ExtraPrograms.Processor.Trace import TRACE, WARN
 
 MASK32 = 0xFFFFFFFF
 
@@ -24,17 +25,20 @@ class SafeRegisterFile:
         self._regs: List[int] = [0] * self.NUM_REGS
         self._regs[9] = 0x9E3779B9  # d0 (DELTA TEA)
         self._pending: Optional[tuple[int, int]] = None
+        self.undo_log: Optional[list] = None            # TimeTravel
 
     def read(self, ar1: int, ar2: int) -> tuple[int, int]:
         """Lee dos registros. Retorna (0, 0) si no hay permisos de seguridad."""
         # CRÍTICO: Verificar permisos ANTES de cualquier acceso
         if self._flags.enabled() != 1:
-            print(f"[SAFE_REG] Lectura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "SAFE_REG", f"Lectura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
             return 0, 0  # Retornar ceros en lugar de valores reales
         
         # Validar índices
         if ar1 >= self.NUM_REGS or ar2 >= self.NUM_REGS:
-            print(f"[SAFE_REG] Índice fuera de rango: {ar1} o {ar2}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "SAFE_REG", f"Índice fuera de rango: {ar1} o {ar2}")
             return 0, 0
         
         # Solo si hay permisos, retornar valores reales
@@ -47,15 +51,18 @@ class SafeRegisterFile:
             
         # CRÍTICO: Verificar permisos
         if self._flags.enabled() != 1:
-            print(f"[SAFE_REG] Escritura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "SAFE_REG", f"Escritura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
             return  # No hacer nada, no latchear
         
         if ar3 >= self.NUM_REGS:
-            print(f"[SAFE_REG] Índice fuera de rango: {ar3}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "SAFE_REG", f"Índice fuera de rango: {ar3}")
             return
             
         if ar3 == 9:
-            print("[SAFE_REG] Registro d0 es de solo-lectura")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "SAFE_REG", "Registro d0 es de solo-lectura")
             return
         
         # Solo si hay permisos, latchear la escritura
@@ -65,9 +72,14 @@ class SafeRegisterFile:
         """Aplica escrituras pendientes."""
         if self._pending is not None:
             idx, data = self._pending
+            if self.undo_log is not None:
+                self.undo_log.append((self, idx, self._regs[idx]))
             self._regs[idx] = data
             self._pending = None
 
+    def undo_write(self, idx: int, old: int):
+        self._regs[idx] = old
+
     def dump(self) -> List[int]:
         return self._regs.copy()
     
\ No newline at end of file
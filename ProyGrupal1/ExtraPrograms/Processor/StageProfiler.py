@@ -0,0 +1,292 @@
+# ExtraPrograms/Processor/StageProfiler.py
+"""
+Perfilado por etapa de `Pipeline.step` con `time.perf_counter_ns`.
+
+Uno de cada `every` ciclos se ejecuta cronometrado (`profile_step`): las
+cinco etapas (writeback, mem, execute, decode, fetch), el avance de
+latches, el tick() de cada módulo de `Pipeline.CLOCKED_UNITS` y el cierre
+del ciclo.  Dentro de las etapas se miden también las llamadas a las
+unidades (ALU, CondUnit, memorias, bancos de registros, PrinterUnit):
+durante ese ciclo el atributo del pipeline se reemplaza por un proxy
+cronometrado.  Los demás ciclos sólo pagan el contador de muestreo.
+
+Los tiempos forman un árbol de pilas "step;execute;alu.execute" → ns
+(inclusivos; el tiempo propio de una etapa es el total menos sus hijos y
+absorbe el costo de los proxies).  Se exporta como JSON o en formato
+*folded* ("a;b;c ns" por línea, tiempo propio) que leen flamegraph.pl y
+speedscope.
+
+    profiler = StageProfiler(every=64).attach(cpu.pipeline)
+    ...                                     # ejecutar
+    profiler.dump("out/stage_profile.folded")
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Dict, List, Tuple
+
+ROOT = "step"
+STAGES = ("writeback", "mem", "execute", "decode", "fetch")
+_STAGE_STACKS = tuple((stage, f"{ROOT};{stage}") for stage in STAGES)
+
+# Llamadas a unidades que se cronometran dentro de cada etapa:
+# atributo del pipeline → métodos
+PROBES: Dict[str, Tuple[str, ...]] = {
+    "instruction_memory": ("read", "decoded"),
+    "register_file":      ("read", "write"),
+    "safe_register_file": ("read", "write"),
+    "vault_memory":       ("read", "write"),
+    "login_memory":       ("read", "write"),
+    "alu":                ("execute",),
+    "cond_unit":          ("generate_signals",),
+    "data_memory":        ("read", "write"),
+    "dynamic_memory":     ("read", "write"),
+    "printer_unit":       ("print_integer", "print_ascii", "print_binary"),
+}
+
+
+class _TimedUnit:
+    """Proxy de una unidad: cronometra `methods` y delega lo demás."""
+
+    def __init__(self, unit, name: str, methods, profiler: "StageProfiler"):
+        self._unit = unit
+        for method in methods:
+            setattr(self, method, self._timed(getattr(unit, method),
+                                              f"{name}.{method}", profiler))
+
+    @staticmethod
+    def _timed(fn, label: str, profiler: "StageProfiler"):
+        def wrapper(*args):
+            start = perf_counter_ns()
+            try:
+                return fn(*args)
+            finally:
+                profiler._add(f"{profiler._stage};{label}",
+                              perf_counter_ns() - start)
+        return wrapper
+
+    def __getattr__(self, name):
+        return getattr(self._unit, name)
+
+
+class StageProfiler:
+    """
+    Tiempo acumulado por sección de `Pipeline.step`, muestreado cada
+    `every` ciclos (`every=1` mide todos).  `probes=False` omite las
+    llamadas a unidades y deja sólo etapas y ticks.
+    """
+
+    DEFAULT_EVERY = 64
+
+    def __init__(self, every: int = DEFAULT_EVERY, probes: bool = True):
+        self.every = max(1, every)
+        self.probes = probes
+        self.pipeline = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.ns: Dict[str, int] = {}        # pila → ns inclusivos
+        self.cycles = 0                     # ciclos vistos (muestreados o no)
+        self.sampled = 0                    # ciclos cronometrados
+        self._countdown = self.every
+        self._stage = ROOT
+        self._proxies: Dict[str, _TimedUnit] = {}   # se crean en el primer muestreo
+
+    # ───────────────────────── enganche ──────────────────────────────
+    def attach(self, pipeline) -> "StageProfiler":
+        self.detach()
+        self.pipeline = pipeline
+        pipeline.profiler = self
+        return self
+
+    def detach(self) -> None:
+        if self.pipeline is not None and self.pipeline.profiler is self:
+            self.pipeline.profiler = None
+        self.pipeline = None
+
+    def sample(self) -> bool:
+        """Llamado por `Pipeline.step` en cada ciclo: ¿cronometrar éste?"""
+        self.cycles += 1
+        self._countdown -= 1
+        if self._countdown:
+            return False
+        self._countdown = self.every
+        return True
+
+    def _add(self, stack: str, ns: int) -> None:
+        self.ns[stack] = self.ns.get(stack, 0) + ns
+
+    # ───────────────────────── ciclo cronometrado ────────────────────
+    def profile_step(self, pipeline) -> None:
+        """Mismo trabajo que `Pipeline.step`, midiendo cada sección."""
+        add = self._add
+        originals = self._install_probes(pipeline) if self.probes else {}
+        try:
+            stages_start = perf_counter_ns()
+            for stage, stack in _STAGE_STACKS:
+                self._stage = stack
+                start = perf_counter_ns()
+                getattr(pipeline, stage)()
+                add(stack, perf_counter_ns() - start)
+            stages_ns = perf_counter_ns() - stages_start
+        finally:
+            self._stage = ROOT
+            for name, unit in originals.items():
+                setattr(pipeline, name, unit)
+
+        begin = perf_counter_ns()
+        pipeline.advance_latches()
+        add(f"{ROOT};latches", perf_counter_ns() - begin)
+
+        for name in pipeline.CLOCKED_UNITS:
+            unit = getattr(pipeline, name)
+            start = perf_counter_ns()
+            unit.tick()
+            add(f"{ROOT};tick;{name}", perf_counter_ns() - start)
+
+        start = perf_counter_ns()
+        pipeline.end_cycle()
+        end = perf_counter_ns()
+        add(f"{ROOT};end_cycle", end - start)
+        add(ROOT, stages_ns + end - begin)      # sin instalar/retirar proxies
+        self.sampled += 1
+
+    def _install_probes(self, pipeline) -> Dict[str, object]:
+        """Pone los proxies en el pipeline; devuelve las unidades originales."""
+        originals = {}
+        proxies = self._proxies
+        for name, methods in PROBES.items():
+            originals[name] = unit = getattr(pipeline, name)
+            proxy = proxies.get(name)
+            if proxy is None or proxy._unit is not unit:       # unidad reemplazada
+                proxy = proxies[name] = _TimedUnit(unit, name, methods, self)
+            setattr(pipeline, name, proxy)
+        return originals
+
+    # ───────────────────────── lectura ───────────────────────────────
+    def totals(self) -> Dict[str, int]:
+        """ns inclusivos por pila, con "step;tick" como suma de los ticks."""
+        totals = dict(self.ns)
+        ticks = sum(ns for stack, ns in self.ns.items()
+                    if stack.startswith(f"{ROOT};tick;"))
+        if ticks:
+            totals[f"{ROOT};tick"] = ticks
+        return totals
+
+    def self_times(self) -> Dict[str, int]:
+        """ns propios por pila (inclusivo menos hijos directos)."""
+        totals = self.totals()
+        own = dict(totals)
+        for stack, ns in totals.items():
+            parent = stack.rpartition(";")[0]
+            if parent in own:
+                own[parent] -= ns
+        return {stack: max(0, ns) for stack, ns in own.items()}
+
+    def breakdown(self) -> List[Tuple[str, int, int, float]]:
+        """
+        [(pila, ns inclusivos, ns propios, fracción de step)] en orden de
+        árbol (hijos tras su padre, de mayor a menor).
+        """
+        totals, own = self.totals(), self.self_times()
+        total = totals.get(ROOT, 0) or 1
+        children: Dict[str, List[str]] = {}
+        for stack in totals:
+            if stack != ROOT:
+                children.setdefault(stack.rpartition(";")[0], []).append(stack)
+
+        rows: List[Tuple[str, int, int, float]] = []
+
+        def visit(stack: str) -> None:
+            rows.append((stack, totals[stack], own[stack], totals[stack] / total))
+            for child in sorted(children.get(stack, ()), key=totals.get, reverse=True):
+                visit(child)
+
+        if ROOT in totals:
+            visit(ROOT)
+        return rows
+
+    def to_dict(self) -> dict:
+        sampled = self.sampled or 1
+        return {
+            "every":   self.every,
+            "cycles":  self.cycles,
+            "sampled": self.sampled,
+            "sections": {stack: {"ns": ns, "self_ns": own, "share": share,
+                                 "ns_per_cycle": ns / sampled}
+                         for stack, ns, own, share in self.breakdown()},
+        }
+
+    def to_folded(self) -> str:
+        """Formato folded: una pila por línea con su tiempo propio en ns."""
+        return "".join(f"{stack} {ns}\n" for stack, ns in self.self_times().items()
+                       if ns)
+
+    def dump(self, path) -> Path:
+        """`.folded`/`.txt` → formato folded; cualquier otro → JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix in (".folded", ".txt"):
+            path.write_text(self.to_folded(), encoding="utf-8")
+        else:
+            path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        return path
+
+    def report(self, min_share: float = 0.005) -> str:
+        """Desglose en texto (árbol indentado) para consola o la GUI."""
+        sampled = self.sampled or 1
+        lines = [f"{self.sampled} de {self.cycles} ciclos muestreados "
+                 f"(1 de cada {self.every})"]
+        for stack, ns, own, share in self.breakdown():
+            if share < min_share:
+                continue
+            depth = stack.count(";")
+            name = stack.rpartition(";")[2]
+            bar = "█" * max(1, round(share * 30))
+            lines.append(f"{'  ' * depth}{name:<{32 - 2 * depth}} "
+                         f"{ns / sampled / 1000:8.2f} µs/ciclo {share:6.1%} {bar}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"StageProfiler(every={self.every}, sampled={self.sampled})"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────────────
+def main(argv=None) -> int:
+    from ExtraPrograms.Processor.HeadlessEngine import HeadlessEngine, load_data, load_program
+
+    parser = argparse.ArgumentParser(
+        description="Perfila por etapa la ejecución ciclo a ciclo de un programa.")
+    parser.add_argument("program", help=".asm o instruction_mem.bin")
+    parser.add_argument("data", nargs="?", help="archivo para la memoria dinámica")
+    parser.add_argument("--blocks", type=int, default=None,
+                        help="usar sólo los primeros bloques de 64 bits de `data`")
+    parser.add_argument("--every", type=int, default=StageProfiler.DEFAULT_EVERY,
+                        help="medir 1 de cada N ciclos")
+    parser.add_argument("--no-probes", action="store_true",
+                        help="sólo etapas y ticks, sin llamadas a unidades")
+    parser.add_argument("--login", type=lambda t: int(t, 0), nargs=8, metavar="P",
+                        default=[1, 2, 3, 4, 5, 6, 7, 8])
+    parser.add_argument("--max-cycles", type=int,
+                        default=HeadlessEngine.DEFAULT_MAX_CYCLES)
+    parser.add_argument("--out", default="out/stage_profile.folded",
+                        help=".folded/.txt (flamegraph.pl, speedscope) o .json")
+    args = parser.parse_args(argv)
+
+    profiler = StageProfiler(args.every, probes=not args.no_probes)
+    dyn = load_data(args.data, args.blocks) if args.data else None
+    snap = HeadlessEngine(load_program(args.program), dyn, {"login": args.login},
+                          profiler=profiler).run(args.max_cycles)
+    print(profiler.report())
+    print(f"{snap.cycles} ciclos en {snap.elapsed_s:.2f} s → {profiler.dump(args.out)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
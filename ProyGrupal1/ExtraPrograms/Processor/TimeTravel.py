@@ -0,0 +1,257 @@
+# ExtraPrograms/Processor/TimeTravel.py
+"""
+Depuración con retroceso ("time travel") sobre `Pipeline`.
+
+• Cada `interval` ciclos se toma un `Checkpoint` (incremental respecto al
+  anterior; uno completo cada FULL_EVERY para acotar la cadena).
+• Entre checkpoints se guarda un registro de deshacer por ciclo: las
+  unidades con `tick()` (PC, RegisterFile, SafeRegisterFile, Vault, Login,
+  DataMemory, DynamicMemory) anotan el valor previo de lo que escriben en
+  `undo_log`, y aquí se añade el estado pequeño que cambia fuera de los
+  ticks (flags, CondUnit, autenticación, registros de etapa, contadores).
+  Los histogramas de `PerfCounters` no se copian: al deshacer un ciclo se
+  descuentan a partir de los registros de etapa previos.
+
+`step_back()` deshace el último ciclo desde el registro.  `goto(n)`
+deshace si `n` cae dentro de la ventana actual; si no, restaura el
+checkpoint más cercano anterior a `n` y re-ejecuta hasta `n` (a lo sumo
+`interval` ciclos).  Durante esa re-ejecución de ciclos ya vistos la
+salida de PRINT* se silencia; en cambio `step()` tras retroceder es
+ejecución nueva: descarta lo posterior (`truncate`) y emite la salida.
+
+Registrar cuesta ~43% del rendimiento de `Pipeline.step`, así que las
+corridas largas no se registran: entre `pause()` y `resume()` se llama a
+`pipeline.step()` directamente y sólo se toma un checkpoint cada
+`interval` ciclos con `checkpoint()`; volver a un ciclo de esa zona
+re-ejecuta desde el checkpoint más cercano.
+
+    tt = TimeTravel(cpu)
+    for _ in range(1000): tt.step()
+    tt.step_back()          # ciclo 999
+    tt.goto(10)             # checkpoint 0 + 10 ciclos
+
+    tt.pause()              # "Ejecutar Todo"
+    while ...:
+        cpu.pipeline.step()
+        if cpu.pipeline.clock_cycle % tt.interval == 0: tt.checkpoint()
+    tt.resume()
+"""
+from __future__ import annotations
+
+import bisect
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+
+from ExtraPrograms.Processor.AuthenticationUnit import AuthenticationProcess
+from ExtraPrograms.Processor.Checkpoint import Checkpoint
+from ExtraPrograms.Processor.PerfCounters import PerfCounters
+from ExtraPrograms.Processor.PrinterUnit import NullSink
+
+_LATCHES = ("if_id", "id_ex", "ex_mem", "mem_wb")
+_AUTH_FIELDS = ("try_counter", "block_states", "S1", "S2",
+                "lockout_start", "session_start")
+_FLAG_FIELDS = ("N", "Z", "C", "V", "S1", "S2")
+_COND_FIELDS = ("CondExE", "SafeFlagsOut", "Flags")
+_PIPE_FIELDS = ("clock_cycle", "instructions_completed", "halt_requested")
+_PERF_FIELDS = PerfCounters.SCALARS
+_SILENT = NullSink()                    # salida durante la re-ejecución
+
+
+class TimeTravel:
+    DEFAULT_INTERVAL = 10_000
+    FULL_EVERY       = 16
+
+    def __init__(self, cpu, interval: int = DEFAULT_INTERVAL):
+        self.cpu = cpu
+        self.pipeline = cpu.pipeline
+        self.interval = max(1, interval)
+        self._auth = AuthenticationProcess()
+
+        # lectores precompilados del estado pequeño (uno por objeto)
+        p = self.pipeline
+        self._getters = (
+            (p, attrgetter(*_PIPE_FIELDS)),
+            (cpu.flags, attrgetter(*_FLAG_FIELDS)),
+            (cpu.cond_unit, attrgetter(*_COND_FIELDS)),
+            (self._auth, attrgetter(*_AUTH_FIELDS)),
+            (p.counters, attrgetter(*_PERF_FIELDS)),
+        )
+        self._latch_getters = tuple(
+            attrgetter(*getattr(p, name).__slots__) for name in _LATCHES)
+
+        # registro de deshacer compartido por todas las unidades
+        self._log: List[tuple] = []
+        # por ciclo: (estado pequeño previo, len(_log) al empezar el ciclo)
+        self._marks: List[Tuple[tuple, int]] = []
+        self._units = (cpu.pc, cpu.register_file, cpu.safe_register_file,
+                       cpu.vault_memory, cpu.login_memory,
+                       cpu.data_memory, cpu.dynamic_memory)
+        for unit in self._units:
+            unit.undo_log = self._log
+
+        self._checkpoints: Dict[int, Checkpoint] = {}
+        self._cycles: List[int] = []               # ciclos con checkpoint (ordenados)
+        self.horizon = self.cycle                  # ciclo más lejano ejecutado
+        self._take_checkpoint()
+
+    # ───────────────────────── estado ────────────────────────────────
+    @property
+    def cycle(self) -> int:
+        return self.pipeline.clock_cycle
+
+    @property
+    def window_start(self) -> int:
+        """Primer ciclo alcanzable sólo con el registro de deshacer."""
+        return self.cycle - len(self._marks)
+
+    @property
+    def checkpoints(self) -> List[int]:
+        return list(self._cycles)
+
+    def detach(self) -> None:
+        """Desengancha el registro de las unidades."""
+        for unit in self._units:
+            unit.undo_log = None
+
+    def pause(self) -> None:
+        """
+        Deja de registrar para ejecutar con `pipeline.step()` a velocidad
+        completa.  El ciclo actual queda como checkpoint y lo registrado
+        después de él se descarta.
+        """
+        self.truncate()
+        self.detach()
+
+    def resume(self) -> None:
+        """Vuelve a registrar desde el ciclo actual (tras `pause()`)."""
+        for unit in self._units:
+            unit.undo_log = self._log
+        self._log.clear()
+        self._marks.clear()
+        self.horizon = self.cycle
+        self._take_checkpoint()
+
+    def checkpoint(self) -> None:
+        """Checkpoint del ciclo actual (en pausa, para acotar `goto`)."""
+        self._take_checkpoint()
+
+    def _core_state(self) -> tuple:
+        p = self.pipeline
+        g0, g1, g2, g3 = self._latch_getters
+        return (tuple(get(obj) for obj, get in self._getters),
+                (g0(p.if_id), g1(p.id_ex), g2(p.ex_mem), g3(p.mem_wb)))
+
+    def _load_core(self, state: tuple) -> None:
+        p = self.pipeline
+        objects, latches = state
+        for (obj, _), fields, values in zip(
+                self._getters,
+                (_PIPE_FIELDS, _FLAG_FIELDS, _COND_FIELDS, _AUTH_FIELDS, _PERF_FIELDS),
+                objects):
+            for name, value in zip(fields, values):
+                setattr(obj, name, value)
+        for name, values in zip(_LATCHES, latches):
+            latch = getattr(p, name)
+            for slot, value in zip(latch.__slots__, values):
+                setattr(latch, slot, value)
+        for name in ("next_if_id", "next_id_ex", "next_ex_mem", "next_mem_wb"):
+            getattr(p, name).valid = False
+
+    def _take_checkpoint(self) -> None:
+        cycle = self.cycle
+        if cycle in self._checkpoints:
+            return
+        i = bisect.bisect_left(self._cycles, cycle)
+        base = None
+        if i and i % self.FULL_EVERY and i == len(self._cycles):
+            base = self._checkpoints[self._cycles[i - 1]]
+        self._checkpoints[cycle] = Checkpoint.capture(self.cpu, base)
+        self._cycles.insert(i, cycle)
+
+    # ───────────────────────── avance ────────────────────────────────
+    def step(self) -> None:
+        """
+        Un ciclo de `Pipeline.step` registrando cómo deshacerlo.  Es
+        ejecución nueva: si se había retrocedido, lo registrado después
+        del ciclo actual se descarta (`truncate`) y la salida se emite.
+        """
+        if self.cycle < self.horizon:
+            self.truncate()
+        self._record()
+
+    def _record(self, silent: bool = False) -> None:
+        self._marks.append((self._core_state(), len(self._log)))
+        if silent:
+            printer = self.pipeline.printer_unit
+            sink, printer.sink = printer.sink, _SILENT
+            try:
+                self.pipeline.step()
+            finally:
+                printer.sink = sink
+        else:
+            self.pipeline.step()
+        if self.cycle > self.horizon:
+            self.horizon = self.cycle
+
+        if self.cycle % self.interval == 0:
+            self._take_checkpoint()
+            self._log.clear()
+            self._marks.clear()
+
+    def run(self, cycles: int) -> None:
+        for _ in range(cycles):
+            self.step()
+
+    # ───────────────────────── retroceso ─────────────────────────────
+    def step_back(self, cycles: int = 1) -> int:
+        """Retrocede `cycles` ciclos; devuelve el ciclo alcanzado."""
+        return self.goto(self.cycle - cycles)
+
+    def _undo_one(self) -> None:
+        state, start = self._marks.pop()
+        log = self._log
+        for i in range(len(log) - 1, start - 1, -1):
+            unit, key, old = log[i]
+            unit.undo_write(key, old)
+        del log[start:]
+        self._load_core(state)
+        self.pipeline.counters.uncount_cycle(self.pipeline)
+
+    def goto(self, target: int) -> int:
+        """Lleva el procesador al ciclo `target` (hacia atrás o adelante)."""
+        target = max(target, self._cycles[0])
+        if target < self.window_start:
+            i = bisect.bisect_right(self._cycles, target) - 1
+            self._checkpoints[self._cycles[i]].restore(self.cpu)
+            self._log.clear()
+            self._marks.clear()
+        while self.cycle > target:
+            self._undo_one()
+        # re-ejecución: los ciclos ya vistos no vuelven a imprimir
+        while self.cycle < target:
+            self._record(silent=self.cycle < self.horizon)
+        return self.cycle
+
+    def truncate(self) -> None:
+        """
+        Descarta lo registrado después del ciclo actual (checkpoints y
+        horizonte); llamar si el estado se editó fuera del pipeline.
+        """
+        cycle = self.cycle
+        for c in self._cycles[bisect.bisect_right(self._cycles, cycle):]:
+            del self._checkpoints[c]
+        self._cycles = self._cycles[:bisect.bisect_right(self._cycles, cycle)]
+        self.horizon = cycle
+        self._log.clear()
+        self._marks.clear()
+        self._take_checkpoint()
+
+    def fetch_history(self, n: int) -> List[Optional[int]]:
+        """
+        Direcciones buscadas en los últimos `n` ciclos (la más reciente
+        primero; None si quedan fuera de la ventana).  Sirve para nombrar
+        las etapas del pipeline en la vista.
+        """
+        pcs = [e[2] for e in self._log if e[0] is self.cpu.pc]
+        recent = pcs[::-1][:n]
+        return recent + [None] * (n - len(recent))
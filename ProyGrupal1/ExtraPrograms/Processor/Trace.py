@@ -0,0 +1,102 @@
+# ExtraPrograms/Processor/Trace.py
+"""
+Capa de trazas compartida por todas las unidades del procesador.
+
+• Silenciosa por defecto (nivel OFF): cada punto de traza se protege con
+
+      if TRACE.level >= WARN:
+          TRACE.emit(WARN, "VAULT", f"...")
+
+  de modo que, deshabilitada, sólo cuesta una comparación de enteros y el
+  mensaje ni siquiera se formatea.
+• `echo=True` imprime en consola con el formato histórico
+  (`[UNIDAD] mensaje`).
+• Buffer circular opcional con los últimos N eventos para análisis
+  post-mortem (`enable_ring(n)` / `TRACE.events()`).
+
+El nivel inicial puede fijarse con la variable de entorno PROC_TRACE
+(off, error, warn, info, debug).
+"""
+from __future__ import annotations
+
+import os
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+# ─────────────────────────────────────────────
+# Niveles
+# ─────────────────────────────────────────────
+OFF   = 0
+ERROR = 1
+WARN  = 2
+INFO  = 3
+DEBUG = 4
+
+LEVEL_NAMES = {OFF: "OFF", ERROR: "ERROR", WARN: "WARN", INFO: "INFO", DEBUG: "DEBUG"}
+_BY_NAME = {name.lower(): lvl for lvl, name in LEVEL_NAMES.items()}
+
+TraceEvent = Tuple[int, int, str, str]      # (ciclo, nivel, unidad, mensaje)
+
+
+class Tracer:
+    """Colector de eventos con filtro por nivel y sumideros opcionales."""
+
+    __slots__ = ("level", "echo", "cycle", "_ring")
+
+    def __init__(self, level: int = OFF, echo: bool = True):
+        self.level: int = level
+        self.echo: bool = echo
+        self.cycle: int = 0                 # lo actualiza Pipeline.step
+        self._ring: Optional[Deque[TraceEvent]] = None
+
+    # ─────────────────── configuración ───────────────────
+    def set_level(self, level) -> None:
+        """Acepta un entero (OFF..DEBUG) o su nombre ('warn', 'debug'…)."""
+        if isinstance(level, str):
+            try:
+                level = _BY_NAME[level.strip().lower()]
+            except KeyError:
+                raise ValueError(f"Nivel de traza desconocido: {level!r}")
+        self.level = max(OFF, min(DEBUG, int(level)))
+
+    def enable_ring(self, size: int = 1024) -> None:
+        """Conserva los últimos `size` eventos (reemplaza al buffer previo)."""
+        if size <= 0:
+            raise ValueError("El tamaño del buffer debe ser positivo.")
+        self._ring = deque(maxlen=size)
+
+    def disable_ring(self) -> None:
+        self._ring = None
+
+    # ─────────────────── emisión ─────────────────────────
+    def emit(self, level: int, unit: str, msg: str) -> None:
+        """Registra un evento; los llamadores ya filtraron por nivel."""
+        if level > self.level:
+            return
+        if self._ring is not None:
+            self._ring.append((self.cycle, level, unit, msg))
+        if self.echo:
+            print(f"[{unit}] {msg}")
+
+    # ─────────────────── post-mortem ─────────────────────
+    def events(self) -> List[TraceEvent]:
+        return list(self._ring) if self._ring is not None else []
+
+    def clear(self) -> None:
+        if self._ring is not None:
+            self._ring.clear()
+
+    def format_events(self) -> str:
+        return "\n".join(f"{cyc:>8} {LEVEL_NAMES[lvl]:<5} [{unit}] {msg}"
+                         for cyc, lvl, unit, msg in self.events())
+
+
+# Instancia compartida por todas las unidades
+TRACE = Tracer()
+
+_env_level = os.environ.get("PROC_TRACE")
+if _env_level:
+    try:
+        TRACE.set_level(_env_level)
+    except ValueError:
+        pass
@@ -3,6 +3,7 @@
 # ═══════════════════════════════════════════════════════════════════════════
 from typing import List, Optional
 from ExtraPrograms.Processor.Flags import Flags
+from ExtraPrograms.Processor.Trace import TRACE, WARN, DEBUG
 
 BLOCK_BITS  = 32
 NUM_BLOCKS  = 16
@@ -19,17 +20,20 @@ class VaultMemory:
         self._flags = flags
         self._mem: List[int] = [0] * NUM_BLOCKS
         self._pending: Optional[tuple[int, int]] = None
+        self.undo_log: Optional[list] = None            # TimeTravel
 
     def read(self, k: int) -> int:
         """Lee bloque k. Retorna 0 si no hay permisos."""
         # CRÍTICO: Verificar permisos
         if self._flags.enabled() != 1:
-            print(f"[VAULT] Lectura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "VAULT", f"Lectura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
             return 0  # Retornar 0 en lugar de lanzar excepción
         
         idx = k & 0xF
         if idx >= NUM_BLOCKS:
-            print(f"[VAULT] Dirección fuera de rango: {idx}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "VAULT", f"Dirección fuera de rango: {idx}")
             return 0
             
         return self._mem[idx]
@@ -38,25 +42,34 @@ class VaultMemory:
         if not we:
             return
         if self._flags.enabled() != 1:
-            print(f"[VAULT] Escritura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "VAULT", f"Escritura BLOQUEADA: S1={self._flags.S1}, S2={self._flags.S2}")
             return
         idx = k & 0xF
         if idx >= NUM_BLOCKS:
-            print(f"[VAULT] Dirección fuera de rango: {idx}")
+            if TRACE.level >= WARN:
+                TRACE.emit(WARN, "VAULT", f"Dirección fuera de rango: {idx}")
             return
 
         self._pending = (idx, data & BLOCK_MASK)
         # ─── NUEVO LOG ─────────────────────────────────────────────
-        print(f"[VAULT] ★ escritura latcheada K{idx} <- 0x{data & BLOCK_MASK:08X}")
+        if TRACE.level >= DEBUG:
+            TRACE.emit(DEBUG, "VAULT", f"★ escritura latcheada K{idx} <- 0x{data & BLOCK_MASK:08X}")
 
     def tick(self):
         if self._pending is not None:
             idx, data = self._pending
+            if self.undo_log is not None:
+                self.undo_log.append((self, idx, self._mem[idx]))
             self._mem[idx] = data
             # ─── CONFIRMACIÓN AL APLICAR EL RELOJ ─────────────────
-            print(f"[VAULT] ✔ K{idx} <= 0x{data:08X} (commit)")
+            if TRACE.level >= DEBUG:
+                TRACE.emit(DEBUG, "VAULT", f"✔ K{idx} <= 0x{data:08X} (commit)")
             self._pending = None
 
+    def undo_write(self, idx: int, old: int):
+        self._mem[idx] = old
+
     def dump(self) -> List[int]:
         return self._mem.copy()
     
\ No newline at end of file
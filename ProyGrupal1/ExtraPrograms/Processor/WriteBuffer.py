@@ -0,0 +1,52 @@
+# ExtraPrograms/Processor/WriteBuffer.py
+from __future__ import annotations
+from typing import Iterator, List, Tuple
+
+
+class WriteBuffer:
+    """
+    Buffer de escritura de tamaño fijo para memorias latcheadas.
+
+    • Cada entrada es (dirección_en_bytes, bytes) y se aplica en orden en
+      `commit()` (flanco de reloj), de modo que escrituras solapadas en el
+      mismo ciclo se resuelven igual que antes (la última gana por byte).
+    • Los slots se preasignan; la etapa MEM produce a lo sumo una escritura
+      por memoria y por ciclo, así que `capacity` pequeño alcanza.
+    """
+
+    __slots__ = ("capacity", "_addr", "_data", "_count")
+
+    def __init__(self, capacity: int = 4):
+        self.capacity = capacity
+        self._addr: List[int] = [0] * capacity
+        self._data: List[bytes] = [b""] * capacity
+        self._count = 0
+
+    def push(self, addr: int, data: bytes) -> None:
+        n = self._count
+        if n == self.capacity:
+            raise OverflowError("Buffer de escritura lleno: falta un tick()")
+        self._addr[n] = addr
+        self._data[n] = data
+        self._count = n + 1
+
+    def commit(self, target) -> None:
+        """Vuelca las entradas sobre `target` (bytearray / mmap) y se vacía."""
+        for i in range(self._count):
+            a = self._addr[i]
+            d = self._data[i]
+            target[a:a + len(d)] = d
+        self._count = 0
+
+    def clear(self) -> None:
+        self._count = 0
+
+    def entries(self) -> Iterator[Tuple[int, bytes]]:
+        for i in range(self._count):
+            yield self._addr[i], self._data[i]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
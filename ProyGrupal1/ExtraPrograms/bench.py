@@ -0,0 +1,433 @@
+"""
+bench.py - Banco de pruebas de rendimiento del simulador
+
+Compila (con `compile_text_to_binary`) y ejecuta en `Procesador` un
+conjunto fijo de cargas de trabajo reproducibles:
+
+    simple      Cifrado_total.asm sobre Test/Simple.txt
+    cifrado     Cifrado_total.asm sobre Test/cifrado (primeros bloques)
+    descifrado  Decifrado_total.asm sobre Test/descrifrado (primeros bloques)
+    alu         núcleo sintético de operaciones aritméticas/lógicas
+    memoria     núcleo sintético de LDR/STR sobre la memoria general
+    saltos      núcleo sintético de saltos tomados
+
+Cada carga corre en un proceso nuevo (así el pico de RSS es el suyo) y se
+repite `--repeat` veces; se reporta la mejor: ciclos/s, µs por ciclo y pico
+de RSS.  Los resultados se guardan como JSON y se pueden comparar contra una
+línea base guardada con umbrales de regresión configurables: por
+argumento, o en la clave "thresholds" del JSON de la línea base (global o
+por carga en "thresholds" → "workloads" → nombre).
+
+    python -m ExtraPrograms.bench --save-baseline out/bench_baseline.json
+    python -m ExtraPrograms.bench --baseline out/bench_baseline.json --max-slowdown 0.15
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+try:
+    import resource                     # no existe en Windows
+except ImportError:                     # pragma: no cover
+    resource = None
+
+from ExtraPrograms.ISA.compile_service import compile_text_to_binary
+from ExtraPrograms.Processor.HeadlessEngine import HeadlessEngine
+from ExtraPrograms.run_history import simulator_version
+
+ROOT     = Path(__file__).resolve().parents[1]          # ProyGrupal1/
+EXAMPLES = ROOT / "Ejemplos"
+TEST_DIR = ROOT.parent / "Test"
+
+RESULTS_FILE  = Path("out") / "bench_results.json"
+BASELINE_FILE = Path("out") / "bench_baseline.json"
+
+# P1..P8 de la hoja por defecto (los programas de ejemplo hacen login con 1..8)
+DEFAULT_STATE = {"login": [1, 2, 3, 4, 5, 6, 7, 8]}
+
+# Umbrales por defecto: caída máxima de ciclos/s y crecimiento máximo del RSS
+DEFAULT_THRESHOLDS = {"max_slowdown": 0.10, "max_rss_growth": 0.25}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Núcleos sintéticos
+# ─────────────────────────────────────────────────────────────────────────────
+# Igual que los ejemplos: un resultado es visible 4 instrucciones después y
+# todo salto tiene 4 ranuras de retardo.  SUBI va justo antes de BNE porque
+# las operaciones aritméticas también actualizan las banderas.
+_NOPS = "\tNOP\n" * 4
+_HALT = "SWI\nNOP\nNOP\nNOP\nNOP\n"
+
+
+def alu_kernel(iterations: int) -> str:
+    """Operaciones de ALU independientes (cada registro se relee ≥4 después)."""
+    return (f"MOVI R1, #{iterations}\n"
+            "MOVI R2, #1\nMOVI R3, #3\nMOVI R4, #5\nMOVI R5, #7\n"
+            "MOVI R6, #11\nMOVI R7, #13\nMOVI R8, #17\nMOVI R9, #19\n"
+            + _NOPS +
+            ".Lalu:\n"
+            "\tADD R2, R2, R3\n"
+            "\tEOR R3, R3, R4\n"
+            "\tLSLI R4, R4, #1\n"
+            "\tORR R5, R5, R2\n"
+            "\tMUL R6, R6, R3\n"
+            "\tSUB R7, R7, R5\n"
+            "\tRORI R8, R8, #3\n"
+            "\tADDI R9, R9, #7\n"
+            "\tSUBI R1, R1, #1\n"
+            "\tBNE .Lalu\n"
+            "\tAND R10, R2, R3\n"
+            "\tBIC R11, R4, R5\n"
+            "\tASRI R12, R6, #2\n"
+            "\tEOR R13, R7, R8\n"
+            + _HALT)
+
+
+def memory_kernel(iterations: int) -> str:
+    """Cargas y almacenamientos en la memoria general G."""
+    return (f"MOVI R1, #{iterations}\n"
+            "MOVI R2, #0x1234\n"
+            + _NOPS +
+            ".Lmem:\n"
+            "\tSTR R2, G[R0, #0]\n"
+            "\tSTR R2, G[R0, #8]\n"
+            "\tLDR R3, G[R0, #16]\n"
+            "\tLDR R4, G[R0, #24]\n"
+            "\tSTR R3, G[R0, #32]\n"
+            "\tLDR R5, G[R0, #40]\n"
+            "\tADDI R2, R2, #1\n"
+            "\tSUBI R1, R1, #1\n"
+            "\tBNE .Lmem\n"
+            "\tLDR R6, G[R0, #0]\n"
+            "\tSTR R4, G[R0, #48]\n"
+            "\tLDR R7, G[R0, #56]\n"
+            "\tSTR R5, G[R0, #64]\n"
+            + _HALT)
+
+
+def branch_kernel(iterations: int) -> str:
+    """Dos saltos tomados por iteración (incondicional + BNE de vuelta)."""
+    return (f"MOVI R1, #{iterations}\n"
+            + _NOPS +
+            ".Lbr:\n"
+            "\tB .Lnext\n"
+            + _NOPS +
+            ".Lnext:\n"
+            "\tSUBI R1, R1, #1\n"
+            "\tBNE .Lbr\n"
+            + _NOPS + _HALT)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cargas de trabajo
+# ─────────────────────────────────────────────────────────────────────────────
+class Workload:
+    """
+    Un programa y su entrada.  `program` es un .asm o una función
+    iteraciones → texto ASM; `data` un archivo para la memoria dinámica
+    (alineado a 64 bits y recortado a `blocks` bloques).  `scale`
+    multiplica `iterations` y `blocks`.
+    """
+
+    __slots__ = ("name", "description", "program", "data", "blocks",
+                 "iterations")
+
+    def __init__(self, name: str, description: str,
+                 program: Union[Path, Callable[[int], str]],
+                 data: Optional[Path] = None, blocks: Optional[int] = None,
+                 iterations: int = 0):
+        self.name        = name
+        self.description = description
+        self.program     = program
+        self.data        = data
+        self.blocks      = blocks
+        self.iterations  = iterations
+
+    def asm_text(self, scale: float = 1.0) -> str:
+        if callable(self.program):
+            return self.program(max(1, round(self.iterations * scale)))
+        return Path(self.program).read_text()
+
+    def dynamic_mem(self, scale: float = 1.0) -> bytes:
+        if self.data is None:
+            return b""
+        data = Path(self.data).read_bytes()
+        data += b"\x00" * (-len(data) % 8)
+        if self.blocks is None:
+            return data
+        return data[:max(1, round(self.blocks * scale)) * 8]
+
+    def compile(self, scale: float = 1.0) -> bytes:
+        """instruction_mem.bin (se compila en un directorio temporal)."""
+        with tempfile.TemporaryDirectory() as tmp:
+            binary = compile_text_to_binary(self.asm_text(scale), base_dir=tmp)
+        if binary is None:
+            raise ValueError(f"No se pudo compilar la carga {self.name!r}")
+        return binary
+
+    def __repr__(self) -> str:
+        return f"Workload({self.name!r})"
+
+
+WORKLOADS: Dict[str, Workload] = {w.name: w for w in (
+    Workload("simple", "Cifrado_total.asm sobre Test/Simple.txt",
+             EXAMPLES / "Cifrado_total.asm", TEST_DIR / "Simple.txt"),
+    Workload("cifrado", "Cifrado_total.asm, 64 bloques de Test/cifrado",
+             EXAMPLES / "Cifrado_total.asm",
+             TEST_DIR / "cifrado" / "jorge_luis.txt", blocks=64),
+    Workload("descifrado", "Decifrado_total.asm, 64 bloques de Test/descrifrado",
+             EXAMPLES / "Decifrado_total.asm",
+             TEST_DIR / "descrifrado" / "encrypted_image.png", blocks=64),
+    Workload("alu", "núcleo ALU, 14 instrucciones por iteración",
+             alu_kernel, iterations=10_000),
+    Workload("memoria", "núcleo LDR/STR sobre G, 13 instrucciones por iteración",
+             memory_kernel, iterations=10_000),
+    Workload("saltos", "núcleo de saltos, 2 tomados cada 11 instrucciones",
+             branch_kernel, iterations=10_000),
+)}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Medición
+# ─────────────────────────────────────────────────────────────────────────────
+def peak_rss_kb() -> Optional[int]:
+    """Pico de memoria residente del proceso actual en KiB (None sin `resource`)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak   # macOS: bytes
+
+
+def measure(name: str, engine: str = "pipeline", repeat: int = 3,
+            scale: float = 1.0,
+            max_cycles: int = HeadlessEngine.DEFAULT_MAX_CYCLES) -> dict:
+    """
+    Compila y ejecuta una carga `repeat` veces; devuelve la mejor corrida.
+    `checksum` (MD5 de registros, memoria general y dinámica finales y la
+    salida) permite detectar que la carga cambió de comportamiento.
+    """
+    workload = WORKLOADS[name]
+    start = time.perf_counter()
+    program = workload.compile(scale)
+    compile_s = time.perf_counter() - start
+    dynamic = workload.dynamic_mem(scale)
+
+    best, cycles, checksum, halted = None, None, None, False
+    for _ in range(max(1, repeat)):
+        snap = HeadlessEngine(program, dynamic, DEFAULT_STATE,
+                              engine=engine).run(max_cycles)
+        digest = hashlib.md5(repr((snap.registers, snap.safe_registers,
+                                   snap.data_memory, snap.output)).encode())
+        digest.update(snap.dynamic_bytes())
+        if cycles is not None and (snap.cycles, digest.hexdigest()) != (cycles, checksum):
+            raise RuntimeError(f"{name}: resultado distinto entre repeticiones")
+        cycles, checksum, halted = snap.cycles, digest.hexdigest(), snap.halted
+        best = snap.elapsed_s if best is None else min(best, snap.elapsed_s)
+
+    return {
+        "workload":      name,
+        "engine":        engine,
+        "program_size":  len(program) // 8,
+        "data_bytes":    len(dynamic),
+        "cycles":        cycles,
+        "halted":        halted,
+        "checksum":      checksum,
+        "compile_s":     compile_s,
+        "wall_s":        best,
+        "cycles_per_s":  cycles / best if best else 0.0,
+        "us_per_cycle":  best * 1e6 / cycles if cycles else 0.0,
+        "peak_rss_kb":   peak_rss_kb(),
+    }
+
+
+def run_suite(names: List[str], engine: str = "pipeline", repeat: int = 3,
+              scale: float = 1.0, isolate: bool = True,
+              progress: Optional[Callable[[dict], None]] = None) -> dict:
+    """
+    Mide cada carga; con `isolate` cada una corre en un proceso "spawn"
+    nuevo para que el pico de RSS no arrastre el de las anteriores.
+    """
+    results = {}
+    for name in names:
+        if isolate:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(measure, name, engine, repeat, scale).result()
+        else:
+            result = measure(name, engine, repeat, scale)
+        results[name] = result
+        if progress is not None:
+            progress(result)
+    return {
+        "version":   simulator_version(ROOT),
+        "timestamp": time.time(),
+        "engine":    engine,
+        "repeat":    repeat,
+        "scale":     scale,
+        "isolated":  isolate,
+        "python":    platform.python_version(),
+        "platform":  platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "workloads": results,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Comparación con la línea base
+# ─────────────────────────────────────────────────────────────────────────────
+def thresholds_for(name: str, thresholds: dict) -> dict:
+    """Umbrales globales con los de `thresholds["workloads"][name]` encima."""
+    limits = {k: v for k, v in thresholds.items() if k != "workloads"}
+    limits.update(thresholds.get("workloads", {}).get(name, {}))
+    return limits
+
+
+def compare(current: dict, baseline: dict, thresholds: dict) -> List[dict]:
+    """
+    Una fila por (carga, métrica) comparable.  `ok` es False si:
+      • los ciclos o el checksum cambiaron (la carga ya no es la misma),
+      • ciclos/s cayó más de `max_slowdown` (fracción),
+      • el pico de RSS creció más de `max_rss_growth` (fracción).
+    """
+    rows = []
+    for name, cur in current["workloads"].items():
+        base = baseline.get("workloads", {}).get(name)
+        if base is None:
+            continue
+        limits = thresholds_for(name, thresholds)
+        for metric in ("cycles", "checksum"):
+            rows.append({"workload": name, "metric": metric,
+                         "baseline": base.get(metric), "current": cur[metric],
+                         "change": None, "ok": base.get(metric) == cur[metric]})
+
+        speed = base.get("cycles_per_s") or 0.0
+        if speed:
+            change = cur["cycles_per_s"] / speed - 1.0
+            rows.append({"workload": name, "metric": "cycles_per_s",
+                         "baseline": speed, "current": cur["cycles_per_s"],
+                         "change": change,
+                         "ok": change >= -limits["max_slowdown"]})
+
+        rss = base.get("peak_rss_kb")
+        if rss and cur["peak_rss_kb"]:
+            change = cur["peak_rss_kb"] / rss - 1.0
+            rows.append({"workload": name, "metric": "peak_rss_kb",
+                         "baseline": rss, "current": cur["peak_rss_kb"],
+                         "change": change,
+                         "ok": change <= limits["max_rss_growth"]})
+    return rows
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────────────
+def _format_result(r: dict) -> str:
+    rss = f"{r['peak_rss_kb'] / 1024:7.1f} MiB" if r["peak_rss_kb"] else "      ? MiB"
+    state = "" if r["halted"] else "  [SIN SWI]"
+    return (f"{r['workload']:<11} {r['cycles']:>10} ciclos  "
+            f"{r['cycles_per_s']:>12,.0f} ciclos/s  "
+            f"{r['us_per_cycle']:>8.2f} µs/ciclo  {rss}{state}")
+
+
+def _format_row(row: dict) -> str:
+    change = f"{row['change']:+.1%}" if row["change"] is not None else ""
+    if isinstance(row["current"], float):
+        values = f"{row['baseline']:,.0f} → {row['current']:,.0f}"
+    else:
+        values = f"{row['baseline']} → {row['current']}"
+    return (f"[{'OK' if row['ok'] else 'REGRESIÓN'}] {row['workload']:<11} "
+            f"{row['metric']:<13} {values} {change}")
+
+
+def _write_json(path, data: dict) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    print(f"Resultados guardados en {path}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Mide el rendimiento del simulador con cargas fijas.")
+    parser.add_argument("workloads", nargs="*",
+                        help="cargas a medir (por defecto todas; ver --list)")
+    parser.add_argument("--engine", choices=HeadlessEngine.ENGINES,
+                        default="pipeline")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="repeticiones por carga (se reporta la mejor)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiplica iteraciones y bloques de cada carga")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="medir en este proceso (el RSS se acumula)")
+    parser.add_argument("--out", default=str(RESULTS_FILE),
+                        help="JSON de resultados")
+    parser.add_argument("--save-baseline", nargs="?", const=str(BASELINE_FILE),
+                        help="guardar también los resultados como línea base")
+    parser.add_argument("--baseline", help="JSON de línea base para comparar")
+    parser.add_argument("--max-slowdown", type=float, default=None,
+                        help="caída máxima de ciclos/s (fracción, por defecto "
+                             f"{DEFAULT_THRESHOLDS['max_slowdown']})")
+    parser.add_argument("--max-rss-growth", type=float, default=None,
+                        help="crecimiento máximo del pico de RSS (fracción, "
+                             f"por defecto {DEFAULT_THRESHOLDS['max_rss_growth']})")
+    parser.add_argument("--list", action="store_true",
+                        help="mostrar las cargas disponibles y salir")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for w in WORKLOADS.values():
+            print(f"{w.name:<11} {w.description}")
+        return 0
+
+    names = args.workloads or list(WORKLOADS)
+    unknown = [n for n in names if n not in WORKLOADS]
+    if unknown:
+        parser.error(f"cargas desconocidas: {', '.join(unknown)}")
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            parser.error(f"no se pudo leer la línea base: {exc}")
+    print(f"Motor {args.engine}, {args.repeat} repeticiones, escala {args.scale}")
+    report = run_suite(names, args.engine, args.repeat, args.scale,
+                       not args.no_isolate,
+                       progress=lambda r: print(_format_result(r), flush=True))
+
+    # umbrales: argumentos > "thresholds" del archivo de línea base > defecto
+    cli_thresholds = {k: getattr(args, k) for k in DEFAULT_THRESHOLDS
+                      if getattr(args, k) is not None}
+    failed = any(not r["halted"] for r in report["workloads"].values())
+    if baseline is not None:
+        if baseline.get("engine") != report["engine"]:
+            print(f"[AVISO] la línea base es del motor {baseline.get('engine')!r}")
+        thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {}),
+                      **cli_thresholds}
+        print(f"Comparación con {args.baseline} (versión {baseline.get('version')}):")
+        rows = compare(report, baseline, thresholds)
+        for row in rows:
+            print(_format_row(row))
+        failed |= any(not row["ok"] for row in rows)
+        report["comparison"] = {"baseline": args.baseline,
+                                "thresholds": thresholds, "rows": rows}
+
+    _write_json(args.out, report)
+    if args.save_baseline:
+        baseline = {k: v for k, v in report.items() if k != "comparison"}
+        baseline["thresholds"] = {**DEFAULT_THRESHOLDS, **cli_thresholds}
+        _write_json(args.save_baseline, baseline)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
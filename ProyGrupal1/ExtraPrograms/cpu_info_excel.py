@@ -1,23 +1,131 @@
 import os
 import sys
+from array import array
 from pathlib import Path
+from typing import List, Sequence
 
 # Añadir el directorio actual al path para imports relativos
 current_dir = Path(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, str(current_dir))
 
-from ExtraPrograms.table_control import DataType, TableControl
+from ExtraPrograms.table_control import DataType
+from ExtraPrograms.state_store import MemoryStateStore, get_default_store
 
 class CPUInfoExcel:
-    """Clase para manejar la lectura y escritura de señales del CPU en Excel"""
-    
-    def __init__(self):
-        self.table = TableControl()
+    """
+    Clase para manejar la lectura y escritura de señales del CPU.
+    El medio de almacenamiento es un *state store* (ver state_store.py):
+    en memoria por defecto, o el libro Excel si CPU_STATE_BACKEND=excel.
+    """
+    
+    def __init__(self, store=None):
+        self.table = store if store is not None else get_default_store()
         # Diccionario para caché de memoria - más eficiente que métodos individuales
         self._memory_cache = {}
         self._memory_base_row = 1  # Fila inicial para bloques de memoria
         self._memory_base_col = 29  # Columna para bloques de memoria
     
+    #=================================================================================
+    # Importación / exportación a Excel (opcional)
+    #=================================================================================
+    def load_from_excel(self) -> bool:
+        """
+        Si el store es en memoria, lo inicializa con el contenido de
+        table_data.xlsx.  Retorna False si openpyxl o el archivo no están.
+        """
+        if not isinstance(self.table, MemoryStateStore):
+            return False
+        try:
+            self.table.import_excel()
+            return True
+        except (ImportError, OSError) as e:
+            print(f"⚠ Estado inicial sin Excel: {e}")
+            return False
+
+    def save_to_excel(self) -> bool:
+        """Vuelca el estado actual a table_data.xlsx (un único guardado)."""
+        try:
+            if isinstance(self.table, MemoryStateStore):
+                self.table.export_excel()
+            else:
+                self.table.flush()
+            return True
+        except (ImportError, OSError) as e:
+            print(f"⚠ No se pudo exportar a Excel: {e}")
+            return False
+
+    #=================================================================================
+    # Accesos masivos (un rango contiguo por banco)
+    #=================================================================================
+    # (fila inicial, columna, cantidad) de cada banco en la hoja
+    _RANGE_R     = (1, 17, 16)      # R0..R15
+    _RANGE_W     = (1, 20, 10)      # w1..w9, d0
+    _RANGE_P     = (1, 23, 8)       # P1..P8
+    _RANGE_K     = (1, 26, 16)      # k0.0..k3.3
+
+    @staticmethod
+    def _cell_to_u32(data_type, value) -> int:
+        """Convierte un par (DataType, valor) leído a entero de 32 bits sin signo."""
+        if value is None:
+            return 0
+        if isinstance(value, int):
+            return value & 0xFFFFFFFF
+        value = str(value).strip()
+        try:
+            if value.startswith('0x'):
+                return int(value, 16) & 0xFFFFFFFF
+            if value.startswith('0b'):
+                return int(value, 2) & 0xFFFFFFFF
+            if value.startswith('0d'):
+                return int(value[2:]) & 0xFFFFFFFF
+            return int(value) & 0xFFFFFFFF
+        except ValueError:
+            return 0
+
+    def _read_u32_range(self, row: int, column: int, count: int) -> List[int]:
+        return [self._cell_to_u32(t, v) for t, v in self.table.read_range(row, column, count)]
+
+    def _write_hex_range(self, row: int, column: int, values: Sequence[int]):
+        self.table.write_range(row, column, [f"0x{v & 0xFFFFFFFF:08X}" for v in values])
+
+    def read_register_file(self) -> List[int]:
+        """R0..R15 como enteros sin signo de 32 bits."""
+        return self._read_u32_range(*self._RANGE_R)
+
+    def write_register_file(self, values: Sequence[int]):
+        self._write_hex_range(self._RANGE_R[0], self._RANGE_R[1], list(values)[:16])
+
+    def read_safe_registers(self) -> List[int]:
+        """w1..w9 y d0 (índice 9), sin signo."""
+        return self._read_u32_range(*self._RANGE_W)
+
+    def write_safe_registers(self, values: Sequence[int]):
+        """Escribe w1..w9 (d0 es de solo-lectura y no se toca)."""
+        self._write_hex_range(self._RANGE_W[0], self._RANGE_W[1], list(values)[:9])
+
+    def read_login_memory(self) -> List[int]:
+        return self._read_u32_range(*self._RANGE_P)
+
+    def write_login_memory(self, values: Sequence[int]):
+        self._write_hex_range(self._RANGE_P[0], self._RANGE_P[1], list(values)[:8])
+
+    def read_vault_memory(self) -> List[int]:
+        """k0.0..k3.3 en orden (clave*4 + bloque)."""
+        return self._read_u32_range(*self._RANGE_K)
+
+    def write_vault_memory(self, values: Sequence[int]):
+        self._write_hex_range(self._RANGE_K[0], self._RANGE_K[1], list(values)[:16])
+
+    def read_data_memory(self) -> array:
+        """Los 64 bloques de memoria general como array('I')."""
+        return array('I', self._read_u32_range(self._memory_base_row,
+                                               self._memory_base_col, 64))
+
+    def write_data_memory(self, values: Sequence[int]):
+        """Escribe los (hasta) 64 bloques de memoria general en hex."""
+        self._write_hex_range(self._memory_base_row, self._memory_base_col,
+                              list(values)[:64])
+
     #=================================================================================
     # Señales del Decode
     #=================================================================================
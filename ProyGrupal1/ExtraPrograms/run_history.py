@@ -0,0 +1,178 @@
+"""
+run_history.py - Historial persistente de ejecuciones del CPU
+
+Cada ejecución (vista CPU "Ejecutar Todo" o `HeadlessEngine`) agrega un
+`RunRecord` como una línea JSON a out/run_history.jsonl: programa y su
+tamaño, motor, versión del simulador, ciclos, tiempo, ciclos/s, CPI y
+utilización por etapa.  La vista de Análisis lee este archivo para
+graficar el rendimiento medido en lugar de constantes fijas.
+"""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+HISTORY_FILE = Path("out") / "run_history.jsonl"
+STAGES = ("IF", "ID", "EX", "MEM", "WB")
+
+
+def simulator_version(base_dir=None) -> str:
+    """Commit corto del repositorio (leído de .git sin invocar git)."""
+    start = Path(base_dir or __file__).resolve()
+    for folder in (start, *start.parents):
+        git = folder / ".git"
+        if not git.is_dir():
+            continue
+        try:
+            head = (git / "HEAD").read_text().strip()
+            if head.startswith("ref: "):
+                ref = head[5:]
+                ref_file = git / ref
+                if ref_file.exists():
+                    return ref_file.read_text().strip()[:7]
+                packed = git / "packed-refs"
+                if packed.exists():
+                    for line in packed.read_text().splitlines():
+                        if line.endswith(" " + ref):
+                            return line[:7]
+                return "desconocida"
+            return head[:7]
+        except OSError:
+            return "desconocida"
+    return "desconocida"
+
+
+def stage_totals(counters) -> Dict[str, int]:
+    """Instrucciones vistas por etapa según un `PerfCounters`."""
+    return {"IF_stalls": counters.fetch_stalls,
+            "ID": sum(counters.decoded), "EX": sum(counters.executed),
+            "MEM": sum(counters.memory), "WB": sum(counters.retired)}
+
+
+# ─────────────────────────────────────────────
+# Registro de una ejecución
+# ─────────────────────────────────────────────
+class RunRecord:
+    FIELDS = ("timestamp", "program", "program_size", "engine", "version",
+              "cycles", "wall_s", "retired", "utilization")
+
+    def __init__(self, program: str, program_size: int, engine: str,
+                 cycles: int, wall_s: float, retired: Optional[int] = None,
+                 utilization: Optional[Dict[str, float]] = None,
+                 version: Optional[str] = None,
+                 timestamp: Optional[float] = None):
+        self.timestamp    = time.time() if timestamp is None else timestamp
+        self.program      = program
+        self.program_size = program_size        # instrucciones (palabras de 64 bits)
+        self.engine       = engine
+        self.version      = version or simulator_version()
+        self.cycles       = cycles
+        self.wall_s       = wall_s
+        self.retired      = retired
+        self.utilization  = utilization or {}   # etapa → fracción de ciclos ocupada
+
+    @classmethod
+    def from_counters(cls, program: str, program_size: int, engine: str,
+                      cycles: int, wall_s: float,
+                      after: Dict[str, int],
+                      before: Optional[Dict[str, int]] = None) -> "RunRecord":
+        """Con los `stage_totals` antes/después de la ejecución (deltas)."""
+        before = before or {}
+        delta = {k: after[k] - before.get(k, 0) for k in after}
+        util = {}
+        if cycles:
+            util["IF"] = (cycles - delta["IF_stalls"]) / cycles
+            for stage in STAGES[1:]:
+                util[stage] = delta[stage] / cycles
+        return cls(program, program_size, engine, cycles, wall_s,
+                   delta["WB"], util)
+
+    @property
+    def cycles_per_s(self) -> float:
+        return self.cycles / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def cpi(self) -> Optional[float]:
+        return self.cycles / self.retired if self.retired else None
+
+    def to_dict(self) -> dict:
+        d = {name: getattr(self, name) for name in self.FIELDS}
+        d["cycles_per_s"] = self.cycles_per_s
+        d["cpi"] = self.cpi
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RunRecord":
+        return cls(d.get("program", "?"), d.get("program_size", 0),
+                   d.get("engine", "?"), d.get("cycles", 0),
+                   d.get("wall_s", 0.0), d.get("retired"),
+                   d.get("utilization"), d.get("version"), d.get("timestamp"))
+
+
+# ─────────────────────────────────────────────
+# Archivo de historial
+# ─────────────────────────────────────────────
+class RunHistory:
+    """Historial en formato JSON Lines (una ejecución por línea)."""
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = Path(path)
+
+    @classmethod
+    def for_base_dir(cls, base_dir) -> "RunHistory":
+        return cls(Path(base_dir) / HISTORY_FILE)
+
+    def append(self, record: RunRecord) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record.to_dict()) + "\n")
+
+    def load(self) -> List[RunRecord]:
+        """Todas las ejecuciones (las líneas corruptas se ignoran)."""
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(RunRecord.from_dict(json.loads(line)))
+                except (ValueError, TypeError, AttributeError):
+                    continue
+        return records
+
+    def clear(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
+
+    # ───── series para graficar ─────
+    @staticmethod
+    def throughput_by_size(records: Iterable[RunRecord]
+                           ) -> Dict[str, List[Tuple[int, float]]]:
+        """motor → [(tamaño del programa, mejor ciclos/s)] ordenado por tamaño."""
+        best: Dict[str, Dict[int, float]] = {}
+        for r in records:
+            if r.cycles and r.wall_s > 0:
+                per = best.setdefault(r.engine, {})
+                per[r.program_size] = max(per.get(r.program_size, 0.0), r.cycles_per_s)
+        return {engine: sorted(per.items()) for engine, per in best.items()}
+
+    @staticmethod
+    def throughput_by_version(records: Iterable[RunRecord]
+                              ) -> Tuple[List[str], Dict[str, List[Tuple[int, float]]]]:
+        """
+        Versiones en orden de primera aparición y, por motor, la mejor
+        tasa de cada versión como [(índice de versión, ciclos/s)].
+        """
+        versions: List[str] = []
+        best: Dict[str, Dict[int, float]] = {}
+        for r in records:
+            if not (r.cycles and r.wall_s > 0):
+                continue
+            if r.version not in versions:
+                versions.append(r.version)
+            i = versions.index(r.version)
+            per = best.setdefault(r.engine, {})
+            per[i] = max(per.get(i, 0.0), r.cycles_per_s)
+        return versions, {engine: sorted(per.items()) for engine, per in best.items()}
@@ -0,0 +1,397 @@
+"""
+state_store.py - Almacenamiento del estado vivo del CPU
+
+`CPUInfoExcel` ya no depende directamente de openpyxl: habla con un
+*state store* que expone la misma interfaz que `TableControl`
+(write / read_immediate / execute_all ...).
+
+• MemoryStateStore  → implementación por defecto, tipada y en memoria.
+                      Cada celda (fila, columna) es un "signal id" que se
+                      guarda en arreglos de enteros + etiqueta de tipo, sin
+                      formatear ni re-parsear strings en cada lectura.
+• TableControl      → backend Excel original (opcional, requiere openpyxl).
+
+Excel queda como sumidero opcional: `MemoryStateStore.import_excel()` /
+`export_excel()` copian el contenido desde/hacia el .xlsx en un solo paso.
+El backend se elige con la variable de entorno CPU_STATE_BACKEND
+("memory" por defecto, "excel" para el comportamiento histórico).
+"""
+from __future__ import annotations
+
+import os
+import threading
+from array import array
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ExtraPrograms.table_control import DataType
+
+# ─────────────────────────────────────────────
+# Etiquetas de tipo por celda
+# ─────────────────────────────────────────────
+_T_EMPTY  = 0
+_T_STRING = 1
+_T_INT    = 2
+_T_BINARY = 3
+_T_HEX    = 4
+
+_TAG_TO_TYPE = {
+    _T_STRING: DataType.STRING,
+    _T_INT:    DataType.INT,
+    _T_BINARY: DataType.BINARY,
+    _T_HEX:    DataType.HEX,
+}
+_TYPE_TO_TAG = {v: k for k, v in _TAG_TO_TYPE.items()}
+
+
+def _uint32_to_int32(value: int) -> int:
+    """Convierte un valor uint32 a int32 con signo usando complemento a 2"""
+    value &= 0xFFFFFFFF
+    return value - 0x100000000 if value > 0x7FFFFFFF else value
+
+
+def parse_content(content: Any) -> Tuple[int, Any]:
+    """
+    Traduce el contenido aceptado por `TableControl.write` al par
+    (etiqueta, valor) que `read_immediate` devolvería luego.
+
+    Soporta los mismos formatos y validaciones:
+        'texto' / "texto" · 0d123 · 0b1010 · 0xABC · int · cualquier otro
+    """
+    if content is None:
+        return _T_STRING, "None"
+
+    content_str = str(content)
+
+    # String con comillas
+    if ((content_str.startswith("'") and content_str.endswith("'")) or
+            (content_str.startswith('"') and content_str.endswith('"'))):
+        return _T_STRING, content_str[1:-1]
+
+    # Entero decimal con prefijo 0d
+    if content_str.startswith("0d"):
+        try:
+            value = int(content_str[2:])
+        except ValueError as e:
+            raise ValueError(f"Valor decimal inválido: {content_str} - {e}")
+        if value < -2147483648 or value > 2147483647:
+            raise ValueError(f"Valor decimal inválido: {content_str} - "
+                             f"Valor {value} fuera de rango para int32")
+        return _T_INT, value
+
+    # Binario con prefijo 0b
+    if content_str.startswith("0b"):
+        bits = content_str[2:]
+        if not bits or not all(c in "01" for c in bits):
+            raise ValueError(f"Error procesando binario: Valor binario inválido: {content_str}")
+        if len(bits) > 64:
+            return _T_BINARY, f"0b{bits}"
+        return _T_BINARY, _uint32_to_int32(int(bits, 2))
+
+    # Hexadecimal con prefijo 0x o 0X
+    if content_str.lower().startswith("0x"):
+        digits = content_str[2:]
+        if not digits or not all(c in "0123456789abcdefABCDEF" for c in digits):
+            raise ValueError(f"Error procesando hexadecimal: Valor hexadecimal inválido: {content_str}")
+        if len(digits) > 16:
+            return _T_HEX, f"0x{digits.upper()}"
+        return _T_HEX, _uint32_to_int32(int(digits, 16))
+
+    # Entero simple sin prefijo
+    if isinstance(content, int) and not isinstance(content, bool):
+        if content < -2147483648 or content > 2147483647:
+            raise ValueError(f"Valor {content} fuera de rango para int32")
+        return _T_INT, content
+
+    return _T_STRING, content_str
+
+
+def format_content(tag: int, value: Any) -> Optional[str]:
+    """Operación inversa: (etiqueta, valor) → contenido para `write`."""
+    if tag == _T_EMPTY:
+        return None
+    if tag == _T_STRING:
+        return f"'{value}'"
+    if isinstance(value, str):             # Binary/Hex (large)
+        return value
+    if tag == _T_BINARY:
+        return f"0b{value & 0xFFFFFFFF:b}"
+    if tag == _T_HEX:
+        return f"0x{value & 0xFFFFFFFF:08X}"
+    return f"0d{value}"
+
+
+# ═════════════════════════════════════════════════════════════════════════
+# Backend en memoria
+# ═════════════════════════════════════════════════════════════════════════
+class MemoryStateStore:
+    """
+    Hoja de cálculo tipada en memoria con la interfaz de `TableControl`.
+
+    • `_ints`  : array('q') fila-mayor con el valor entero de cada celda
+    • `_tags`  : bytearray paralelo con la etiqueta de tipo
+    • `_text`  : valores no enteros (strings, Binary/Hex "large")
+
+    Las escrituras se encolan y se aplican en `execute_all()`, igual que en
+    TableControl, para que el orden lectura/escritura de la GUI no cambie.
+    """
+
+    def __init__(self, rows: int = 64, cols: int = 32):
+        self._rows = rows
+        self._cols = cols
+        self._ints = array("q", bytes(8 * rows * cols))
+        self._tags = bytearray(rows * cols)
+        self._text: Dict[int, str] = {}
+        self._queue: List[Tuple[int, int, Any, Optional[Callable]]] = []
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self.version = 0                   # se incrementa en cada commit
+
+    # ───────────────────────── geometría ─────────────────────────
+    def _grow(self, rows: int, cols: int):
+        new_rows = max(rows, self._rows)
+        new_cols = max(cols, self._cols)
+        ints = array("q", bytes(8 * new_rows * new_cols))
+        tags = bytearray(new_rows * new_cols)
+        text: Dict[int, str] = {}
+        for r in range(self._rows):
+            src = r * self._cols
+            dst = r * new_cols
+            ints[dst:dst + self._cols] = self._ints[src:src + self._cols]
+            tags[dst:dst + self._cols] = self._tags[src:src + self._cols]
+        for idx, val in self._text.items():
+            r, c = divmod(idx, self._cols)
+            text[r * new_cols + c] = val
+        self._rows, self._cols = new_rows, new_cols
+        self._ints, self._tags, self._text = ints, tags, text
+
+    def _index(self, row: int, column: int, grow: bool = False) -> int:
+        """Signal id (0-based, fila-mayor) de la celda 1-indexed (row, column)."""
+        if row < 1 or column < 1:
+            raise ValueError(f"Celda inválida: [{row}, {column}]")
+        if row > self._rows or column > self._cols:
+            if not grow:
+                return -1
+            self._grow(row, column)
+        return (row - 1) * self._cols + (column - 1)
+
+    # ───────────────────────── escritura ─────────────────────────
+    def _store(self, row: int, column: int, tag: int, value: Any):
+        idx = self._index(row, column, grow=True)
+        self._tags[idx] = tag
+        if isinstance(value, int):
+            self._ints[idx] = value
+            self._text.pop(idx, None)
+        else:
+            self._ints[idx] = 0
+            self._text[idx] = value
+
+    def write(self, row: int, column: int, content: Any, callback: Callable = None):
+        """Encola una escritura (se aplica en `execute_all`)."""
+        with self._lock:
+            self._queue.append((row, column, content, callback))
+
+    def write_now(self, row: int, column: int, content: Any):
+        """Escritura inmediata, sin pasar por la cola."""
+        tag, value = parse_content(content)
+        with self._lock:
+            self._store(row, column, tag, value)
+            self.version += 1
+
+    # ───────────────────────── lectura ───────────────────────────
+    def read_immediate(self, row: int, column: int) -> Tuple[DataType, Any]:
+        """Devuelve (DataType, valor) con la misma semántica que TableControl."""
+        idx = self._index(row, column)
+        if idx < 0:
+            return DataType.STRING, None
+        tag = self._tags[idx]
+        if tag == _T_EMPTY:
+            return DataType.STRING, None
+        if tag == _T_STRING or idx in self._text:
+            return _TAG_TO_TYPE[tag], self._text[idx]
+        return _TAG_TO_TYPE[tag], self._ints[idx]
+
+    def read_immediate_as_string(self, row: int, column: int) -> str:
+        data_type, value = self.read_immediate(row, column)
+        return "None" if value is None else str(value)
+
+    # ───────────────────────── rangos ────────────────────────────
+    def read_range(self, row: int, column: int, count: int) -> List[Tuple[DataType, Any]]:
+        """
+        Lee `count` celdas consecutivas de una columna (row .. row+count-1)
+        en una sola operación de slicing sobre los arreglos.
+        """
+        if count <= 0:
+            return []
+        last = self._index(row + count - 1, column)
+        if last < 0:
+            return [self.read_immediate(row + i, column) for i in range(count)]
+        first = self._index(row, column)
+        step = self._cols
+        tags = self._tags[first:last + 1:step]
+        ints = self._ints[first:last + 1:step]
+        text = self._text
+        out: List[Tuple[DataType, Any]] = []
+        for i, tag in enumerate(tags):
+            idx = first + i * step
+            if tag == _T_EMPTY:
+                out.append((DataType.STRING, None))
+            elif tag == _T_STRING or idx in text:
+                out.append((_TAG_TO_TYPE[tag], text[idx]))
+            else:
+                out.append((_TAG_TO_TYPE[tag], ints[i]))
+        return out
+
+    def write_range(self, row: int, column: int, contents) -> None:
+        """Encola la escritura de celdas consecutivas de una columna."""
+        with self._lock:
+            self._queue.extend((row + i, column, content, None)
+                               for i, content in enumerate(contents))
+
+    # ───────────────────────── cola / lotes ──────────────────────
+    def execute_all(self) -> int:
+        """Aplica en orden FIFO todas las escrituras encoladas."""
+        with self._lock:
+            pending, self._queue = self._queue, []
+            executed = 0
+            for row, column, content, callback in pending:
+                try:
+                    tag, value = parse_content(content)
+                    self._store(row, column, tag, value)
+                    executed += 1
+                    if callback:
+                        callback(True, value)
+                except Exception as e:
+                    print(f"✗ Error en escritura: {e}")
+                    if callback:
+                        callback(False, str(e))
+            if executed:
+                self.version += 1
+            return executed
+
+    # Compatibilidad con la API de TableControl
+    execute_writes_only = execute_all
+
+    def execute_reads_only(self) -> int:
+        return 0
+
+    def begin_batch(self):
+        self._batch_depth += 1
+
+    def commit(self) -> int:
+        if self._batch_depth > 0:
+            self._batch_depth -= 1
+        return 0 if self._batch_depth > 0 else self.execute_all()
+
+    def rollback(self) -> int:
+        self._batch_depth = 0
+        return self.clear_queue()
+
+    @contextmanager
+    def batch(self):
+        self.begin_batch()
+        try:
+            yield self
+        except Exception:
+            self.rollback()
+            raise
+        else:
+            self.commit()
+
+    def flush(self):
+        """No hay nada que persistir: el estado vive en memoria."""
+
+    def get_queue_size(self) -> int:
+        return len(self._queue)
+
+    def clear_queue(self) -> int:
+        with self._lock:
+            cleared = len(self._queue)
+            self._queue.clear()
+            return cleared
+
+    # ───────────────────────── sumidero Excel ────────────────────
+    def cells(self):
+        """Itera (row, column, tag, valor) de todas las celdas no vacías."""
+        cols = self._cols
+        for idx, tag in enumerate(self._tags):
+            if tag == _T_EMPTY:
+                continue
+            r, c = divmod(idx, cols)
+            value = self._text[idx] if idx in self._text else self._ints[idx]
+            yield r + 1, c + 1, tag, value
+
+    def export_excel(self, table=None) -> int:
+        """
+        Copia todo el estado a un `TableControl` (por defecto el singleton)
+        y lo persiste una sola vez.  Requiere openpyxl.
+        """
+        if table is None:
+            from ExtraPrograms.table_control import TableControl
+            table = TableControl()
+        count = 0
+        with self._lock:
+            for row, column, tag, value in self.cells():
+                table.write(row, column, format_content(tag, value))
+                count += 1
+        table.execute_all()
+        return count
+
+    def import_excel(self, table=None, max_row: int = 0, max_col: int = 0) -> int:
+        """
+        Carga el contenido del .xlsx (vía `TableControl`) en memoria,
+        reemplazando el estado actual.  Requiere openpyxl.
+        """
+        if table is None:
+            from ExtraPrograms.table_control import TableControl
+            table = TableControl()
+        ws = table.worksheet
+        max_row = max_row or ws.max_row
+        max_col = max_col or ws.max_column
+        count = 0
+        with self._lock:
+            self._tags[:] = bytes(len(self._tags))
+            self._text.clear()
+            # Una sola pasada sobre la hoja ya cargada (sin recargar por celda)
+            for row in range(1, max_row + 1):
+                for column in range(1, max_col + 1):
+                    cell_value = ws.cell(row=row, column=column).value
+                    if cell_value is None:
+                        continue
+                    data_type, value = table._detect_data_type(cell_value)
+                    if value is None:
+                        continue
+                    self._store(row, column, _TYPE_TO_TAG[data_type], value)
+                    count += 1
+            self.version += 1
+        return count
+
+
+# ═════════════════════════════════════════════════════════════════════════
+# Selección del backend
+# ═════════════════════════════════════════════════════════════════════════
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def create_store(backend: Optional[str] = None):
+    """
+    Crea un store nuevo.  `backend` = "memory" | "excel"
+    (por defecto CPU_STATE_BACKEND o "memory").
+    """
+    backend = (backend or os.environ.get("CPU_STATE_BACKEND") or "memory").lower()
+    if backend == "excel":
+        from ExtraPrograms.table_control import TableControl
+        return TableControl()
+    if backend == "memory":
+        return MemoryStateStore()
+    raise ValueError(f"Backend de estado desconocido: {backend}")
+
+
+def get_default_store():
+    """Store compartido por todo el proceso (equivalente al singleton Excel)."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = create_store()
+        return _default_store
@@ -1,8 +1,14 @@
 from pathlib import Path
-import openpyxl
-from openpyxl import Workbook
+try:
+    import openpyxl
+    from openpyxl import Workbook
+except ImportError:          # Excel es un sumidero opcional (ver state_store.py)
+    openpyxl = None
+    Workbook = None
 import threading
 import queue
+import atexit
+from contextlib import contextmanager
 from enum import Enum
 from typing import Union, Tuple, Optional, Any, List
 import time
@@ -80,6 +86,24 @@ class TableControl:
         self.action_queue = queue.Queue()
         self.workbook = None
         self.worksheet = None
+
+        # Persistencia diferida: las escrituras marcan el libro como sucio
+        # y se guarda UNA vez al confirmar (execute_all / commit)
+        self._wb_lock = threading.RLock()
+        self._dirty = False
+        self._batch_depth = 0
+
+        # Vista cacheada de la hoja: (mtime_ns, tamaño) del archivo cuando se
+        # cargó/guardó por última vez; sólo se recarga si cambió fuera del proceso
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self.version = 0
+
+        # Guardado en segundo plano con *debounce* (opcional)
+        self._autosave_delay: Optional[float] = None
+        self._autosave_thread: Optional[threading.Thread] = None
+        self._autosave_cond = threading.Condition(self._wb_lock)
+        self._autosave_deadline: Optional[float] = None
+        self._autosave_stop = False
         
         # Crear directorio assets si no existe
         os.makedirs(assets_dir, exist_ok=True)
@@ -91,10 +115,13 @@ class TableControl:
         
     def _initialize_excel(self):
         """Inicializa o carga el archivo Excel"""
+        if openpyxl is None:
+            raise ImportError("openpyxl no está instalado: el backend Excel no está disponible")
         try:
             if os.path.exists(self.filename):
                 self.workbook = openpyxl.load_workbook(self.filename)
                 self.worksheet = self.workbook.active
+                self._file_stamp = self._stat_file()
             else:
                 self.workbook = Workbook()
                 self.worksheet = self.workbook.active
@@ -113,6 +140,12 @@ class TableControl:
     
     def _save_workbook(self):
         """Guarda el archivo Excel de forma segura"""
+        with self._wb_lock:
+            self._save_workbook_locked()
+            self._dirty = False
+            self._file_stamp = self._stat_file()
+
+    def _save_workbook_locked(self):
         try:
             # Usar la ruta absoluta que ya está en self.filename
             self.workbook.save(self.filename)
@@ -142,11 +175,14 @@ class TableControl:
             Exception: Si hay error al leer la celda
         """
         try:
-            # Recargar el archivo para asegurar datos actualizados
-            self._reload_workbook()
-            
-            # Leer valor de la celda
-            cell_value = self.worksheet.cell(row=row, column=column).value
+            with self._wb_lock:
+                # Recargar sólo si el archivo cambió fuera del proceso
+                # (si hay cambios sin guardar, la copia en memoria es la vigente)
+                if not self._dirty:
+                    self._refresh_if_changed()
+
+                # Leer valor de la celda
+                cell_value = self.worksheet.cell(row=row, column=column).value
             
             # Detectar tipo y procesar valor
             data_type, processed_value = self._detect_data_type(cell_value)
@@ -157,6 +193,25 @@ class TableControl:
             print(f"✗ Error en lectura inmediata: {e}")
             raise
     
+    def _stat_file(self) -> Optional[Tuple[int, int]]:
+        """Sello (mtime_ns, tamaño) del archivo, o None si no existe."""
+        try:
+            st = os.stat(self.filename)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _refresh_if_changed(self) -> bool:
+        """
+        Recarga la hoja sólo si el archivo fue modificado externamente desde
+        la última carga/guardado.  Retorna True si hubo recarga.
+        """
+        stamp = self._stat_file()
+        if stamp is not None and stamp == self._file_stamp:
+            return False
+        self._reload_workbook()
+        return True
+
     def _reload_workbook(self):
         """Recarga el archivo Excel para obtener datos actualizados"""
         try:
@@ -168,6 +223,8 @@ class TableControl:
                 # Recargar archivo
                 self.workbook = openpyxl.load_workbook(self.filename)
                 self.worksheet = self.workbook.active
+                self._file_stamp = self._stat_file()
+                self.version += 1
             else:
                 raise FileNotFoundError(f"Archivo no encontrado: {self.filename}")
         except Exception as e:
@@ -219,7 +276,7 @@ class TableControl:
                 binary_part = value_str[value_str.find("0b") + 2:]
                 return DataType.BINARY, f"0b{binary_part}"
             else:
-                binary_part = value_str[11:]  # Remover "Binary: 0b"
+                binary_part = value_str[len("Binary: 0b"):]  # Remover "Binary: 0b"
                 try:
                     # Intentar convertir a decimal si no es muy grande
                     if len(binary_part) <= 64:
@@ -258,6 +315,26 @@ class TableControl:
             # Cualquier otro caso es string
             return DataType.STRING, value_str
     
+    def read_range(self, row: int, column: int, count: int) -> List[Tuple[DataType, Any]]:
+        """
+        Lee `count` celdas consecutivas de una columna (row .. row+count-1)
+        con un único recorrido `iter_rows` sobre la hoja cacheada.
+        """
+        if count <= 0:
+            return []
+        with self._wb_lock:
+            if not self._dirty:
+                self._refresh_if_changed()
+            values = [r[0] for r in self.worksheet.iter_rows(
+                min_row=row, max_row=row + count - 1,
+                min_col=column, max_col=column, values_only=True)]
+        return [self._detect_data_type(v) for v in values]
+
+    def write_range(self, row: int, column: int, contents) -> None:
+        """Encola la escritura de celdas consecutivas de una columna."""
+        for i, content in enumerate(contents):
+            self.write(row + i, column, content)
+
     def read_immediate_as_string(self, row: int, column: int) -> str:
         """
         Lee inmediatamente un valor como string, útil para debug.
@@ -270,8 +347,10 @@ class TableControl:
             str: Valor de la celda como string
         """
         try:
-            self._reload_workbook()
-            cell_value = self.worksheet.cell(row=row, column=column).value
+            with self._wb_lock:
+                if not self._dirty:
+                    self._refresh_if_changed()
+                cell_value = self.worksheet.cell(row=row, column=column).value
             result = str(cell_value) if cell_value is not None else "None"
             print(f"📄 Lectura como string: '{result}' desde [{row}, {column}]")
             return result
@@ -298,6 +377,9 @@ class TableControl:
                 break
             except Exception as e:
                 print(f"✗ Error ejecutando acción: {e}")
+
+        # Un único guardado por lote
+        self._commit_save()
         return executed
     
     def execute_reads_only(self):
@@ -371,7 +453,9 @@ class TableControl:
                 executed += 1
             except Exception as e:
                 print(f"✗ Error ejecutando escritura: {e}")
-        
+
+        self._commit_save()
+
         # Devolver las lecturas a la cola
         for action in reads:
             self.action_queue.put(action)
@@ -417,11 +501,11 @@ class TableControl:
             # Procesar y validar el contenido
             content, display_value = self._process_content(action.content)
             
-            # Escribir en la celda
-            self.worksheet.cell(row=action.row, column=action.column, value=display_value)
-            
-            # Guardar archivo
-            self._save_workbook()
+            # Escribir en la celda (el guardado se hace al confirmar el lote)
+            with self._wb_lock:
+                self.worksheet.cell(row=action.row, column=action.column, value=display_value)
+                self._dirty = True
+                self.version += 1
             
             # Ejecutar callback si existe
             if action.callback:
@@ -557,6 +641,120 @@ class TableControl:
         self.action_queue.put(action)
         print(f"➕ Acción de lectura agregada a la cola (Total: {self.get_queue_size()})")
     
+    # ------------------------------------------------------------------
+    #  Lotes / transacciones
+    # ------------------------------------------------------------------
+    def begin_batch(self):
+        """Abre un lote: las escrituras se acumulan hasta `commit()`."""
+        self._batch_depth += 1
+
+    def commit(self) -> int:
+        """
+        Cierra el lote más interno.  Al cerrar el más externo se aplican
+        todas las acciones en cola y el libro se persiste una sola vez.
+        Retorna el número de acciones ejecutadas (0 si aún hay lotes abiertos).
+        """
+        if self._batch_depth > 0:
+            self._batch_depth -= 1
+        if self._batch_depth > 0:
+            return 0
+        if self.action_queue.empty():
+            self._commit_save()
+            return 0
+        return self.execute_all()
+
+    def rollback(self) -> int:
+        """Descarta el lote abierto (acciones aún no ejecutadas)."""
+        self._batch_depth = 0
+        return self.clear_queue()
+
+    @contextmanager
+    def batch(self):
+        """
+        Uso:
+            with table.batch():
+                table.write(1, 1, "0x10")
+                ...
+        """
+        self.begin_batch()
+        try:
+            yield self
+        except Exception:
+            self.rollback()
+            raise
+        else:
+            self.commit()
+
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    def _commit_save(self):
+        """Persiste si hay cambios: directo o vía el hilo con debounce."""
+        if not self._dirty or self._batch_depth > 0:
+            return
+        if self._autosave_thread is not None:
+            with self._autosave_cond:
+                self._autosave_deadline = time.monotonic() + self._autosave_delay
+                self._autosave_cond.notify()
+        else:
+            self._save_workbook()
+
+    def flush(self):
+        """Fuerza el guardado inmediato de cambios pendientes."""
+        with self._wb_lock:
+            self._autosave_deadline = None
+            if self._dirty:
+                self._save_workbook()
+
+    # ------------------------------------------------------------------
+    #  Guardado en segundo plano (debounce)
+    # ------------------------------------------------------------------
+    def start_autosave(self, delay: float = 0.5):
+        """
+        Activa un hilo que guarda el libro `delay` segundos después del
+        último commit.  Commits seguidos reinician la espera, de modo que
+        una ráfaga de pasos se persiste una sola vez.
+        """
+        if delay <= 0:
+            raise ValueError("delay debe ser positivo")
+        with self._autosave_cond:
+            self._autosave_delay = delay
+            if self._autosave_thread is not None:
+                return
+            self._autosave_stop = False
+            self._autosave_thread = threading.Thread(
+                target=self._autosave_loop, name="TableControlAutosave", daemon=True)
+            self._autosave_thread.start()
+        atexit.register(self.stop_autosave)
+
+    def stop_autosave(self, flush: bool = True):
+        """Detiene el hilo de guardado y, por defecto, persiste lo pendiente."""
+        with self._autosave_cond:
+            thread = self._autosave_thread
+            self._autosave_stop = True
+            self._autosave_cond.notify()
+        if thread is not None:
+            thread.join()
+        with self._autosave_cond:
+            self._autosave_thread = None
+            self._autosave_deadline = None
+        if flush:
+            self.flush()
+
+    def _autosave_loop(self):
+        with self._autosave_cond:
+            while not self._autosave_stop:
+                if self._autosave_deadline is None:
+                    self._autosave_cond.wait()
+                    continue
+                remaining = self._autosave_deadline - time.monotonic()
+                if remaining > 0:
+                    self._autosave_cond.wait(remaining)
+                    continue
+                self._autosave_deadline = None
+                if self._dirty:
+                    self._save_workbook()
+
     def get_queue_size(self) -> int:
         """Retorna el número de acciones pendientes en la cola"""
         return self.action_queue.qsize()
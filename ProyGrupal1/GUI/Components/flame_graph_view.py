@@ -0,0 +1,85 @@
+"""
+flame_graph_view.py - Gráfica tipo flame (icicle) del perfil por etapa
+
+Dibuja en un Canvas el árbol de `StageProfiler.breakdown()`: una fila por
+nivel ("step" arriba, etapas y ticks debajo, llamadas a unidades al
+final), cada bloque con ancho proporcional a su tiempo inclusivo.  Al
+pasar el mouse se muestran tiempo por ciclo y porcentaje del bloque.
+"""
+import tkinter as tk
+
+# Paleta cálida por nivel (estilo flame graph)
+LEVEL_COLORS = ("#c0392b", "#d35400", "#e67e22", "#f39c12", "#f1c40f")
+
+
+class FlameGraphView(tk.Frame):
+    """Vista de un `StageProfiler`; `show(profiler)` la redibuja."""
+
+    ROW_HEIGHT = 26
+
+    def __init__(self, parent, design_manager, **kwargs):
+        self.design_manager = design_manager
+        colors = design_manager.get_colors()
+        super().__init__(parent, bg=colors["bg"], **kwargs)
+
+        self.canvas = tk.Canvas(self, bg=colors["bg"], highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.status = tk.Label(self, text="", anchor="w",
+                               font=design_manager.get_font("normal"),
+                               bg=colors["bg"], fg=colors["fg"])
+        self.status.pack(fill=tk.X, pady=(5, 0))
+
+        self._rows = []          # (pila, ns inclusivos, ns propios, fracción)
+        self._sampled = 1
+        self._items = {}         # id del rectángulo → fila
+        self.canvas.bind("<Configure>", lambda _e: self._draw())
+        self.canvas.bind("<Motion>", self._on_motion)
+
+    def show(self, profiler):
+        self._rows = profiler.breakdown()
+        self._sampled = profiler.sampled or 1
+        self.status.config(text=f"{profiler.sampled} de {profiler.cycles} ciclos "
+                                f"muestreados (1 de cada {profiler.every})")
+        self._draw()
+
+    # ------------------------------------------------------------------
+    def _draw(self):
+        canvas = self.canvas
+        canvas.delete("all")
+        self._items.clear()
+        width = max(canvas.winfo_width(), 1)
+        colors = self.design_manager.get_colors()
+
+        # Posición x de cada pila: los hijos se apilan dentro del padre
+        # en el orden de breakdown() (de mayor a menor)
+        x_of, next_x = {}, {}
+        for stack, ns, _own, share in self._rows:
+            parent = stack.rpartition(";")[0]
+            x0 = next_x.get(parent, x_of.get(parent, 0.0))
+            x1 = x0 + share * width
+            x_of[stack], next_x[parent] = x0, x1
+
+            depth = stack.count(";")
+            y0 = depth * self.ROW_HEIGHT
+            rect = canvas.create_rectangle(
+                x0, y0, x1, y0 + self.ROW_HEIGHT - 2,
+                fill=LEVEL_COLORS[depth % len(LEVEL_COLORS)],
+                outline=colors["bg"])
+            self._items[rect] = (stack, ns, share)
+
+            name = stack.rpartition(";")[2]
+            label = f"{name} {share:.1%}"
+            if x1 - x0 > 7 * len(label):
+                canvas.create_text(x0 + 4, y0 + self.ROW_HEIGHT / 2 - 1,
+                                   text=label, anchor="w", fill="#000000",
+                                   font=self.design_manager.get_font("normal"))
+
+    def _on_motion(self, event):
+        hits = self.canvas.find_overlapping(event.x, event.y, event.x, event.y)
+        for item in reversed(hits):
+            if item in self._items:
+                stack, ns, share = self._items[item]
+                self.status.config(
+                    text=f"{stack.replace(';', ' › ')}: "
+                         f"{ns / self._sampled / 1000:.2f} µs/ciclo ({share:.1%})")
+                return
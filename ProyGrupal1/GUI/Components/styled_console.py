@@ -98,6 +98,23 @@ class StyledConsole(tk.Frame):
         # Verificar visibilidad del scrollbar
         self._check_scrollbar_visibility()
     
+    def printConsoleLines(self, values):
+        """Agrega varias líneas con un solo insert (salida en bloque del CPU)"""
+        if not values:
+            return
+        self.text_widget.config(state=tk.NORMAL)
+        
+        # Mismo formato que llamar printConsoleLn por cada valor
+        block = "\n".join(str(v) for v in values)
+        if self.text_widget.compare("end-1c", "!=", "1.0"):
+            block = "\n" + block
+        self.text_widget.insert(tk.END, block)
+        
+        self.text_widget.config(state=tk.DISABLED)
+        self._update_line_numbers()
+        self.text_widget.see(tk.END)
+        self._check_scrollbar_visibility()
+    
     def clear(self):
         """Limpia todo el contenido de la consola"""
         self.text_widget.config(state=tk.NORMAL)
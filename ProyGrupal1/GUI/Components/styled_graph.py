@@ -133,10 +133,13 @@ class StyledGraph(tk.Frame):
         # Redibujar
         self.canvas.draw()
     
-    def plot_lines(self, data, title="", xlabel="", ylabel=""):
+    def plot_lines(self, data, title="", xlabel="", ylabel="",
+                   value_fmt="{:.3f}s", xtick_labels=None):
         """
         Crea una gráfica de líneas
         data: diccionario {nombre_línea: [(x1,y1), (x2,y2),...]}
+        value_fmt: formato de las etiquetas de cada punto
+        xtick_labels: nombres para las posiciones 0, 1, 2… del eje X
         """
         # Limpiar el axes actual
         self.ax.clear()
@@ -154,7 +157,7 @@ class StyledGraph(tk.Frame):
             
             # Añadir etiquetas en los puntos
             for x, y in points:
-                self.ax.annotate(f'{y:.3f}s', (x, y), 
+                self.ax.annotate(value_fmt.format(y), (x, y), 
                                textcoords="offset points", 
                                xytext=(0,10), ha='center',
                                color=self.ax.title.get_color(),
@@ -171,7 +174,12 @@ class StyledGraph(tk.Frame):
         self.ax.yaxis.label.set_color('red')
         self.ax.yaxis.label.set_weight('bold')
         
-        self.ax.legend()
+        if xtick_labels is not None:
+            self.ax.set_xticks(range(len(xtick_labels)))
+            self.ax.set_xticklabels(xtick_labels)
+        
+        if data:
+            self.ax.legend()
         
         # Actualizar grid
         grid_color = '#3a3a3a' if self.design_manager.config['theme']['current'] == 'dark' else '#e0e0e0'
@@ -183,7 +191,7 @@ class StyledGraph(tk.Frame):
             all_y.extend([p[1] for p in points])
         if all_y:
             y_min, y_max = min(all_y), max(all_y)
-            y_margin = (y_max - y_min) * 0.1
+            y_margin = (y_max - y_min) * 0.1 or abs(y_max) * 0.1 or 1.0
             self.ax.set_ylim(y_min - y_margin, y_max + y_margin)
         
         # Redibujar
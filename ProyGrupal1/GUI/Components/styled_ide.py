@@ -5,6 +5,17 @@ import tkinter as tk
 from tkinter import ttk
 from GUI.Components.styled_scrollbar import StyledVerticalScrollbar
 
+# Degradado del margen para el perfil (frío → caliente)
+HEAT_COLD = (0xFF, 0xE0, 0x82)
+HEAT_HOT  = (0xE5, 0x39, 0x35)
+
+
+def heat_color(value):
+    """Color del margen para una fracción 0..1 del ciclo más caliente"""
+    value = min(max(value, 0.0), 1.0)
+    r, g, b = (round(c + (h - c) * value) for c, h in zip(HEAT_COLD, HEAT_HOT))
+    return f"#{r:02x}{g:02x}{b:02x}"
+
 class StyledIDE(tk.Frame):
     """IDE estilizado con números de línea y capacidad de edición"""
     def __init__(self, parent, design_manager, **kwargs):
@@ -18,6 +29,7 @@ class StyledIDE(tk.Frame):
         
         # Variables internas
         self.line_count = 0
+        self.heat = {}      # línea → 0..1 (perfil del programa; vacío = sin colores)
         
         # Frame principal
         main_frame = tk.Frame(self, bg=colors['bg'])
@@ -96,6 +108,17 @@ class StyledIDE(tk.Frame):
         self._update_line_numbers()
         self._check_scrollbar_visibility()
     
+    def set_heat(self, heat):
+        """Colorea el margen según el perfil: {línea: fracción 0..1}"""
+        self.heat = dict(heat)
+        self._update_line_numbers()
+
+    def clear_heat(self):
+        """Quita los colores del perfil del margen"""
+        if self.heat:
+            self.heat = {}
+            self._update_line_numbers()
+
     def clear(self):
         """Limpia todo el contenido del IDE"""
         self.text_widget.delete("1.0", tk.END)
@@ -133,6 +156,8 @@ class StyledIDE(tk.Frame):
         de eventos (idle) y reiniciamos el flag modified.
         """
         self.text_widget.edit_modified(False)
+        # El perfil deja de corresponder a las líneas editadas
+        self.heat = {}
         # Actualizar números y barra UNA vez cuando termine el repintado
         self.after_idle(self._refresh_metrics)
     
@@ -168,12 +193,19 @@ class StyledIDE(tk.Frame):
             dline = self.text_widget.dlineinfo(index)
             if dline:
                 y = dline[1] + (dline[3] // 2)  # Centro vertical
+                heat = self.heat.get(line_num)
+                if heat is not None:
+                    top = dline[1] + 5
+                    self.line_numbers.create_rectangle(
+                        0, top, 50, top + dline[3],
+                        fill=heat_color(heat), width=0
+                    )
                 self.line_numbers.create_text(
                     45, y+5,
                     anchor="e",
                     text=str(line_num),
                     font=self.design_manager.get_font('normal'),
-                    fill=colors['sidebar_button_fg']
+                    fill=colors['sidebar_button_fg'] if heat is None else '#000000'
                 )
         
         # Sincronizar scrollregion con texto
@@ -1,22 +1,20 @@
 """
 analisis.py - Vista de análisis con rutas críticas, cálculo de frecuencia
-              y comparación de rendimiento.
+              y rendimiento medido del simulador (out/run_history.jsonl).
 """
+import time
 import tkinter as tk
 from tkinter import ttk
 from GUI.Components.styled_scrollbar import ScrollableFrame
 from GUI.Components.styled_widgets   import StyledLabel
 from GUI.Components.styled_textbox   import StyledTextBox
 from GUI.Components.styled_graph     import StyledGraph
+from GUI.Components.styled_button    import StyledButton
+from ExtraPrograms.run_history       import RunHistory, STAGES
 
 
 class AnalisisView:
-    # ──────────────────────────────────────────────────────────────
-    #  Métricas base de la última ejecución
-    # ──────────────────────────────────────────────────────────────
-    CPU_CYCLES   = 3_280_748                     # ciclos simulados
-    CPU_TIME_S   = 236.489                       # s   (≈ 13 873 ciclos/s)
-    PY_TIME_S    = 0.040                         # s   en Python nativo
+    RECENT_RUNS = 10                             # filas de la tabla de ejecuciones
 
     def __init__(
         self, parent, base_dir, config,
@@ -31,11 +29,9 @@ class AnalisisView:
         self.cpu_excel        = cpu_excel
         self.controller       = controller
 
-        # Para la gráfica (time vs cycles)
-        self.timing_pts = {
-            "Python"         : [(0, 0.0), (self.CPU_CYCLES, self.PY_TIME_S)],
-            "CPU (Simulación)": [(0, 0.0), (self.CPU_CYCLES, self.CPU_TIME_S)],
-        }
+        # Ejecuciones medidas (las agrega la vista CPU y HeadlessEngine)
+        self.history = RunHistory.for_base_dir(base_dir)
+        self.records = []
 
         self._create_ui()
 
@@ -179,99 +175,158 @@ class AnalisisView:
         calc.insert_formatted_content(content)
 
     # ──────────────────────────────────────────────────────────────
-    #  3. Comparación rendimiento
+    #  3. Rendimiento medido
     # ──────────────────────────────────────────────────────────────
     def _create_performance_comparison_section(self, parent):
         section = ttk.LabelFrame(
             parent,
-            text="3. COMPARACIÓN DE RENDIMIENTO: PYTHON vs CPU (Simulación)",
+            text="3. RENDIMIENTO MEDIDO DEL SIMULADOR (historial de ejecuciones)",
             padding=15
         )
         section.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
 
-        note = StyledTextBox(section, self.design_manager, title="Contexto de la Comparación")
-        note.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
-
-        note_content = [
-            ("Métrica global para 1 423 bloques de 64 bit TEA\n\n", "subtitle"),
-            ("• CPU (Simulación): 3 280 748 ciclos  →  236.489 s  (", None),
-            ("13 873 ciclos / s", "emphasis"), (")\n", None),
-            ("• Python nativo   : 3 280 748 ‘ciclos lógicos’ → 0.040 s\n\n", None),
-            ("La simulación es miles de veces más lenta por la emulación\n"
-             "ciclo-a-ciclo del pipeline, controles de seguridad y trazado\n"
-             "completo del estado interno.\n", None),
-        ]
-        note.insert_formatted_content(note_content)
+        StyledButton(section, text="Actualizar",
+                     command=self._refresh,
+                     design_manager=self.design_manager).pack(anchor="e", pady=(0, 10))
 
-        # Gráfica tiempo-vs-ciclos
+        self.note = StyledTextBox(section, self.design_manager, title="Última Ejecución")
+        self.note.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+
+        # Gráficas de rendimiento: por tamaño de programa y por versión
         self.graph = StyledGraph(
             section,
             self.design_manager,
-            title="Tiempo de ejecución vs. Ciclos (0 → 3 280 748)"
+            title="Ciclos por segundo vs. tamaño del programa"
         )
         self.graph.pack(fill=tk.BOTH, expand=True)
-        self._plot_comparison_data()
 
-        self._create_summary_table(section)
+        self.version_graph = StyledGraph(
+            section,
+            self.design_manager,
+            title="Ciclos por segundo por versión del simulador"
+        )
+        self.version_graph.pack(fill=tk.BOTH, expand=True, pady=(15, 0))
+
+        colors = self.design_manager.get_colors()
+        self.table_frame = tk.Frame(section, bg=colors["bg"])
+        self.table_frame.pack(fill=tk.X, pady=(15, 0))
+
+        # Se recarga cada vez que la vista vuelve a mostrarse
+        section.bind("<Map>", lambda _e: self._refresh())
+        self._refresh()
+
+    def _refresh(self):
+        self.records = self.history.load()
+        self._fill_last_run_note()
+        self._plot_comparison_data()
+        self._create_summary_table(self.table_frame)
+
+    def _fill_last_run_note(self):
+        self.note.clear()
+        if not self.records:
+            self.note.insert_formatted_content([
+                ("Sin ejecuciones registradas\n\n", "subtitle"),
+                ("Ejecute un programa con \"Ejecutar Todo\" en la vista CPU o con\n"
+                 "HeadlessEngine(..., history=RunHistory(...)) para poblar\n", None),
+                (str(self.history.path), "code"),
+                ("\n", None),
+            ])
+            return
+
+        last = self.records[-1]
+        content = [
+            (f"{last.program}  ·  {last.engine}  ·  versión {last.version}\n\n", "subtitle"),
+            (f"• Ciclos: {last.cycles:,}  →  {last.wall_s:.3f} s  (", None),
+            (f"{last.cycles_per_s:,.0f} ciclos / s", "emphasis"), (")\n", None),
+        ]
+        if last.cpi is not None:
+            content.append((f"• Instrucciones retiradas: {last.retired:,}  ·  CPI {last.cpi:.3f}\n", None))
+        if last.utilization:
+            util = "  ".join(f"{st} {last.utilization.get(st, 0.0) * 100:.1f}%"
+                             for st in STAGES)
+            content.append(("• Utilización por etapa: ", None))
+            content.append((util + "\n", "code"))
+
+        best = max((r for r in self.records if r.engine == last.engine),
+                   key=lambda r: r.cycles_per_s)
+        if best is not last and best.cycles_per_s > 0:
+            ratio = last.cycles_per_s / best.cycles_per_s
+            content.append((f"\n• Mejor marca de \"{last.engine}\": "
+                            f"{best.cycles_per_s:,.0f} ciclos / s (versión {best.version}); "
+                            f"esta ejecución: ", None))
+            content.append((f"{ratio * 100:.0f} %\n", "emphasis"))
+        self.note.insert_formatted_content(content)
 
     # ──────────────────────────────────────────────────────────────
-    #  Gráfica
+    #  Gráficas
     # ──────────────────────────────────────────────────────────────
     def _plot_comparison_data(self):
         self.graph.plot_lines(
-            self.timing_pts,
-            title="Comparación global (misma cantidad de ciclos)",
-            xlabel="Ciclos de reloj",
-            ylabel="Tiempo (segundos)"
+            RunHistory.throughput_by_size(self.records),
+            title="Mejor tasa por motor",
+            xlabel="Tamaño del programa (instrucciones)",
+            ylabel="Ciclos / segundo",
+            value_fmt="{:,.0f}"
+        )
+        versions, series = RunHistory.throughput_by_version(self.records)
+        self.version_graph.plot_lines(
+            series,
+            title="Regresiones de velocidad entre versiones",
+            xlabel="Versión (commit)",
+            ylabel="Ciclos / segundo",
+            value_fmt="{:,.0f}",
+            xtick_labels=versions
         )
 
     # ──────────────────────────────────────────────────────────────
-    #  Tabla resumen
+    #  Tabla de ejecuciones recientes
     # ──────────────────────────────────────────────────────────────
     def _create_summary_table(self, parent):
+        for child in parent.winfo_children():
+            child.destroy()
         colors = self.design_manager.get_colors()
-        frame  = tk.Frame(parent, bg=colors["bg"])
-        frame.pack(fill=tk.X, pady=(15, 0))
 
         StyledLabel(
-            frame, "TABLA RESUMEN DE TIEMPOS",
+            parent, "EJECUCIONES RECIENTES",
             self.design_manager, font_type="bold"
         ).pack(pady=(0, 10))
 
-        table = tk.Frame(frame, bg=colors["bg"])
+        table = tk.Frame(parent, bg=colors["bg"])
         table.pack()
 
-        for c in range(4):
-            table.grid_columnconfigure(c, weight=1)
-
-        headers = ("Implementación", "Tiempo total", "Ciclos equivalentes", "Factor")
+        headers = ("Fecha", "Programa", "Motor", "Versión", "Ciclos",
+                   "Tiempo", "Ciclos/s", "CPI", "Utilización (IF/ID/EX/MEM/WB)")
         for c, h in enumerate(headers):
+            table.grid_columnconfigure(c, weight=1)
             tk.Label(
                 table, text=h,
                 font=self.design_manager.get_font("bold"),
                 bg=colors["sidebar_bg"], fg=colors["sidebar_button_fg"],
-                padx=20, pady=8, relief=tk.RIDGE, borderwidth=1
+                padx=10, pady=8, relief=tk.RIDGE, borderwidth=1
             ).grid(row=0, column=c, sticky="ew")
 
-        rows = [
-            ("Python nativo",
-             f"{self.PY_TIME_S:.3f} s",
-             f"{self.CPU_CYCLES:,}",
-             "1 ×"),
-            ("CPU (Simulación)",
-             f"{self.CPU_TIME_S:.3f} s",
-             f"{self.CPU_CYCLES:,}",
-             "≈ 5 900 ×"),
-        ]
-
-        for r, row in enumerate(rows, 1):
+        recent = self.records[-self.RECENT_RUNS:][::-1]
+        for r, rec in enumerate(recent, 1):
+            util = "/".join(f"{rec.utilization[st] * 100:.0f}"
+                            for st in STAGES if st in rec.utilization) or "—"
+            row = (
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(rec.timestamp)),
+                rec.program,
+                rec.engine,
+                rec.version,
+                f"{rec.cycles:,}",
+                f"{rec.wall_s:.3f} s",
+                f"{rec.cycles_per_s:,.0f}",
+                f"{rec.cpi:.3f}" if rec.cpi is not None else "—",
+                util,
+            )
             for c, val in enumerate(row):
                 tk.Label(
                     table, text=val,
-                    font=self.design_manager.get_font("bold" if c == 3 else "normal"),
+                    font=self.design_manager.get_font("bold" if c == 6 else "normal"),
                     bg=colors["entry_bg"],
-                    fg=colors["sidebar_button_active_bg"] if c == 3 else colors["entry_fg"],
-                    padx=20, pady=6, relief=tk.RIDGE, borderwidth=1
+                    fg=colors["sidebar_button_active_bg"] if c == 6 else colors["entry_fg"],
+                    padx=10, pady=6, relief=tk.RIDGE, borderwidth=1
                 ).grid(row=r, column=c, sticky="ew")
 
     # ──────────────────────────────────────────────────────────────
@@ -280,4 +335,5 @@ class AnalisisView:
     def update_theme(self):
         if hasattr(self, "graph"):
             self.graph.update_theme()
+            self.version_graph.update_theme()
             self._plot_comparison_data()
\ No newline at end of file
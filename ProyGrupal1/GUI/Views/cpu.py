@@ -2,11 +2,17 @@
 import time
 from pathlib import Path, PurePath
 import tkinter as tk
+from tkinter import simpledialog
 from GUI.Components.styled_button      import StyledButton
 from GUI.Components.memory_table_view  import MemoryTableView
 from GUI.Components.signals_table_view import SignalsTableView
 import struct
 from ExtraPrograms.Processor.Processor import Procesador
+from ExtraPrograms.Processor.PrinterUnit import TkBatchSink
+from ExtraPrograms.Processor.StageProfiler import StageProfiler
+from ExtraPrograms.Processor.GuestProfiler import GuestProfiler, GuestSource
+from ExtraPrograms.Processor.TimeTravel import TimeTravel
+from ExtraPrograms.run_history import RunHistory, RunRecord, stage_totals
 
 class CPUView:
     # ──────────────────────────────────────────────────────────────────────────
@@ -28,6 +34,7 @@ class CPUView:
         # ── ventanas secundarias ─────────────────────────────────────────────
         self.memory_window  : tk.Toplevel | None = None
         self.signals_window : tk.Toplevel | None = None
+        self.profile_window : tk.Toplevel | None = None
 
         # ── referencias a componentes ────────────────────────────────────────
         self.diagram       = None
@@ -38,6 +45,17 @@ class CPUView:
         self._instructions_cache = None
         self._current_file_cache = None
 
+        # ── historial para retroceder ciclos (se crea con el procesador) ──
+        self._time_travel: TimeTravel | None = None
+
+        # ── perfil por etapa de "Ejecutar Todo" (None = desactivado) ──────────
+        self._stage_profiler: StageProfiler | None = None
+        # ── perfil del programa ASM (PC/línea) de "Ejecutar Todo" ────────────
+        self._guest_profiler: GuestProfiler | None = None
+
+        # ── salida PRINT* en bloques (un insert cada 50 ms, no por carácter) ─
+        self._printer_sink = TkBatchSink(parent, controller)
+
         # ── construcción de la UI principal ──────────────────────────────────
         self._create_ui()
 
@@ -84,6 +102,14 @@ class CPUView:
                      command=self._on_reset_cpu,
                      design_manager=self.design_manager).pack(side=tk.LEFT, padx=10)
 
+        StyledButton(container, text="Perfilar Etapas",
+                     command=self._toggle_stage_profiler,
+                     design_manager=self.design_manager).pack(side=tk.LEFT, padx=10)
+
+        StyledButton(container, text="Perfilar Programa",
+                     command=self._toggle_guest_profiler,
+                     design_manager=self.design_manager).pack(side=tk.LEFT, padx=10)
+
     # ──────────────────────────────────────────────────────────────────────
     #  Sección central (diagrama)
     # ──────────────────────────────────────────────────────────────────────
@@ -115,6 +141,10 @@ class CPUView:
         container = tk.Frame(bottom_frame, bg=colors['bg'])
         container.place(relx=0.5, rely=0.5, anchor='center')
 
+        StyledButton(container, text="Retroceder Un Ciclo",
+                     command=self._on_step_back,
+                     design_manager=self.design_manager).pack(side=tk.LEFT, padx=10)
+
         StyledButton(container, text="Ejecutar Un Ciclo",
                      command=self._on_execute_cycle,
                      design_manager=self.design_manager).pack(side=tk.LEFT, padx=10)
@@ -123,6 +153,10 @@ class CPUView:
                      command=self._on_execute_all,
                      design_manager=self.design_manager).pack(side=tk.LEFT, padx=10)
 
+        StyledButton(container, text="Ir a Ciclo",
+                     command=self._on_goto_cycle,
+                     design_manager=self.design_manager).pack(side=tk.LEFT, padx=10)
+
     # ═════════════════════════════════════════════════════════════════════
     #  Ventana de Memorias (creación / toggle)
     # ═════════════════════════════════════════════════════════════════════
@@ -289,7 +323,7 @@ class CPUView:
         
         # Paso 1: Inicializar procesador si no existe
         if not hasattr(self, 'cpu_instance'):
-            self.cpu_instance = Procesador(controller=self.controller)
+            self.cpu_instance = self._new_processor()
             self.controller.print_console("[CPU] Procesador inicializado")
         
         # Paso 2: Cargar estado actual desde Excel al procesador
@@ -298,7 +332,8 @@ class CPUView:
         # Paso 3: Ejecutar UN ciclo del procesador
         _, wb_instr = self.cpu_excel.read_state_writeBack()
         if wb_instr and "SWI" not in str(wb_instr):
-            self.cpu_instance.pipeline.step()
+            self._get_time_travel().step()
+            self._printer_sink.flush()
             self.controller.print_console("[CPU] Ciclo ejecutado")
         else:
             self.controller.print_console("[CPU] SWI detectado en WriteBack, ciclo omitido")
@@ -362,34 +397,50 @@ class CPUView:
         if hasattr(self, 'cpu_instance'):
             max_cycles = 50000000
             cycles_executed = 0
-            
-            # Ejecutar ciclos sin actualizar Excel ni UI
-            for cycle in range(max_cycles):
-                print(f"Current cycle: {cycle}")
-                
-                # Verificar condiciones de parada DIRECTAMENTE en el procesador
-                pipeline = self.cpu_instance.pipeline
-                
-                # Verificar SWI en pipeline
-                has_swi = False
-                if pipeline.mem_wb and pipeline.mem_wb.get("opcode") == 0x2F:
-                    has_swi = True
-                
-                if has_swi:
-                    self.controller.print_console(f"[CPU] SWI detectado, deteniendo ejecución después de {cycles_executed} ciclos")
-                    break
-                
-                # Ejecutar un ciclo del procesador
-                pipeline.step()
-                cycles_executed += 1
-                
-                # Verificar si el pipeline está vacío
-                if all(stage is None for stage in (
-                    pipeline.if_id, pipeline.id_ex, 
-                    pipeline.ex_mem, pipeline.mem_wb
-                )):
-                    self.controller.print_console(f"[CPU] Pipeline vacío después de {cycles_executed} ciclos")
-                    break
+            time_travel = self._get_time_travel()
+            totals_before = stage_totals(self.cpu_instance.pipeline.counters)
+            profiler = self._stage_profiler
+            if profiler is not None:
+                profiler.reset()
+                profiler.attach(self.cpu_instance.pipeline)
+            guest = self._guest_profiler
+            if guest is not None:                 # se encadena con el de etapas
+                guest.reset()
+                guest.attach(self.cpu_instance.pipeline)
+            
+            # Ejecutar ciclos sin actualizar Excel ni UI.  Sin registro de
+            # deshacer (cuesta ~43%): sólo un checkpoint cada `interval`
+            # ciclos para que "Ir a Ciclo" pueda volver a esta corrida
+            checkpoint_every = time_travel.interval
+            time_travel.pause()
+            try:
+                for cycle in range(max_cycles):
+                    # Verificar condiciones de parada DIRECTAMENTE en el procesador
+                    pipeline = self.cpu_instance.pipeline
+                    
+                    # Verificar SWI en pipeline
+                    has_swi = False
+                    if pipeline.mem_wb.valid and pipeline.mem_wb.opcode == 0x2F:
+                        has_swi = True
+                    
+                    if has_swi:
+                        self._printer_sink.flush()
+                        self.controller.print_console(f"[CPU] SWI detectado, deteniendo ejecución después de {cycles_executed} ciclos")
+                        break
+                    
+                    # Ejecutar un ciclo del procesador
+                    pipeline.step()
+                    cycles_executed += 1
+                    if pipeline.clock_cycle % checkpoint_every == 0:
+                        time_travel.checkpoint()
+                    
+                    # Verificar si el pipeline está vacío
+                    if pipeline.is_empty():
+                        self._printer_sink.flush()
+                        self.controller.print_console(f"[CPU] Pipeline vacío después de {cycles_executed} ciclos")
+                        break
+            finally:
+                time_travel.resume()
             
             # ═══════════════════════════════════════════════════════════════
             # ACTUALIZAR EXCEL Y UI SOLO UNA VEZ AL FINAL
@@ -419,9 +470,206 @@ class CPUView:
             self._update_all_views()
             
             elapsed = time.time() - start_time
+            self._printer_sink.flush()
             self.controller.print_console(f"[CPU] Se ejecutaron {cycles_executed} ciclos en {elapsed:.3f} segundos")
             self.controller.print_console(f"[PERFORMANCE] {cycles_executed/elapsed:.0f} ciclos/segundo")
+            self._export_counters()
+            self._record_run(cycles_executed, elapsed, totals_before)
+            if guest is not None:
+                guest.detach()
+                self._export_guest_profile()
+            if profiler is not None:
+                profiler.detach()
+                self._export_stage_profile()
     
+    # ═════════════════════════════════════════════════════════════════════
+    #  Retroceso de ciclos (TimeTravel)
+    # ═════════════════════════════════════════════════════════════════════
+    def _get_time_travel(self) -> TimeTravel:
+        """Historial ligado a la instancia actual del procesador."""
+        tt = self._time_travel
+        if tt is None or tt.cpu is not self.cpu_instance:
+            if tt is not None:
+                tt.detach()
+            self._time_travel = tt = TimeTravel(self.cpu_instance)
+        return tt
+
+    def _export_counters(self):
+        """Escribe out/perf_counters.json con los contadores del pipeline."""
+        pipeline = self.cpu_instance.pipeline
+        counters = pipeline.counters
+        out_path = Path(self.base_dir) / "out" / "perf_counters.json"
+        try:
+            out_path.parent.mkdir(exist_ok=True)
+            counters.to_json(out_path, cycles=pipeline.clock_cycle)
+        except OSError as e:
+            self.controller.print_console(f"[ERROR] No se pudieron guardar los contadores: {e}")
+            return
+        retired = counters.retired_total
+        cpi = pipeline.clock_cycle / retired if retired else 0.0
+        self.controller.print_console(
+            f"[PERFORMANCE] {retired} instrucciones retiradas, CPI {cpi:.3f}, "
+            f"{counters.taken_branches} saltos tomados → {out_path.name}")
+
+    # ═════════════════════════════════════════════════════════════════════
+    #  Perfil por etapa (StageProfiler)
+    # ═════════════════════════════════════════════════════════════════════
+    def _toggle_stage_profiler(self):
+        if self._stage_profiler is None:
+            self._stage_profiler = StageProfiler()
+            self.controller.print_console(
+                f"[PERFIL] Activado: se mide 1 de cada {self._stage_profiler.every} "
+                "ciclos en \"Ejecutar Todo\"")
+        else:
+            self._stage_profiler.detach()
+            self._stage_profiler = None
+            self.controller.print_console("[PERFIL] Desactivado")
+
+    def _export_stage_profile(self):
+        """Guarda out/stage_profile.{json,folded} y muestra la gráfica."""
+        profiler = self._stage_profiler
+        if not profiler.sampled:
+            return
+        out_dir = Path(self.base_dir) / "out"
+        try:
+            profiler.dump(out_dir / "stage_profile.json")
+            profiler.dump(out_dir / "stage_profile.folded")
+        except OSError as e:
+            self.controller.print_console(f"[ERROR] No se pudo guardar el perfil: {e}")
+        self.controller.print_console_lines(
+            [f"[PERFIL] {line}" for line in profiler.report(min_share=0.02).splitlines()])
+        self._show_profile_window()
+
+    def _show_profile_window(self):
+        from GUI.Components.flame_graph_view import FlameGraphView
+
+        if self.profile_window and self.profile_window.winfo_exists():
+            self.profile_window.destroy()
+        colors = self.design_manager.get_colors()
+        root   = self.parent.winfo_toplevel()
+
+        self.profile_window = tk.Toplevel(root)
+        self.profile_window.title("Perfil por Etapa")
+        self.profile_window.geometry(f"{int(root.winfo_width() * 0.8)}x260"
+                                     f"+{root.winfo_x() + 100}+{root.winfo_y() + 100}")
+        self.profile_window.configure(bg=colors['bg'])
+        self.profile_window.transient(root)
+
+        view = FlameGraphView(self.profile_window, self.design_manager)
+        view.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        view.show(self._stage_profiler)
+
+    # ═════════════════════════════════════════════════════════════════════
+    #  Perfil del programa ASM (GuestProfiler)
+    # ═════════════════════════════════════════════════════════════════════
+    def _toggle_guest_profiler(self):
+        if self._guest_profiler is None:
+            self._guest_profiler = GuestProfiler()
+            self.controller.print_console(
+                "[PERFIL ASM] Activado: ciclos por línea en \"Ejecutar Todo\"")
+        else:
+            self._guest_profiler.detach()
+            self._guest_profiler = None
+            self.controller.print_console("[PERFIL ASM] Desactivado")
+
+    def _export_guest_profile(self):
+        """Guarda out/guest_profile.json, muestra los bucles calientes y
+        colorea el margen del IDE del Compilador."""
+        profiler = self._guest_profiler
+        current_file = self.controller.get_current_file()
+        source = None
+        if current_file:
+            try:
+                source = GuestSource.from_file(current_file)
+            except (OSError, ValueError) as e:
+                self.controller.print_console(
+                    f"[PERFIL ASM] Sin mapa de líneas ({e}); se reporta por PC")
+
+        out_path = Path(self.base_dir) / "out" / "guest_profile.json"
+        try:
+            profiler.to_json(out_path, source)
+        except OSError as e:
+            self.controller.print_console(f"[ERROR] No se pudo guardar el perfil: {e}")
+        self.controller.print_console_lines(
+            [f"[PERFIL ASM] {line}" for line in profiler.report(source, top=5).splitlines()])
+
+        compiler = self.controller.get_view("Compilador")
+        if source is None or compiler is None or compiler.ide is None:
+            return
+        if compiler.current_file != current_file:
+            self.controller.print_console(
+                "[PERFIL ASM] El Compilador tiene otro archivo abierto; no se colorea el margen")
+            return
+        compiler.ide.set_heat(profiler.heat(source))
+
+    def _record_run(self, cycles, elapsed, totals_before):
+        """Agrega la ejecución a out/run_history.jsonl (vista de Análisis)."""
+        if not cycles:
+            return
+        record = RunRecord.from_counters(
+            PurePath(self.controller.get_current_file() or "?").name,
+            len(self._instructions_cache or ()), "pipeline (GUI)",
+            cycles, elapsed, stage_totals(self.cpu_instance.pipeline.counters),
+            totals_before)
+        try:
+            RunHistory.for_base_dir(self.base_dir).append(record)
+        except OSError as e:
+            self.controller.print_console(f"[ERROR] No se pudo guardar el historial: {e}")
+
+    def _new_processor(self) -> Procesador:
+        """Procesador cuya salida PRINT* pasa por el sink en bloques."""
+        self._printer_sink.flush()
+        return Procesador(controller=self.controller, sink=self._printer_sink)
+
+    def _on_step_back(self):
+        if self._time_travel is None or self._time_travel.cycle == 0:
+            self.controller.print_console("[CPU] No hay ciclos ejecutados para retroceder")
+            return
+        self._travel_to(self._time_travel.cycle - 1)
+
+    def _on_goto_cycle(self):
+        if self._time_travel is None:
+            self.controller.print_console("[CPU] Ejecute al menos un ciclo antes de navegar")
+            return
+        target = simpledialog.askinteger(
+            "Ir a Ciclo", f"Ciclo destino (actual: {self._time_travel.cycle}):",
+            parent=self.parent.winfo_toplevel(), minvalue=0)
+        if target is not None:
+            self._travel_to(target)
+
+    def _travel_to(self, target: int):
+        """Lleva el procesador al ciclo `target` y sincroniza Excel y vistas."""
+        if not self._load_instructions_if_needed():
+            return
+        start_time = time.time()
+        tt = self._time_travel
+        cycle = tt.goto(target)
+
+        self._save_from_executor_to_excel()
+
+        # Etapas: fetch = PC actual; las demás, lo buscado en ciclos previos
+        fetch_pc = self.cpu_instance.pc.get_pc()
+        decode_pc, execute_pc, memory_pc, writeback_pc = tt.fetch_history(4)
+        self.cpu_excel.write_state_fetch(self._instruction_at(fetch_pc))
+        self.cpu_excel.write_state_decode(self._instruction_at(decode_pc))
+        self.cpu_excel.write_state_execute(self._instruction_at(execute_pc))
+        self.cpu_excel.write_state_memory(self._instruction_at(memory_pc))
+        self.cpu_excel.write_state_writeBack(self._instruction_at(writeback_pc))
+        self.cpu_excel.table.execute_all()
+
+        self._update_all_views()
+        elapsed = time.time() - start_time
+        self.controller.print_console(f"[CPU] Ciclo {cycle} restaurado en {elapsed:.3f} segundos")
+
+    def _instruction_at(self, pc):
+        """Texto de la instrucción en `pc` (NOP si se desconoce)."""
+        if pc is None or not self._instructions_cache:
+            return "NOP"
+        idx = pc // 8
+        if 0 <= idx < len(self._instructions_cache):
+            return self._instructions_cache[idx]
+        return "NOP"
+
     def _opcode_to_instruction(self, opcode):
         """Mapea un opcode a su mnemónico de instrucción"""
         # Tabla básica de opcodes a instrucciones
@@ -500,7 +748,7 @@ class CPUView:
             # Verificar que tengamos el procesador
             if not hasattr(self, 'cpu_instance'):
                 # Crear instancia del procesador si no existe
-                self.cpu_instance = Procesador(controller=self.controller)
+                self.cpu_instance = self._new_processor()
                 self.controller.print_console("[CPU] Procesador inicializado")
             
             cpu = self.cpu_instance
@@ -508,56 +756,30 @@ class CPUView:
             # ═══════════════════════════════════════════════════════════════
             # 1. CARGAR REGISTROS GENERALES (R0-R15)
             # ═══════════════════════════════════════════════════════════════
-            for i in range(16):
-                method_name = f'read_r{i}'
-                if hasattr(self.cpu_excel, method_name):
-                    data_type, value = getattr(self.cpu_excel, method_name)()
-                    reg_value = self._parse_excel_value(data_type, value)
-                    cpu.register_file.regs[i] = reg_value
+            cpu.register_file.regs[:] = self.cpu_excel.read_register_file()
                     
             # ═══════════════════════════════════════════════════════════════
             # 2. CARGAR REGISTROS SEGUROS (W1-W9, D0)
             # ═══════════════════════════════════════════════════════════════
-            for i in range(1, 10):
-                method_name = f'read_w{i}'
-                if hasattr(self.cpu_excel, method_name):
-                    data_type, value = getattr(self.cpu_excel, method_name)()
-                    reg_value = self._parse_excel_value(data_type, value)
-                    cpu.safe_register_file._regs[i-1] = reg_value
-                    
-            # D0 (constante TEA)
-            data_type, value = self.cpu_excel.read_d0_safe()
-            cpu.safe_register_file._regs[9] = self._parse_excel_value(data_type, value)
+            # w1..w9 + D0 (constante TEA) en un solo rango
+            cpu.safe_register_file._regs[:] = self.cpu_excel.read_safe_registers()
             
             # ═══════════════════════════════════════════════════════════════
             # 3. CARGAR LLAVES CRIPTOGRÁFICAS (Vault Memory)
             # ═══════════════════════════════════════════════════════════════
-            for key_idx in range(4):
-                for block_idx in range(4):
-                    method_name = f'read_k{key_idx}_{block_idx}'
-                    if hasattr(self.cpu_excel, method_name):
-                        data_type, value = getattr(self.cpu_excel, method_name)()
-                        vault_value = self._parse_excel_value(data_type, value)
-                        mem_idx = key_idx * 4 + block_idx
-                        cpu.vault_memory._mem[mem_idx] = vault_value
+            # k0.0 … k3.3 → índice clave*4 + bloque
+            cpu.vault_memory._mem[:] = self.cpu_excel.read_vault_memory()
             
             # ═══════════════════════════════════════════════════════════════
             # 4. CARGAR BLOQUES DE CONTRASEÑA (Login Memory)
             # ═══════════════════════════════════════════════════════════════
-            for i in range(1, 9):
-                method_name = f'read_p{i}'
-                if hasattr(self.cpu_excel, method_name):
-                    data_type, value = getattr(self.cpu_excel, method_name)()
-                    login_value = self._parse_excel_value(data_type, value)
-                    # IMPORTANTE: P1 va en índice 0, P2 en índice 1, etc.
-                    cpu.login_memory._mem[i-1] = login_value
+            # IMPORTANTE: P1 va en índice 0, P2 en índice 1, etc.
+            cpu.login_memory._mem[:] = self.cpu_excel.read_login_memory()
             
             # ═══════════════════════════════════════════════════════════════
             # 5. CARGAR MEMORIA GENERAL (64 bloques)
             # ═══════════════════════════════════════════════════════════════
-            for i in range(64):
-                mem_value = self.cpu_excel.read_memory_block(i)
-                cpu.data_memory._mem[i] = mem_value & 0xFFFFFFFF
+            cpu.data_memory.load(self.cpu_excel.read_data_memory())
             
             # ═══════════════════════════════════════════════════════════════
             # 6. CARGAR SEÑALES DEL PIPELINE
@@ -610,16 +832,10 @@ class CPUView:
             
             dynamic_mem_path = Path(self.base_dir) / "assets" / "dynamic_mem.bin"
             if dynamic_mem_path.exists():
-                data = dynamic_mem_path.read_bytes()
-                blocks_loaded = max(1, len(data) // 8)
-
-                cpu.dynamic_memory.set_size(blocks_loaded)   # ← NUEVO
-                cpu.dynamic_memory._pending.clear()          # limpia por si acaso
-
-                # Copiar todo el archivo, sin tope de 64
-                for i in range(blocks_loaded):
-                    block = struct.unpack_from("<Q", data, i * 8)[0]
-                    cpu.dynamic_memory._mem[i] = block
+                # Mapea todo el archivo (sin tope de 64) en modo escritura: si
+                # ya está mapeado y no cambió no se vuelve a mapear, y guardar
+                # el estado es sólo un flush (sin copiar la memoria cada ciclo)
+                cpu.dynamic_memory.map_file(dynamic_mem_path, writable=True)
             else:
                 cpu.dynamic_memory.set_size(1)
             
@@ -661,38 +877,23 @@ class CPUView:
             # ═══════════════════════════════════════════════════════════════
             # 1. GUARDAR REGISTROS GENERALES
             # ═══════════════════════════════════════════════════════════════
-            for i in range(16):
-                method_name = f'write_r{i}'
-                if hasattr(self.cpu_excel, method_name):
-                    value = cpu.register_file.regs[i]
-                    getattr(self.cpu_excel, method_name)(f"0x{value:08X}")
+            self.cpu_excel.write_register_file(cpu.register_file.regs)
             
             # ═══════════════════════════════════════════════════════════════
             # 2. GUARDAR REGISTROS SEGUROS
             # ═══════════════════════════════════════════════════════════════
-            for i in range(1, 10):
-                method_name = f'write_w{i}'
-                if hasattr(self.cpu_excel, method_name):
-                    value = cpu.safe_register_file._regs[i-1]
-                    getattr(self.cpu_excel, method_name)(f"0x{value:08X}")
+            self.cpu_excel.write_safe_registers(cpu.safe_register_file._regs[:9])
             
             # ═══════════════════════════════════════════════════════════════
             # 3. GUARDAR MEMORIA GENERAL
             # ═══════════════════════════════════════════════════════════════
-            for i in range(64):
-                value = cpu.data_memory._mem[i]
-                self.cpu_excel.write_memory_block(i, value, "hex")
+            self.cpu_excel.write_data_memory(cpu.data_memory.dump())
                 
             # 3.5 ─── GUARDAR VAULT MEMORY (k0.0 … k3.3)
-            for k in range(4):              # 4 claves
-                for b in range(4):          # 4 bloques cada una
-                    val = cpu.vault_memory._mem[k*4 + b] & 0xFFFFFFFF
-                    getattr(self.cpu_excel, f"write_k{k}_{b}")(f"0x{val:08X}")
+            self.cpu_excel.write_vault_memory(cpu.vault_memory._mem)
 
             # 3.6 ─── GUARDAR LOGIN MEMORY (P1 … P8)
-            for p in range(8):
-                val = cpu.login_memory._mem[p] & 0xFFFFFFFF
-                getattr(self.cpu_excel, f"write_p{p+1}")(f"0x{val:08X}")
+            self.cpu_excel.write_login_memory(cpu.login_memory._mem)
             
             # ═══════════════════════════════════════════════════════════════
             # 4. GUARDAR FLAGS Y ESTADOS
@@ -723,9 +924,7 @@ class CPUView:
             
             # Guardar memoria dinámica
             dynamic_mem_path = Path(self.base_dir) / "assets" / "dynamic_mem.bin"
-            with open(dynamic_mem_path, "wb") as f:
-                for block in cpu.dynamic_memory.dump():
-                    f.write(struct.pack("<Q", block & 0xFFFFFFFFFFFFFFFF))
+            cpu.dynamic_memory.save_file(dynamic_mem_path)
             
         except Exception as e:
             self.controller.print_console(f"[ERROR] Error guardando estado: {e}")
@@ -741,7 +940,10 @@ class CPUView:
         # 1. Descartar instancia anterior (si existe) y crear una nueva
         if hasattr(self, 'cpu_instance'):
             del self.cpu_instance
-        self.cpu_instance = Procesador(controller=self.controller)
+        if self._time_travel is not None:
+            self._time_travel.detach()
+            self._time_travel = None
+        self.cpu_instance = self._new_processor()
         self.controller.print_console("[CPU] Procesador reinicializado")
         
         # Limpiar cache
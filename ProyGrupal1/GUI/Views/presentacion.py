@@ -235,6 +235,11 @@ class PresentacionView:
         if self.console:
             self.console.printConsoleLn(value)
     
+    def printConsoleLines(self, values):
+        """Varias líneas en un solo bloque (ver TkBatchSink)"""
+        if self.console:
+            self.console.printConsoleLines(values)
+    
     # ─────────────────────────────────────────────────────────────────────────────
     # Parseo para obtener valores decimales apropiados
     # ─────────────────────────────────────────────────────────────────────────────
@@ -167,6 +167,12 @@ class ViewController:
         if presentacion_view:
             presentacion_view.printConsoleLn(text)
     
+    def print_console_lines(self, lines):
+        """Como print_console pero para un bloque de líneas (un solo insert)."""
+        presentacion_view = self.get_view('Presentación')
+        if presentacion_view:
+            presentacion_view.printConsoleLines(lines)
+    
     def clear_cache(self):
         """Limpia el cache de vistas (útil para desarrollo)"""
         for view in self.loaded_views.values():
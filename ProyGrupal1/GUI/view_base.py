@@ -225,6 +225,8 @@ class Application:
     def _on_closing(self):
         """Maneja el cierre de la aplicación"""
         self._save_config()
+        # Volcar el estado del CPU al Excel (sumidero opcional)
+        self.cpu_excel.save_to_excel()
         self.root.quit()
     
     def run(self):
@@ -52,6 +52,9 @@ def ensure_config_exists():
 def main():
     # Inicializar la clase de información de CPU
     cpu_excel = CPUInfoExcel()
+    # El estado vive en memoria; table_data.xlsx sólo se usa como
+    # fuente inicial (si existe y openpyxl está instalado)
+    cpu_excel.load_from_excel()
     
     #cpu_excel.write_dynamic_memory("0x0", "0xDEADBEEF")
     